@@ -0,0 +1,212 @@
+from typing import List
+
+from benchmarks.leaks import add_delete_loop, flush_deletes, leak_failures
+from utils.csv_loader import CSVLoader
+
+
+class Case:
+    """
+    A benchmarked operation on one dataset.
+
+    prepare() and cleanup() run once per case; setup() and teardown() run
+    around every timed run() and are not timed.
+    """
+    name = ''
+    # Cases that only read two columns give the same numbers on wide files
+    narrow_only = False
+
+    def __init__(self, file_path: str, columns: List[str]):
+        self.file_path = file_path
+        self.columns = columns
+
+    def prepare(self):
+        pass
+
+    def setup(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError
+
+    def teardown(self):
+        pass
+
+    def cleanup(self):
+        pass
+
+    def check(self) -> List[str]:
+        """
+        Verify the state after cleanup().
+
+        Returns:
+            List[str]: Descriptions of what went wrong; empty if the case passed
+        """
+        return []
+
+    def _open(self, columns=None) -> CSVLoader:
+        loader = CSVLoader()
+        if columns is None:
+            success, error_msg = loader.load_csv(self.file_path)
+        else:
+            success, error_msg = loader.probe_schema(self.file_path)
+            if success:
+                success, error_msg = loader.load_columns(columns)
+        if not success:
+            loader.release()
+            raise RuntimeError(error_msg)
+        return loader
+
+
+class LoadCSV(Case):
+    name = 'load_csv'
+
+    def run(self):
+        self.loader = self._open()
+
+    def teardown(self):
+        # Dropping the last reference makes the next run parse the file again
+        self.loader.release()
+
+
+class LoadColumns(Case):
+    name = 'probe_load_columns'
+
+    def run(self):
+        self.loader = self._open(['x', 'f0'])
+
+    def teardown(self):
+        self.loader.release()
+
+
+class ColumnRange(Case):
+    name = 'get_column_range'
+
+    def prepare(self):
+        self.loader = self._open()
+
+    def run(self):
+        for name in self.columns:
+            self.loader.get_column_range(name)
+
+    def cleanup(self):
+        self.loader.release()
+
+
+class _PlotCase(Case):
+    narrow_only = True
+    plot_columns = ()
+
+    def prepare(self):
+        self.loader = self._open(list(self.plot_columns))
+        self.df = self.loader.get_dataframe(list(self.plot_columns))
+
+    def cleanup(self):
+        self.df = None
+        self.loader.release()
+
+    def _new_plot(self):
+        raise NotImplementedError
+
+
+class XYPlot(_PlotCase):
+    name = 'xy_plot'
+    plot_columns = ('x', 'f0')
+
+    def _new_plot(self):
+        from gui.plot_containers import XYPlotContainer
+        container = XYPlotContainer()
+        container.attach_dataset(self.loader.get_dataset_key())
+        container.plot(self.df, x_col='x', y_col='f0')
+        return container
+
+    def run(self):
+        self.container = self._new_plot()
+
+    def teardown(self):
+        self.container.dispose()
+        self.container.deleteLater()
+        flush_deletes()
+
+
+class BarPlot(XYPlot):
+    name = 'bar_plot'
+    plot_columns = ('label', 'f0')
+
+    def _new_plot(self):
+        from gui.plot_containers import BarPlotContainer
+        container = BarPlotContainer()
+        container.attach_dataset(self.loader.get_dataset_key())
+        container.plot(self.df, label_col='label', value_col='f0')
+        return container
+
+
+class _WindowCase(XYPlot):
+    def prepare(self):
+        from gui.main_window import MainWindow
+        super().prepare()
+        self.window = MainWindow()
+        self.window._add_new_plot(self._new_plot())
+
+    def cleanup(self):
+        for plot_widget in list(self.window.plot_widgets):
+            self.window._discard_plot_widget(plot_widget)
+        self.window._clear_deleted_plots()
+        self.window.deleteLater()
+        flush_deletes()
+        super().cleanup()
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+
+class DuplicatePlot(_WindowCase):
+    name = 'duplicate_plot'
+
+    def run(self):
+        self.window._duplicate_plot_widget(self.window.plot_widgets[0])
+
+    def teardown(self):
+        self.window._discard_plot_widget(self.window.plot_widgets[1])
+        flush_deletes()
+
+
+class UndoDelete(_WindowCase):
+    name = 'undo_delete'
+
+    def setup(self):
+        self.window._remove_plot_widget(self.window.plot_widgets[0])
+        flush_deletes()
+
+    def run(self):
+        self.window.undo_delete_plot()
+
+
+class AddDeleteLoop(_WindowCase):
+    """
+    Adds and deletes plots repeatedly. Fails if a deleted plot keeps its
+    dataset referenced or its figure alive outside the canvas pool, or if
+    the pool grows past its cap.
+    """
+    name = 'add_delete_loop'
+    iterations = 20
+
+    def prepare(self):
+        super().prepare()
+        self.dataset_key = self.loader.get_dataset_key()
+        self.figures = []
+        self.failures = []
+
+    def run(self):
+        figures, failures = add_delete_loop(self.window, self._new_plot, self.dataset_key, self.iterations)
+        self.figures.extend(figures)
+        if not self.failures:
+            self.failures.extend(failures)
+
+    def check(self) -> List[str]:
+        return self.failures + leak_failures(self.dataset_key, self.figures)
+
+
+CASES = (LoadCSV, LoadColumns, ColumnRange, XYPlot, BarPlot, DuplicatePlot, UndoDelete, AddDeleteLoop)
@@ -0,0 +1,74 @@
+import os
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+LABEL_COUNT = 100
+# Cells written per chunk, so wide files do not need more memory than narrow ones
+_CHUNK_CELLS = 5_000_000
+
+
+def column_names(columns: int) -> List[str]:
+    """
+    Get the header of a synthetic dataset.
+
+    Every dataset has a sorted 'x' column, a 'label' column with LABEL_COUNT
+    distinct values and numeric columns f0, f1, ... up to `columns` in total.
+
+    Args:
+        columns (int): Total number of columns, at least 3.
+
+    Returns:
+        List[str]: Column names
+    """
+    return ['x', 'label'] + [f'f{i}' for i in range(max(1, columns - 2))]
+
+
+def generate_csv(file_path: str, rows: int, columns: int, seed: int = 0):
+    """
+    Write a synthetic CSV file, the same for the same arguments on every machine.
+
+    Args:
+        file_path (str): Path of the file to write.
+        rows (int): Number of data rows.
+        columns (int): Total number of columns, at least 3.
+        seed (int): Seed of the random values.
+    """
+    rng = np.random.default_rng(seed)
+    names = column_names(columns)
+    labels = np.array([f'label_{i:03d}' for i in range(LABEL_COUNT)], dtype=object)
+    chunk_rows = max(1000, _CHUNK_CELLS // len(names))
+    with open(file_path, 'w', newline='') as f:
+        for start in range(0, max(rows, 1), chunk_rows):
+            n = min(chunk_rows, rows - start)
+            data = {
+                'x': np.arange(start, start + n, dtype='float64'),
+                'label': labels[rng.integers(0, LABEL_COUNT, n)],
+            }
+            for name in names[2:]:
+                data[name] = rng.standard_normal(n)
+            pd.DataFrame(data, columns=names).to_csv(f, header=start == 0, index=False,
+                                                     float_format='%.6g')
+
+
+def dataset_path(data_dir: str, rows: int, columns: int, seed: int = 0) -> str:
+    """
+    Get the path of a synthetic dataset, generating it on first use.
+
+    Args:
+        data_dir (str): Directory holding generated datasets.
+        rows (int): Number of data rows.
+        columns (int): Total number of columns.
+        seed (int): Seed of the random values.
+
+    Returns:
+        str: Path of the CSV file
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, f'rows{rows}_cols{columns}_seed{seed}.csv')
+    if not os.path.exists(path):
+        tmp_path = f'{path}.tmp'
+        generate_csv(tmp_path, rows, columns, seed)
+        os.replace(tmp_path, path)
+    return path
@@ -0,0 +1,73 @@
+import gc
+import weakref
+from typing import Callable, List, Tuple
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication
+
+
+def flush_deletes():
+    # deleteLater() only runs from the event loop, which the benchmarks and tests do not enter
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    QApplication.processEvents()
+
+
+def add_delete_loop(window, new_plot: Callable, dataset_key, iterations: int
+                    ) -> Tuple[List[weakref.ref], List[str]]:
+    """
+    Add a new plot to the window and delete it again, `iterations` times.
+
+    Args:
+        window (MainWindow): Window the plots are added to and deleted from
+        new_plot (Callable): Returns a plotted container attached to `dataset_key`
+        dataset_key (tuple): Registry key of the dataset the plots show
+        iterations (int): Number of plots to add and delete
+
+    Returns:
+        Tuple[List[weakref.ref], List[str]]: Weak references to the figures of the
+        deleted plots, for leak_failures(), and descriptions of what went wrong
+    """
+    from utils.dataset_registry import get_registry
+    refcount = get_registry().refcount(dataset_key)
+    figures = []
+    failures = []
+    for i in range(iterations):
+        plot_widget = new_plot()
+        figures.append(weakref.ref(plot_widget.figure))
+        window._add_new_plot(plot_widget)
+        window._remove_plot_widget(plot_widget)
+        window._clear_deleted_plots()
+        del plot_widget
+        flush_deletes()
+        leaked = get_registry().refcount(dataset_key) - refcount
+        if leaked and not failures:
+            failures.append(f'{leaked} dataset reference(s) left by deleted plots after {i + 1} iteration(s)')
+    return figures, failures
+
+
+def leak_failures(dataset_key, figures: List[weakref.ref]) -> List[str]:
+    """
+    Check that nothing outlived the plots once every owner let go of the dataset.
+
+    Args:
+        dataset_key (tuple): Registry key of the dataset the plots showed
+        figures (List[weakref.ref]): Figures returned by add_delete_loop()
+
+    Returns:
+        List[str]: Descriptions of what went wrong; empty if nothing leaked
+    """
+    from gui.canvas_pool import get_canvas_pool
+    from utils.dataset_registry import get_registry
+    gc.collect()
+    failures = []
+    refcount = get_registry().refcount(dataset_key)
+    if refcount:
+        failures.append(f'dataset still has {refcount} reference(s) after cleanup')
+    pool = get_canvas_pool()
+    if len(pool) > pool.max_size:
+        failures.append(f'canvas pool holds {len(pool)} pairs, more than {pool.max_size}')
+    # Figures handed back to the pool are kept for reuse; every other one must be freed
+    alive = sum(1 for ref in figures if ref() is not None and ref() not in pool)
+    if alive:
+        failures.append(f'{alive} figure(s) of deleted plots still alive')
+    return failures
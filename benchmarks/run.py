@@ -0,0 +1,209 @@
+"""
+Benchmark the CSV loading and plotting code paths on synthetic datasets.
+
+Usage:
+    python -m benchmarks.run [--profile quick|standard|full] [--output results.json]
+                             [--baseline baseline.json] [--save-baseline baseline.json]
+
+Every case is timed over several runs and then run once more under
+tracemalloc to record its peak memory and the memory it leaves behind. With
+--baseline, a case that got slower or uses more memory than the baseline by
+more than --threshold is reported as a regression, and the exit status is 1.
+Cases that check for leaks, such as add_delete_loop, also exit with status 1
+when a check fails.
+Qt runs on the offscreen platform, so no display is needed.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from benchmarks.datasets import column_names, dataset_path
+
+# (rows, columns) of the datasets each profile runs on
+PROFILES = {
+    'quick': [(10_000, 5), (100_000, 5), (10_000, 500)],
+    'standard': [(10_000, 5), (1_000_000, 5), (100_000, 50), (100_000, 500)],
+    'full': [(10_000, 5), (1_000_000, 5), (10_000_000, 5), (100_000_000, 5),
+             (100_000, 500), (1_000_000, 500)],
+}
+NARROW_COLUMNS = 5
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 1.25
+# Differences below these are noise, whatever the ratio
+MIN_TIME_DELTA = 0.005
+MIN_MEMORY_DELTA = 1024 ** 2
+
+
+def measure(case, repeat: int) -> Dict[str, float]:
+    """
+    Time a case and record its memory use.
+
+    Args:
+        case (Case): The case to run.
+        repeat (int): Number of timed runs.
+
+    Returns:
+        Dict[str, float]: min_s and median_s over the timed runs, plus peak_bytes
+        and retained_bytes from one extra run under tracemalloc, and the failures
+        reported by the case's own checks
+    """
+    case.prepare()
+    try:
+        times = []
+        for _ in range(repeat):
+            case.setup()
+            start = time.perf_counter()
+            case.run()
+            times.append(time.perf_counter() - start)
+            case.teardown()
+
+        # Traced separately, since tracemalloc slows allocations down
+        gc.collect()
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        case.setup()
+        tracemalloc.reset_peak()
+        started, _ = tracemalloc.get_traced_memory()
+        case.run()
+        _, peak = tracemalloc.get_traced_memory()
+        case.teardown()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        case.cleanup()
+    return {
+        'min_s': min(times),
+        'median_s': statistics.median(times),
+        'peak_bytes': peak - started,
+        'retained_bytes': after - before,
+        'failures': case.check(),
+    }
+
+
+def run_benchmarks(profile: str, data_dir: str, repeat: int, only: List[str] = ()) -> Dict[str, dict]:
+    """
+    Run every case on every dataset of a profile.
+
+    Args:
+        profile (str): Name of a profile in PROFILES.
+        data_dir (str): Directory for the generated datasets.
+        repeat (int): Number of timed runs per case.
+        only (List[str]): Case names to run; all cases when empty.
+
+    Returns:
+        Dict[str, dict]: Measurements by 'case[rows=...,cols=...]'
+    """
+    from PyQt6.QtWidgets import QApplication
+    from benchmarks.cases import CASES
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = {}
+    for rows, columns in PROFILES[profile]:
+        path = dataset_path(data_dir, rows, columns)
+        for case_class in CASES:
+            if only and case_class.name not in only:
+                continue
+            if case_class.narrow_only and columns > NARROW_COLUMNS:
+                continue
+            key = f'{case_class.name}[rows={rows},cols={columns}]'
+            print(f'{key} ...', end=' ', file=sys.stderr, flush=True)
+            results[key] = measure(case_class(path, column_names(columns)), repeat)
+            print(f"{results[key]['median_s'] * 1000:.1f} ms", file=sys.stderr)
+    app.processEvents()
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict],
+            threshold: float = DEFAULT_THRESHOLD) -> List[str]:
+    """
+    Find the measurements that regressed against a baseline.
+
+    Args:
+        results (Dict[str, dict]): New measurements.
+        baseline (Dict[str, dict]): Baseline measurements.
+        threshold (float): Ratio above which a measurement counts as a regression.
+
+    Returns:
+        List[str]: One line per regression
+    """
+    regressions = []
+    for key, new in results.items():
+        old = baseline.get(key)
+        if old is None:
+            continue
+        for metric, floor in (('median_s', MIN_TIME_DELTA),
+                              ('peak_bytes', MIN_MEMORY_DELTA),
+                              ('retained_bytes', MIN_MEMORY_DELTA)):
+            if metric not in old:
+                continue
+            if new[metric] - old[metric] > floor and new[metric] > old[metric] * threshold:
+                regressions.append(f'{key} {metric}: {old[metric]:.4g} -> {new[metric]:.4g}')
+    return regressions
+
+
+def _load_results(file_path: str) -> Dict[str, dict]:
+    with open(file_path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def _write_results(file_path: str, profile: str, results: Dict[str, dict]):
+    document = {
+        'meta': {
+            'profile': profile,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark loading and plotting on synthetic CSVs.')
+    parser.add_argument('--profile', choices=sorted(PROFILES), default='quick')
+    parser.add_argument('--data-dir', default=os.path.join('benchmarks', 'data'),
+                        help='Directory for the generated datasets; reused across runs.')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--case', action='append', default=[], help='Only run this case; repeatable.')
+    parser.add_argument('--output', help='Write the results to this JSON file.')
+    parser.add_argument('--baseline', help='Compare against results saved earlier.')
+    parser.add_argument('--save-baseline', help='Also write the results as a new baseline.')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.profile, args.data_dir, args.repeat, args.case)
+    for file_path in (args.output, args.save_baseline):
+        if file_path:
+            _write_results(file_path, args.profile, results)
+
+    failed = False
+    for key, result in results.items():
+        for failure in result['failures']:
+            print(f'FAILED {key}: {failure}', file=sys.stderr)
+            failed = True
+
+    if args.baseline:
+        regressions = compare(results, _load_results(args.baseline), args.threshold)
+        for line in regressions:
+            print(f'REGRESSION {line}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -31,13 +31,21 @@ class AddBarPlotDialog(QDialog):
     def update_ok_button_state(self, is_valid):
         self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(is_valid)
 
+    def done(self, result):
+        self.bar_plot_config_widget.cancel_load()
+        self.bar_plot_config_widget.csv_loader.release()
+        super().done(result)
+
     def try_accept(self):
         try:
             plot_data = self.bar_plot_config_widget.get_plot_data()
             if plot_data:
                 df, label_col, value_col = plot_data
+                reducer, top_n = self.bar_plot_config_widget.get_aggregation()
                 plot_container = BarPlotContainer()
-                plot_container.plot(df, label_col=label_col, value_col=value_col)
+                plot_container.attach_dataset(self.bar_plot_config_widget.csv_loader.get_dataset_key())
+                plot_container.plot(df, label_col=label_col, value_col=value_col,
+                                    reducer=reducer, top_n=top_n)
                 self.plot_ready.emit(plot_container)
                 self.accept()
             else:
@@ -1,8 +1,8 @@
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QDialogButtonBox, QMessageBox, 
                             QTableView, QLabel)
 from PyQt6.QtCore import pyqtSignal
-from PyQt6.QtGui import QStandardItemModel, QStandardItem
 import pandas as pd
+from gui.dataframe_model import DataFrameTableModel
 from gui.plot_config_widget import PlotConfigWidget
 from gui.plot_containers import XYPlotContainer
 from PyQt6.QtWidgets import QWidget
@@ -22,7 +22,7 @@ class AddPlotDialog(QDialog):
         self.plot_config_widget = PlotConfigWidget(self)
         layout.addWidget(self.plot_config_widget)
 
-        self.preview_label = QLabel("CSV Preview (First 10 Rows):")
+        self.preview_label = QLabel("CSV Preview:")
         layout.addWidget(self.preview_label)
         self.preview_label.hide()
 
@@ -38,8 +38,16 @@ class AddPlotDialog(QDialog):
         self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
         self.plot_config_widget.combo_x.currentTextChanged.connect(self.update_ok_button_state)
         self.plot_config_widget.combo_y.currentTextChanged.connect(self.update_ok_button_state)
+        self.plot_config_widget.load_finished.connect(self.on_load_finished)
+
+    def on_load_finished(self, success):
+        if success:
+            self.update_ok_button_state()
 
     def update_ok_button_state(self):
+        if self.plot_config_widget.is_loading():
+            self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(False)
+            return
         self.button_box.button(QDialogButtonBox.StandardButton.Ok).setEnabled(True)
         
         plot_data = self.plot_config_widget.get_plot_data()
@@ -48,24 +56,22 @@ class AddPlotDialog(QDialog):
             self.show_csv_preview(df)
 
     def show_csv_preview(self, df):
-        preview_df = df.head(10)
-        
-        model = QStandardItemModel(preview_df.shape[0], preview_df.shape[1])
-        
-        model.setHorizontalHeaderLabels(preview_df.columns)
-        
-        for row in range(preview_df.shape[0]):
-            for col in range(preview_df.shape[1]):
-                item = QStandardItem(str(preview_df.iloc[row, col]))
-                model.setItem(row, col, item)
-        
+        model = DataFrameTableModel(df, self.preview_table)
+        old_model = self.preview_table.model()
         self.preview_table.setModel(model)
-        
+        if old_model is not None:
+            old_model.deleteLater()
+
         self.preview_table.resizeColumnsToContents()
-        
+
         self.preview_label.show()
         self.preview_table.show()
 
+    def done(self, result):
+        self.plot_config_widget.cancel_load()
+        self.plot_config_widget.csv_loader.release()
+        super().done(result)
+
     def try_accept(self):
         try:
             plot_data = self.plot_config_widget.get_plot_data()
@@ -73,12 +79,15 @@ class AddPlotDialog(QDialog):
                 df, x_col, y_col = plot_data
                 
     
-                if not pd.api.types.is_numeric_dtype(df[x_col]) or not pd.api.types.is_numeric_dtype(df[y_col]):
+                x_is_plottable = (pd.api.types.is_numeric_dtype(df[x_col])
+                                  or pd.api.types.is_datetime64_any_dtype(df[x_col]))
+                if not x_is_plottable or not pd.api.types.is_numeric_dtype(df[y_col]):
                     QMessageBox.warning(self, "Invalid Columns", 
-                                        "Both X and Y columns must contain numeric data for plotting.")
+                                        "The Y column must be numeric, and the X column numeric or timestamps.")
                     return
                 
                 plot_container = XYPlotContainer()
+                plot_container.attach_dataset(self.plot_config_widget.csv_loader.get_dataset_key())
                 plot_container.plot(df, x_col=x_col, y_col=y_col)
                 self.plot_ready.emit(plot_container)
                 self.accept()
@@ -0,0 +1,74 @@
+import weakref
+
+
+class AxisLinks:
+    """
+    Groups of plots whose X windows move together.
+
+    Plots join the group of their link key, e.g. (dataset key, X column), and
+    broadcast every zoom or pan to the other members. The group remembers the
+    last window so plots joining later, such as duplicates, start at it.
+    Members are held weakly, so a plot that is deleted without leaving is
+    simply dropped.
+    """
+    def __init__(self):
+        self._groups = {}
+        self._windows = {}
+
+    def join(self, plot, key):
+        """
+        Add a plot to the group of `key`, leaving any group it was in.
+
+        Args:
+            plot: A plot with a set_x_window(x_range, broadcast) method.
+            key: Hashable link key.
+
+        Returns:
+            Optional[tuple]: The group's current X window, or None for the full data
+        """
+        self.leave(plot)
+        self._groups.setdefault(key, weakref.WeakSet()).add(plot)
+        return self._windows.get(key)
+
+    def leave(self, plot):
+        """
+        Remove a plot from its group, if it is in one.
+
+        Args:
+            plot: A plot added with join().
+        """
+        for key, members in list(self._groups.items()):
+            members.discard(plot)
+            if not members:
+                del self._groups[key]
+                self._windows.pop(key, None)
+
+    def broadcast(self, plot, key, x_range):
+        """
+        Move the other plots of a group to a new X window.
+
+        Args:
+            plot: The plot the window changed on.
+            key: Its link key.
+            x_range (Optional[tuple]): The new window in data units, or None for the full data.
+        """
+        members = self._groups.get(key)
+        if members is None or plot not in members:
+            return
+        self._windows[key] = x_range
+        for other in list(members):
+            if other is not plot:
+                other.set_x_window(x_range, broadcast=False)
+
+
+_links = AxisLinks()
+
+
+def get_axis_links() -> AxisLinks:
+    """
+    Get the link groups shared by all plot containers.
+
+    Returns:
+        AxisLinks: The process-wide link groups
+    """
+    return _links
@@ -1,26 +1,18 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QComboBox, QMessageBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QMessageBox, QSpinBox
 from PyQt6.QtCore import pyqtSignal
-import pandas as pd
-from utils.csv_loader import CSVLoader
+from utils.aggregation import DEFAULT_TOP_N, OTHER_LABEL, REDUCERS
+from gui.csv_load_mixin import CSVLoadMixin
 
-class BarPlotConfigWidget(QWidget):
+class BarPlotConfigWidget(CSVLoadMixin, QWidget):
     plot_config_valid = pyqtSignal(bool)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.csv_loader = CSVLoader()
         self.initUI()
 
     def initUI(self):
         layout = QVBoxLayout(self)
-
-        file_layout = QHBoxLayout()
-        self.btn_load = QPushButton('Load CSV', self)
-        self.btn_load.clicked.connect(self.load_csv)
-        self.file_label = QLabel('No file selected', self)
-        file_layout.addWidget(self.btn_load)
-        file_layout.addWidget(self.file_label)
-        layout.addLayout(file_layout)
+        self._add_file_controls(layout)
 
         self.info_label = QLabel('Select columns to view info', self)
         layout.addWidget(self.info_label)
@@ -43,17 +35,35 @@ class BarPlotConfigWidget(QWidget):
 
         layout.addLayout(combo_layout)
 
+        aggregation_layout = QHBoxLayout()
+        self.label_reducer = QLabel('Aggregate:', self)
+        self.combo_reducer = QComboBox(self)
+        self.combo_reducer.addItems(REDUCERS)
+        self.label_top_n = QLabel('Top N Labels (0 = all):', self)
+        self.spin_top_n = QSpinBox(self)
+        self.spin_top_n.setRange(0, 1000)
+        self.spin_top_n.setValue(DEFAULT_TOP_N)
+        aggregation_layout.addWidget(self.label_reducer)
+        aggregation_layout.addWidget(self.combo_reducer)
+        aggregation_layout.addWidget(self.label_top_n)
+        aggregation_layout.addWidget(self.spin_top_n)
+        layout.addLayout(aggregation_layout)
+
         self.combo_label_col.currentTextChanged.connect(self.display_column_info)
         self.combo_value_col.currentTextChanged.connect(self.display_column_info)
+        self.spin_top_n.valueChanged.connect(self.display_column_info)
 
         self.combo_label_col.setEnabled(False)
         self.combo_value_col.setEnabled(False)
         self.info_label.setText('')
 
     def display_column_info(self):
+        if self._load_task is not None:
+            self.info_label.setText('Loading CSV...')
+            self.plot_config_valid.emit(False)
+            return
         try:
-            df = self.csv_loader.get_dataframe()
-            if df is not None and self.combo_label_col.count() > 0:
+            if self.csv_loader.is_loaded() and self.combo_label_col.count() > 0:
                 label_col = self.combo_label_col.currentText()
                 value_col = self.combo_value_col.currentText()
 
@@ -65,9 +75,26 @@ class BarPlotConfigWidget(QWidget):
                 info_parts = []
                 is_valid = True
 
-                info_parts.append(f"Label Col ('{label_col}') selected.")
+                cardinality = self.csv_loader.get_cardinality(label_col)
+                if cardinality is not None:
+                    info_parts.append(f"Label Col ('{label_col}'): {cardinality:,} distinct values.")
+                    top_n = self.spin_top_n.value()
+                    if 0 < top_n < cardinality:
+                        info_parts.append(f"Top {top_n} shown, the rest grouped as '{OTHER_LABEL}'.")
+                else:
+                    info_parts.append(f"Label Col ('{label_col}') selected.")
+
+                if not self.csv_loader.is_numeric(value_col):
+                    self.cancel_column_load()
+                elif not self.csv_loader.has_columns([label_col, value_col]):
+                    self.load_columns([label_col, value_col])
+                    self.info_label.setText('Loading columns...')
+                    self.plot_config_valid.emit(False)
+                    return
+                else:
+                    self.cancel_column_load()
 
-                if pd.api.types.is_numeric_dtype(df[value_col]):
+                if self.csv_loader.is_numeric(value_col):
                     value_range = self.csv_loader.get_column_range(value_col)
                     if value_range:
                         info_parts.append(f"Value Col ('{value_col}') Range: [{value_range[0]:.2f}, {value_range[1]:.2f}]")
@@ -78,6 +105,10 @@ class BarPlotConfigWidget(QWidget):
                     info_parts.append(f"Value Col ('{value_col}') is NOT numeric. Select a numeric column.")
                     is_valid = False
 
+                memory_report = self.csv_loader.get_memory_report([label_col, value_col])
+                if memory_report is not None:
+                    info_parts.append(memory_report.summary())
+
                 self.info_label.setText(' '.join(info_parts))
                 self.plot_config_valid.emit(is_valid)
             else:
@@ -90,21 +121,7 @@ class BarPlotConfigWidget(QWidget):
 
     def load_csv(self):
         try:
-            file_name, _ = QFileDialog.getOpenFileName(
-                self, "Open CSV File", "", "CSV Files (*.csv);;All Files (*)"
-            )
-            if file_name:
-                success, error_msg = self.csv_loader.load_csv(file_name)
-                if success:
-                    self.populate_comboboxes()
-                    self.file_label.setText(f'Loaded: {self.csv_loader.get_filename()}')
-                    self.info_label.setText('Select Label and Value columns')
-                    self.combo_label_col.setEnabled(True)
-                    self.combo_value_col.setEnabled(True)
-                    self.plot_config_valid.emit(False)
-                else:
-                    QMessageBox.critical(self, "Error Loading CSV", f"Could not load file: {error_msg}")
-                    self.clear_controls()
+            super().load_csv()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An unexpected error occurred while loading CSV: {e}")
             self.clear_controls()
@@ -116,23 +133,33 @@ class BarPlotConfigWidget(QWidget):
         self.combo_label_col.setEnabled(False)
         self.combo_value_col.setEnabled(False)
         self.plot_config_valid.emit(False)
-        self.csv_loader = CSVLoader()
+        self.csv_loader.release()
 
-    def populate_comboboxes(self):
-        self.clear_comboboxes()
-        columns = self.csv_loader.get_columns()
-        if columns:
-            self.combo_label_col.addItems(columns)
-            self.combo_value_col.addItems(columns)
+    def _column_combos(self) -> tuple:
+        return self.combo_label_col, self.combo_value_col
+
+    def _status_label(self) -> QLabel:
+        return self.info_label
+
+    def _refresh_columns(self):
+        self.display_column_info()
+
+    def _reset_controls(self):
+        self.clear_controls()
+
+    def _load_started(self):
+        self.plot_config_valid.emit(False)
 
-    def clear_comboboxes(self):
-        self.combo_label_col.clear()
-        self.combo_value_col.clear()
+    def _load_done(self, success):
+        if not success:
+            self.plot_config_valid.emit(False)
+
+    def get_aggregation(self) -> tuple:
+        return self.combo_reducer.currentText(), self.spin_top_n.value()
 
     def get_plot_data(self) -> tuple | None:
         try:
-            df = self.csv_loader.get_dataframe()
-            if df is None:
+            if not self.csv_loader.is_loaded():
                 QMessageBox.warning(self, "Error", "Please load a CSV file first.")
                 return None
 
@@ -143,10 +170,16 @@ class BarPlotConfigWidget(QWidget):
                 QMessageBox.warning(self, "Error", "Please select both Label and Value columns.")
                 return None
 
-            if not pd.api.types.is_numeric_dtype(df[value_col]):
+            df = self.csv_loader.get_dataframe([label_col, value_col])
+            # Loaded columns are checked against their stats, others against the schema sample
+            if not self.csv_loader.is_numeric(value_col):
                 QMessageBox.warning(self, "Error", f"Value column ('{value_col}') must be numeric.")
                 return None
 
+            if df is None:
+                QMessageBox.warning(self, "Error", "The selected columns are still loading.")
+                return None
+
             return df, label_col, value_col
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An unexpected error occurred: {e}")
@@ -0,0 +1,89 @@
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+DEFAULT_POOL_SIZE = 4
+
+
+class CanvasPool:
+    """
+    A few released figure/canvas pairs kept for reuse.
+
+    Figures are standalone matplotlib Figures rather than pyplot figures, so
+    nothing outside the owning widget and this pool references them, and a
+    released pair that does not fit in the pool is freed right away.
+    Scrolling through a long dashboard then recycles the same few canvases
+    instead of creating and destroying one per plot.
+    """
+    def __init__(self, max_size: int = DEFAULT_POOL_SIZE):
+        """
+        Initialize the pool.
+
+        Args:
+            max_size (int): Number of idle pairs to keep.
+        """
+        self.max_size = max_size
+        self._free = []
+
+    def acquire(self, figure_size):
+        """
+        Get an empty figure and its canvas.
+
+        Args:
+            figure_size (tuple): Initial figure size in inches.
+
+        Returns:
+            tuple: (Figure, FigureCanvas)
+        """
+        if self._free:
+            figure, canvas = self._free.pop()
+            figure.set_size_inches(figure_size, forward=False)
+            return figure, canvas
+        figure = Figure(figsize=figure_size, constrained_layout=True)
+        return figure, FigureCanvas(figure)
+
+    def release(self, figure, canvas):
+        """
+        Return a pair obtained from acquire().
+
+        The caller must have disconnected its canvas callbacks and removed the
+        canvas from its layout.
+
+        Args:
+            figure (Figure): The figure.
+            canvas (FigureCanvas): Its canvas.
+        """
+        # Drops the axes with their artists, data and callbacks
+        figure.clear()
+        canvas.hide()
+        canvas.setParent(None)
+        if len(self._free) < self.max_size:
+            self._free.append((figure, canvas))
+        else:
+            canvas.deleteLater()
+
+    def clear(self):
+        """
+        Free every idle pair.
+        """
+        for _, canvas in self._free:
+            canvas.deleteLater()
+        self._free.clear()
+
+    def __len__(self) -> int:
+        return len(self._free)
+
+    def __contains__(self, figure) -> bool:
+        return any(pooled is figure for pooled, _ in self._free)
+
+
+_pool = CanvasPool()
+
+
+def get_canvas_pool() -> CanvasPool:
+    """
+    Get the canvas pool shared by all plot containers.
+
+    Returns:
+        CanvasPool: The process-wide pool
+    """
+    return _pool
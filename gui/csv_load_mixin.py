@@ -0,0 +1,183 @@
+from PyQt6.QtWidgets import QHBoxLayout, QPushButton, QLabel, QFileDialog, QMessageBox, QProgressBar
+from PyQt6.QtCore import QThreadPool
+from utils.csv_loader import CSVLoader
+from gui.csv_load_task import CSVLoadTask, ColumnLoadTask
+
+
+class CSVLoadMixin:
+    """
+    Load, cancel and progress handling shared by the plot config widgets.
+
+    Mixed into a QWidget ahead of it. The widget provides the two column combo
+    boxes, the label that shows loading status and what to refresh or reset
+    once a load ends.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.csv_loader = CSVLoader()
+        self._load_task = None
+        self._column_task = None
+
+    def _column_combos(self) -> tuple:
+        raise NotImplementedError
+
+    def _status_label(self) -> QLabel:
+        raise NotImplementedError
+
+    def _refresh_columns(self):
+        raise NotImplementedError
+
+    def _reset_controls(self):
+        raise NotImplementedError
+
+    def _load_started(self):
+        pass
+
+    def _load_done(self, success):
+        pass
+
+    def _add_file_controls(self, layout):
+        file_layout = QHBoxLayout()
+        self.btn_load = QPushButton('Load CSV', self)
+        self.btn_load.clicked.connect(self.load_csv)
+        self.btn_cancel_load = QPushButton('Cancel', self)
+        self.btn_cancel_load.clicked.connect(self.cancel_load_clicked)
+        self.btn_cancel_load.hide()
+        self.file_label = QLabel('No file selected', self)
+        file_layout.addWidget(self.btn_load)
+        file_layout.addWidget(self.btn_cancel_load)
+        file_layout.addWidget(self.file_label)
+        layout.addLayout(file_layout)
+
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.hide()
+        layout.addWidget(self.progress_bar)
+
+    def load_csv(self):
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Open CSV File", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if file_name:
+            self.cancel_load()
+            self.csv_loader.release()
+            self._load_task = CSVLoadTask(file_name)
+            self._load_task.signals.header_ready.connect(self._on_header_ready)
+            self._load_task.signals.progress.connect(self._on_load_progress)
+            self._load_task.signals.finished.connect(self._on_load_finished)
+
+            self.clear_comboboxes()
+            self._set_combos_enabled(False)
+            self.file_label.setText(f'Loading: {file_name.split("/")[-1]}')
+            self._status_label().setText('Loading CSV...')
+            self._load_started()
+            self._show_progress()
+            QThreadPool.globalInstance().start(self._load_task)
+
+    def load_columns(self, columns):
+        self.cancel_column_load()
+        self._column_task = ColumnLoadTask(self.csv_loader, columns)
+        self._column_task.signals.progress.connect(self._on_load_progress)
+        self._column_task.signals.finished.connect(self._on_columns_loaded)
+        self._show_progress()
+        QThreadPool.globalInstance().start(self._column_task)
+
+    def is_loading(self) -> bool:
+        return self._load_task is not None or self._column_task is not None
+
+    def cancel_load(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+            self._load_task = None
+        self.cancel_column_load()
+
+    def cancel_column_load(self):
+        if self._column_task is not None:
+            self._column_task.cancel()
+            self._column_task = None
+        self._hide_progress()
+
+    def cancel_load_clicked(self):
+        if self._load_task is not None:
+            self.cancel_load()
+            self._reset_controls()
+        else:
+            self.cancel_column_load()
+            self._status_label().setText('Column loading cancelled.')
+
+    def _show_progress(self):
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.btn_cancel_load.show()
+
+    def _hide_progress(self):
+        self.progress_bar.hide()
+        self.btn_cancel_load.hide()
+
+    def _set_combos_enabled(self, enabled):
+        for combo in self._column_combos():
+            combo.setEnabled(enabled)
+
+    def _is_current_load(self) -> bool:
+        sender = self.sender()
+        return any(task is not None and sender is task.signals
+                   for task in (self._load_task, self._column_task))
+
+    def _on_header_ready(self, columns):
+        if not self._is_current_load():
+            return
+        self.clear_comboboxes()
+        for combo in self._column_combos():
+            combo.addItems(columns)
+        self._set_combos_enabled(True)
+
+    def _on_load_progress(self, bytes_read, total_bytes, rows_parsed):
+        if not self._is_current_load():
+            return
+        if total_bytes > 0:
+            self.progress_bar.setValue(int(1000 * bytes_read / total_bytes))
+        self._status_label().setText(f'Loading CSV... {rows_parsed:,} rows parsed')
+
+    def _on_load_finished(self, success, error_msg):
+        if not self._is_current_load():
+            return
+        task = self._load_task
+        self._load_task = None
+        self._hide_progress()
+
+        loader = task.take_loader()
+        if success and loader is not None:
+            self.csv_loader.release()
+            self.csv_loader = loader
+            if self._column_combos()[0].count() == 0:
+                self.populate_comboboxes()
+            self.file_label.setText(f'Loaded: {self.csv_loader.get_filename()}')
+            self._set_combos_enabled(True)
+            self._refresh_columns()
+        else:
+            QMessageBox.critical(self, "Error Loading CSV", f"Could not load file: {error_msg}")
+            self._reset_controls()
+        self._load_done(success)
+
+    def _on_columns_loaded(self, success, error_msg):
+        if not self._is_current_load():
+            return
+        self._column_task = None
+        self._hide_progress()
+        if success:
+            self._refresh_columns()
+        else:
+            QMessageBox.critical(self, "Error Loading Columns", f"Could not load columns: {error_msg}")
+            self._status_label().setText('')
+        self._load_done(success)
+
+    def populate_comboboxes(self):
+        self.clear_comboboxes()
+        columns = self.csv_loader.get_columns()
+        if columns:
+            for combo in self._column_combos():
+                combo.addItems(columns)
+
+    def clear_comboboxes(self):
+        for combo in self._column_combos():
+            combo.clear()
@@ -0,0 +1,89 @@
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from utils.csv_loader import CSVLoader
+
+
+class CSVLoadSignals(QObject):
+    header_ready = pyqtSignal(list)
+    progress = pyqtSignal('qint64', 'qint64', 'qint64')
+    finished = pyqtSignal(bool, str)
+
+
+class CSVLoadTask(QRunnable):
+    """
+    Opens a CSV file on a QThreadPool worker into a fresh CSVLoader.
+
+    Only the header and a sample of rows are read; columns are parsed later by
+    ColumnLoadTask. The widget that started the task claims the loader with
+    take_loader() once `finished` arrives. A task cancelled before its result
+    is claimed releases the loader's dataset reference itself.
+    """
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.file_path = file_path
+        self.signals = CSVLoadSignals()
+        self._loader = CSVLoader()
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+        self._finished = False
+        self._claimed = False
+
+    def run(self):
+        success, error_msg = self._loader.probe_schema(self.file_path)
+        if success:
+            self.signals.header_ready.emit(self._loader.get_columns())
+        with self._lock:
+            self._finished = True
+            if self._cancel_event.is_set():
+                self._loader.release()
+                success, error_msg = False, 'Loading cancelled.'
+        self.signals.finished.emit(success, error_msg or '')
+
+    def cancel(self):
+        with self._lock:
+            self._cancel_event.set()
+            if self._finished and not self._claimed:
+                self._loader.release()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def take_loader(self) -> CSVLoader | None:
+        with self._lock:
+            if self._cancel_event.is_set() or self._claimed:
+                return None
+            self._claimed = True
+            return self._loader
+
+
+class ColumnLoadTask(QRunnable):
+    """
+    Parses a few columns of an already opened file on a QThreadPool worker.
+
+    The columns land in the dataset registry, so the loader itself is not
+    modified and the widget can keep using it while the task runs.
+    """
+    def __init__(self, loader: CSVLoader, columns: list):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.loader = loader
+        self.columns = columns
+        self.signals = CSVLoadSignals()
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        success, error_msg = self.loader.load_columns(
+            self.columns,
+            progress_callback=self.signals.progress.emit,
+            cancel_event=self._cancel_event,
+        )
+        self.signals.finished.emit(success, error_msg or '')
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
@@ -0,0 +1,53 @@
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+import pandas as pd
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    """
+    A read-only table model that reads cells straight from a DataFrame's columns.
+
+    Cells are only formatted when the view asks for them, and rows are exposed
+    in batches through canFetchMore()/fetchMore() as the view scrolls, so the
+    cost of showing a preview does not depend on the number of rows.
+    """
+    FETCH_BATCH_ROWS = 1000
+
+    def __init__(self, df: pd.DataFrame, parent=None):
+        super().__init__(parent)
+        self._headers = [str(name) for name in df.columns]
+        # Kept as Series: converting categorical or Arrow columns to arrays would
+        # copy them into object arrays as large as the data
+        self._columns = [df.iloc[:, i] for i in range(df.shape[1])]
+        self._total_rows = len(df)
+        self._loaded_rows = min(self.FETCH_BATCH_ROWS, self._total_rows)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return str(self._columns[index.column()].iat[index.row()])
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self._headers[section]
+        return str(section)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded_rows < self._total_rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH_ROWS, self._total_rows - self._loaded_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded_rows, self._loaded_rows + count - 1)
+        self._loaded_rows += count
+        self.endInsertRows()
@@ -1,14 +1,21 @@
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QPushButton, QScrollArea, QMessageBox, QMenu)
-from PyQt6.QtCore import Qt, QObject
-from gui.add_plot_dialog import AddPlotDialog
+                            QPushButton, QScrollArea, QMessageBox, QMenu, QInputDialog,
+                            QFileDialog, QSplitter)
+from PyQt6.QtCore import Qt, QObject, QTimer
+from gui.performance_panel import PerformancePanel
 from gui.plot_type_selection_dialog import PlotTypeSelectionDialog
-from gui.add_bar_plot_dialog import AddBarPlotDialog
-from gui.plot_containers import PlotContainer, XYPlotContainer, BarPlotContainer # Import specific types
+from utils.startup import configure_registry
 
+# The dialogs, plot containers and session support import pandas and matplotlib,
+# so they are imported on first use to let the window show with only PyQt6 loaded.
 
 
 class MainWindow(QMainWindow):
+    # Plots within this many viewport heights above or below the visible area stay live
+    VIRTUALIZATION_MARGIN = 0.5
+    # A window resize is considered finished after this long without resize events
+    RESIZE_SETTLE_MS = 150
+
     def __init__(self):
         super().__init__()
         self.plot_widgets = []
@@ -38,19 +45,53 @@ class MainWindow(QMainWindow):
         self.btn_undo_delete.setEnabled(False)
         sidebar_layout.addWidget(self.btn_undo_delete)
 
+        self.btn_save_session = QPushButton('Save Session')
+        self.btn_save_session.clicked.connect(self.save_session)
+        sidebar_layout.addWidget(self.btn_save_session)
+
+        self.btn_open_session = QPushButton('Open Session')
+        self.btn_open_session.clicked.connect(self.open_session)
+        sidebar_layout.addWidget(self.btn_open_session)
+
+        self.btn_performance = QPushButton('Performance')
+        self.btn_performance.setCheckable(True)
+        sidebar_layout.addWidget(self.btn_performance)
+
         self.central_widget = QWidget()
         self.plot_layout = QVBoxLayout(self.central_widget)
         self.plot_layout.setContentsMargins(0, 0, 0, 0)
         self.plot_layout.setSpacing(0)
         self.plot_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(self.central_widget)
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidget(self.central_widget)
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+
+        # Coalesces scroll and layout changes into one visibility pass once the layout has settled
+        self._visibility_timer = QTimer(self)
+        self._visibility_timer.setSingleShot(True)
+        self._visibility_timer.setInterval(30)
+        self._visibility_timer.timeout.connect(self._update_plot_visibility)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self._schedule_visibility_update)
+
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_SETTLE_MS)
+        self._resize_timer.timeout.connect(self._finish_resize)
+
+        self.performance_panel = PerformancePanel()
+        self.performance_panel.hide()
+        self.btn_performance.toggled.connect(self.performance_panel.setVisible)
+
+        content_splitter = QSplitter(Qt.Orientation.Vertical)
+        content_splitter.addWidget(self.scroll_area)
+        content_splitter.addWidget(self.performance_panel)
+        content_splitter.setStretchFactor(0, 3)
+        content_splitter.setStretchFactor(1, 1)
 
         main_layout.addWidget(self.sidebar)
-        main_layout.addWidget(scroll_area)
+        main_layout.addWidget(content_splitter)
 
     def show_plot_selection_dialog(self):
         dialog = PlotTypeSelectionDialog(self)
@@ -59,11 +100,15 @@ class MainWindow(QMainWindow):
         dialog.exec()
 
     def open_timeseries_plot_dialog(self):
+        configure_registry()
+        from gui.add_plot_dialog import AddPlotDialog
         dialog = AddPlotDialog(self)
         dialog.plot_ready.connect(self._add_new_plot)
         dialog.exec()
 
     def open_bar_plot_dialog(self):
+        configure_registry()
+        from gui.add_bar_plot_dialog import AddBarPlotDialog
         dialog = AddBarPlotDialog(self)
         dialog.plot_ready.connect(self._add_new_plot)
         dialog.exec()
@@ -87,10 +132,40 @@ class MainWindow(QMainWindow):
         context_menu = QMenu(self)
         delete_action = context_menu.addAction("Delete Plot")
         duplicate_action = context_menu.addAction("Duplicate Plot")
+        follow_action = context_menu.addAction("Follow File")
+        follow_action.setCheckable(True)
+        follow_action.setChecked(plot_widget.is_following())
+        follow_action.setEnabled(plot_widget.dataset_key is not None)
         delete_action.triggered.connect(lambda: self._remove_plot_widget(plot_widget))
         duplicate_action.triggered.connect(lambda: self._duplicate_plot_widget(plot_widget))
+        follow_action.toggled.connect(lambda checked: self._toggle_follow(plot_widget, checked))
+        if plot_widget.PLOT_TYPE == 'xy':
+            # Scrolling zooms and dragging pans the X axis of every linked plot of the same data
+            link_action = context_menu.addAction("Link X Axis")
+            link_action.setCheckable(True)
+            link_action.setChecked(plot_widget.link_x)
+            link_action.setEnabled(plot_widget.dataset_key is not None)
+            link_action.toggled.connect(plot_widget.set_x_linked)
         context_menu.exec(plot_widget.mapToGlobal(pos))
 
+    def _toggle_follow(self, plot_widget, checked):
+        if not checked:
+            plot_widget.stop_following()
+            return
+        max_rows = None
+        if plot_widget.PLOT_TYPE == 'xy':
+            # Bar plots keep per-label totals, so only XY plots need a row limit
+            limit, ok = QInputDialog.getInt(self, "Follow File",
+                                            "Keep at most this many latest rows (0 for no limit):",
+                                            0, 0, 2_000_000_000)
+            if not ok:
+                return
+            max_rows = limit or None
+        try:
+            plot_widget.follow_file(max_rows)
+        except Exception as e:
+            QMessageBox.critical(self, "Follow Error", f"Failed to follow the file: {e}")
+
     def _remove_plot_widget(self, plot_widget_to_remove: QWidget):
         try:
             index = self.plot_widgets.index(plot_widget_to_remove)
@@ -99,16 +174,35 @@ class MainWindow(QMainWindow):
 
         creation_params = plot_widget_to_remove.creation_params
         plot_class = type(plot_widget_to_remove)
+        dataset_key = plot_widget_to_remove.dataset_key
 
-        if creation_params:
-            self.deleted_plots.append((creation_params, index, plot_class))
-            self.plot_layout.removeWidget(plot_widget_to_remove)
-            self.plot_widgets.pop(index)
-            plot_widget_to_remove.setParent(None)
-            plot_widget_to_remove.deleteLater()
-            self.btn_undo_delete.setEnabled(True)
+        if creation_params or plot_widget_to_remove.is_pending():
+            if creation_params:
+                from utils.dataset_registry import get_registry
+                # The entry holds its own reference so undo can reattach the dataset
+                # even after the last plot of the file is gone
+                if not get_registry().retain(dataset_key):
+                    dataset_key = None
+                self.deleted_plots.append((creation_params, index, plot_class, dataset_key,
+                                           plot_widget_to_remove.source_path))
+                self.btn_undo_delete.setEnabled(True)
+            self._discard_plot_widget(plot_widget_to_remove)
             self._update_plot_widget_heights()
 
+    def _clear_deleted_plots(self):
+        from utils.dataset_registry import get_registry
+        for _, _, _, dataset_key, _ in self.deleted_plots:
+            get_registry().release(dataset_key)
+        self.deleted_plots.clear()
+        self.btn_undo_delete.setEnabled(False)
+
+    def _discard_plot_widget(self, plot_widget):
+        plot_widget.dispose()
+        self.plot_layout.removeWidget(plot_widget)
+        self.plot_widgets.remove(plot_widget)
+        plot_widget.setParent(None)
+        plot_widget.deleteLater()
+
     def _duplicate_plot_widget(self, plot_widget_to_duplicate: QWidget):
         try:
             original_index = self.plot_widgets.index(plot_widget_to_duplicate)
@@ -127,9 +221,13 @@ class MainWindow(QMainWindow):
                 QMessageBox.critical(self, "Plot Duplication Error", 
                                      f"Missing DataFrame in stored parameters for duplication.")
                 return
+            new_plot_widget.attach_dataset(plot_widget_to_duplicate.dataset_key)
+            new_plot_widget.source_path = plot_widget_to_duplicate.source_path
             try:
                 new_plot_widget.plot(df=df, **kwargs)
             except Exception as e:
+                new_plot_widget.dispose()
+                new_plot_widget.deleteLater()
                 QMessageBox.critical(self, "Plot Duplication Error", 
                                      f"Failed to duplicate plot: {e}")
                 return
@@ -139,7 +237,9 @@ class MainWindow(QMainWindow):
         if not self.deleted_plots:
             return
 
-        creation_params, index, plot_class = self.deleted_plots.pop()
+        from utils.dataset_registry import get_registry
+        entry = self.deleted_plots.pop()
+        creation_params, index, plot_class, dataset_key, source_path = entry
         params_copy = creation_params.copy()
         new_plot_widget = plot_class(parent=self.central_widget)
         df = params_copy.get('df')
@@ -147,24 +247,133 @@ class MainWindow(QMainWindow):
         if df is None:
             QMessageBox.critical(self, "Plot Recreation Error", 
                                  f"Missing DataFrame in stored parameters for undo.")
+            get_registry().release(dataset_key)
             if not self.deleted_plots:
                 self.btn_undo_delete.setEnabled(False)
             return
+        new_plot_widget.attach_dataset(dataset_key)
+        new_plot_widget.source_path = source_path
         try:
             new_plot_widget.plot(df=df, **kwargs)
         except Exception as e:
+            new_plot_widget.dispose()
+            new_plot_widget.deleteLater()
             QMessageBox.critical(self, "Plot Recreation Error", 
                                  f"Failed to recreate plot: {e}")
-            self.deleted_plots.append((creation_params, index, plot_class))
+            self.deleted_plots.append(entry)
             return
+        get_registry().release(dataset_key)
         self._insert_plot_widget(new_plot_widget, index)
         if not self.deleted_plots:
             self.btn_undo_delete.setEnabled(False)
 
+    def save_session(self):
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Session", "", "Session Files (*.json)")
+        if not file_path:
+            return
+        from utils.session import SessionPlot, save_session
+        plots = []
+        skipped = 0
+        for plot_widget in self.plot_widgets:
+            params = plot_widget.plot_params()
+            if params is None or plot_widget.source_path is None:
+                skipped += int(params is not None)
+                continue
+            plots.append(SessionPlot(plot_widget.PLOT_TYPE, plot_widget.source_path, params))
+        try:
+            save_session(file_path, plots)
+        except (OSError, TypeError, ValueError) as e:
+            QMessageBox.critical(self, "Session Error", f"Failed to save the session: {e}")
+            return
+        if skipped:
+            QMessageBox.warning(self, "Session Saved With Problems",
+                                f"{skipped} plot(s) were left out because their source file is unknown.")
+
+    def open_session(self):
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Session", "", "Session Files (*.json)")
+        if not file_path:
+            return
+        configure_registry()
+        from gui.plot_containers import BarPlotContainer, XYPlotContainer
+        from utils.csv_loader import CSVLoader
+        from utils.session import load_session
+        plot_classes = {cls.PLOT_TYPE: cls for cls in (XYPlotContainer, BarPlotContainer)}
+        try:
+            session = load_session(file_path)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(self, "Session Error", f"Failed to open the session: {e}")
+            return
+
+        for plot_widget in list(self.plot_widgets):
+            self._discard_plot_widget(plot_widget)
+        self._clear_deleted_plots()
+
+        # Each file is opened once, reading only its header and a sample; plots
+        # parse their columns when they first scroll into view
+        loaders = {}
+        failed = []
+        for path in session.file_paths():
+            loader = CSVLoader()
+            success, error_msg = loader.probe_schema(path)
+            if success:
+                loaders[path] = loader
+            else:
+                failed.append(f"{path}: {error_msg}")
+
+        for plot in session.plots:
+            loader = loaders.get(plot.file_path)
+            plot_class = plot_classes.get(plot.plot_type)
+            if loader is None or plot_class is None:
+                continue
+            plot_widget = plot_class(parent=self.central_widget)
+            plot_widget.defer_plot(loader.clone(), **plot.params)
+            self._insert_plot_widget(plot_widget, len(self.plot_widgets))
+        for loader in loaders.values():
+            loader.release()
+
+        changed = [path for path in session.changed_files() if path in loaders]
+        if failed or changed:
+            lines = failed + [f"{path}: changed since the session was saved" for path in changed]
+            QMessageBox.warning(self, "Session Opened With Problems", "\n".join(lines))
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        if not self._resize_timer.isActive():
+            # First event of a drag: switch plots to cheap scaled snapshots
+            for plot_widget in self.plot_widgets:
+                plot_widget.begin_resize_preview()
+        self._resize_timer.start()
         self._update_plot_widget_heights()
 
+    def _finish_resize(self):
+        self._update_plot_visibility()
+
+    def _schedule_visibility_update(self):
+        self._visibility_timer.start()
+
+    def _update_plot_visibility(self):
+        """
+        Keep canvases live only for plots in or near the viewport; the rest show a snapshot.
+
+        Plots still showing a resize preview are re-rendered only once they are
+        actually visible.
+        """
+        if self._resize_timer.isActive():
+            # _finish_resize() runs this once the resize has settled
+            return
+        viewport_height = self.scroll_area.viewport().height()
+        margin = int(viewport_height * self.VIRTUALIZATION_MARGIN)
+        visible_top = self.scroll_area.verticalScrollBar().value()
+        visible_bottom = visible_top + viewport_height
+        for plot_widget in self.plot_widgets:
+            geometry = plot_widget.geometry()
+            if geometry.bottom() >= visible_top - margin and geometry.top() <= visible_bottom + margin:
+                plot_widget.resume()
+                if geometry.bottom() >= visible_top and geometry.top() <= visible_bottom:
+                    plot_widget.end_resize_preview()
+            else:
+                plot_widget.suspend()
+
     def _update_plot_widget_heights(self):
         if not self.plot_widgets:
             return
@@ -176,4 +385,5 @@ class MainWindow(QMainWindow):
                 if plot_widget:
                     plot_widget.setFixedHeight(fixed_height)
             except RuntimeError:
-                print(f"Warning: Attempted to access deleted widget in _update_plot_widget_heights. Widget: {plot_widget}")
\ No newline at end of file
+                print(f"Warning: Attempted to access deleted widget in _update_plot_widget_heights. Widget: {plot_widget}")
+        self._schedule_visibility_update()
\ No newline at end of file
@@ -0,0 +1,96 @@
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
+                             QTableWidgetItem, QHeaderView, QFileDialog, QMessageBox, QLabel)
+from PyQt6.QtCore import QTimer
+
+from utils.instrumentation import get_tracer
+
+
+class PerformancePanel(QWidget):
+    # Most recent spans listed in the table; exports always contain all recorded spans
+    MAX_ROWS = 500
+    REFRESH_MS = 500
+    HEADERS = ('Phase', 'Target', 'Time (ms)', 'Rows', 'Memory (MB)', 'Thread')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._shown_version = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        header_layout.addWidget(self.summary_label, 1)
+        self.btn_clear = QPushButton('Clear')
+        self.btn_clear.clicked.connect(self.clear)
+        header_layout.addWidget(self.btn_clear)
+        self.btn_export_json = QPushButton('Export JSON')
+        self.btn_export_json.clicked.connect(lambda: self.export(chrome_trace=False))
+        header_layout.addWidget(self.btn_export_json)
+        self.btn_export_trace = QPushButton('Export Chrome Trace')
+        self.btn_export_trace.clicked.connect(lambda: self.export(chrome_trace=True))
+        header_layout.addWidget(self.btn_export_trace)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget(0, len(self.HEADERS))
+        self.table.setHorizontalHeaderLabels(self.HEADERS)
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        layout.addWidget(self.table)
+
+        # Only polls while the panel is shown
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(self.REFRESH_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
+
+    def refresh(self):
+        tracer = get_tracer()
+        if tracer.version == self._shown_version:
+            return
+        self._shown_version = tracer.version
+        spans = tracer.spans()
+        recent = spans[-self.MAX_ROWS:][::-1]
+
+        self.table.setRowCount(len(recent))
+        for row, span in enumerate(recent):
+            values = (
+                span.name,
+                span.label,
+                f'{span.duration * 1000:.1f}',
+                '' if span.rows is None else f'{span.rows:,}',
+                '' if span.memory is None else f'{span.memory / 1024 ** 2:.1f}',
+                str(span.thread_id),
+            )
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+
+        totals = {}
+        for span in spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        summary = ', '.join(f'{name} {total * 1000:.0f} ms'
+                            for name, total in sorted(totals.items(), key=lambda item: -item[1]))
+        self.summary_label.setText(f'{len(spans)} spans. Total: {summary}' if spans else 'No spans recorded.')
+
+    def clear(self):
+        get_tracer().clear()
+        self.refresh()
+
+    def export(self, chrome_trace: bool):
+        title = 'Export Chrome Trace' if chrome_trace else 'Export JSON'
+        file_path, _ = QFileDialog.getSaveFileName(self, title, '', 'JSON Files (*.json)')
+        if not file_path:
+            return
+        try:
+            get_tracer().export(file_path, chrome_trace=chrome_trace)
+        except OSError as e:
+            QMessageBox.critical(self, 'Export Error', f'Failed to export the profile: {e}')
@@ -1,27 +1,20 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QFileDialog, QComboBox, QMessageBox
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QMessageBox
 from PyQt6.QtCore import pyqtSignal
 import pandas as pd
-from utils.csv_loader import CSVLoader
+from gui.csv_load_mixin import CSVLoadMixin
 
 
-class PlotConfigWidget(QWidget):
+class PlotConfigWidget(CSVLoadMixin, QWidget):
     plot_requested = pyqtSignal(pd.DataFrame, str, str)
+    load_finished = pyqtSignal(bool)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.csv_loader = CSVLoader()
         self.initUI()
 
     def initUI(self):
         layout = QVBoxLayout(self)
-
-        file_layout = QHBoxLayout()
-        self.btn_load = QPushButton('Load CSV', self)
-        self.btn_load.clicked.connect(self.load_csv)
-        self.file_label = QLabel('No file selected', self)
-        file_layout.addWidget(self.btn_load)
-        file_layout.addWidget(self.file_label)
-        layout.addLayout(file_layout)
+        self._add_file_controls(layout)
 
         self.range_label = QLabel('Select columns to view data range', self)
         layout.addWidget(self.range_label)
@@ -52,7 +45,10 @@ class PlotConfigWidget(QWidget):
         self.range_label.setText('')
 
     def display_column_range(self):
-        if self.csv_loader.get_dataframe() is not None and self.combo_x.count() > 0:
+        if self._load_task is not None:
+            self.range_label.setText('Loading CSV...')
+            return False
+        if self.csv_loader.is_loaded() and self.combo_x.count() > 0:
             x_col = self.combo_x.currentText()
             y_col = self.combo_y.currentText()
 
@@ -60,11 +56,34 @@ class PlotConfigWidget(QWidget):
                 self.range_label.setText('Select columns to view data range')
                 return False
 
+            # The schema sample is enough to reject text columns without parsing them
+            non_numeric_cols = [col for col in dict.fromkeys((x_col, y_col))
+                                if not self._is_plottable(col, allow_datetime=(col == x_col))]
+            if non_numeric_cols:
+                self.cancel_column_load()
+                self.range_label.setText(
+                    f"Column(s) {', '.join(non_numeric_cols)} not numeric. Select numeric columns "
+                    f"or a timestamp X column.")
+                return False
+
+            if not self.csv_loader.has_columns([x_col, y_col]):
+                self.load_columns([x_col, y_col])
+                self.range_label.setText('Loading columns...')
+                return False
+            self.cancel_column_load()
+
             x_range = self.csv_loader.get_column_range(x_col)
+            x_time_range = self.csv_loader.get_time_range(x_col)
             y_range = self.csv_loader.get_column_range(y_col)
 
             is_plot_possible = False
-            if x_range and y_range:
+            if x_time_range and y_range:
+                range_text = (
+                    f"X Column ({x_col}) Range: {x_time_range[0]} to {x_time_range[1]} "
+                    f"Y Column ({y_col}) Range: Min = {y_range[0]:.2f}, Max = {y_range[1]:.2f}"
+                )
+                is_plot_possible = True
+            elif x_range and y_range:
                 range_text = (
                     f"X Column ({x_col}) Range: Min = {x_range[0]:.2f}, Max = {x_range[1]:.2f} "
                     f"Y Column ({y_col}) Range: Min = {y_range[0]:.2f}, Max = {y_range[1]:.2f}"
@@ -72,7 +91,7 @@ class PlotConfigWidget(QWidget):
                 is_plot_possible = True
             else:
                 non_numeric_cols = []
-                if not x_range and x_col:
+                if not (x_range or x_time_range) and x_col:
                     non_numeric_cols.append(x_col)
                 if not y_range and y_col:
                     non_numeric_cols.append(y_col)
@@ -82,46 +101,45 @@ class PlotConfigWidget(QWidget):
                 else:
                     range_text = 'Select columns to view data range'
 
+            memory_report = self.csv_loader.get_memory_report([x_col, y_col])
+            if memory_report is not None:
+                range_text = f'{range_text} {memory_report.summary()}'
+
             self.range_label.setText(range_text)
             return is_plot_possible
         else:
             self.range_label.setText('Load CSV and select columns')
             return False
 
-    def load_csv(self):
-        file_name, _ = QFileDialog.getOpenFileName(
-            self, "Open CSV File", "", "CSV Files (*.csv);;All Files (*)"
-        )
-        if file_name:
-            success, error_msg = self.csv_loader.load_csv(file_name)
-            if success:
-                self.populate_comboboxes()
-                self.file_label.setText(f'Loaded: {self.csv_loader.get_filename()}')
-                self.range_label.setText('Select columns to view data range')
-                self.combo_x.setEnabled(True)
-                self.combo_y.setEnabled(True)
-            else:
-                QMessageBox.critical(self, "Error Loading CSV", f"Could not load file: {error_msg}")
-                self.clear_comboboxes()
-                self.file_label.setText('No file selected')
-                self.range_label.setText('')
-                self.combo_x.setEnabled(False)
-                self.combo_y.setEnabled(False)
-
-    def populate_comboboxes(self):
+    def reset_controls(self):
         self.clear_comboboxes()
-        columns = self.csv_loader.get_columns()
-        if columns:
-            self.combo_x.addItems(columns)
-            self.combo_y.addItems(columns)
+        self.file_label.setText('No file selected')
+        self.range_label.setText('')
+        self.combo_x.setEnabled(False)
+        self.combo_y.setEnabled(False)
+
+    def _column_combos(self) -> tuple:
+        return self.combo_x, self.combo_y
+
+    def _status_label(self) -> QLabel:
+        return self.range_label
+
+    def _refresh_columns(self):
+        self.display_column_range()
 
-    def clear_comboboxes(self):
-        self.combo_x.clear()
-        self.combo_y.clear()
+    def _reset_controls(self):
+        self.reset_controls()
+
+    def _load_done(self, success):
+        self.load_finished.emit(success)
+
+    def _is_plottable(self, column_name, allow_datetime=False) -> bool:
+        if self.csv_loader.is_numeric(column_name):
+            return True
+        return allow_datetime and self.csv_loader.is_datetime(column_name)
 
     def get_plot_data(self) -> tuple | None:
-        df = self.csv_loader.get_dataframe()
-        if df is None:
+        if not self.csv_loader.is_loaded():
             QMessageBox.warning(self, "Error", "Please load a CSV file first.")
             return None
 
@@ -132,8 +150,15 @@ class PlotConfigWidget(QWidget):
             QMessageBox.warning(self, "Error", "Please select both X and Y columns.")
             return None
 
-        if not (pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col])):
-            QMessageBox.warning(self, "Error", "Please select numeric columns for plotting.")
+        df = self.csv_loader.get_dataframe([x_col, y_col])
+        # Loaded columns are checked against their stats, others against the schema sample
+        if not (self._is_plottable(x_col, allow_datetime=True) and self._is_plottable(y_col)):
+            QMessageBox.warning(self, "Error",
+                                "Please select numeric columns for plotting; X may also be a timestamp column.")
+            return None
+
+        if df is None:
+            QMessageBox.warning(self, "Error", "The selected columns are still loading.")
             return None
 
-        return df, x_col, y_col 
\ No newline at end of file
+        return df, x_col, y_col
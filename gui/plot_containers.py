@@ -1,30 +1,445 @@
-import matplotlib.pyplot as plt
 from abc import ABC, abstractmethod
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QMessageBox, 
-                             QMenu, QApplication)
-from PyQt6.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+                             QMenu, QApplication, QLabel)
+from PyQt6.QtCore import Qt, QFileSystemWatcher, QThreadPool, QTimer
+from PyQt6.QtGui import QImage, QPainter
+from matplotlib.backend_bases import MouseButton
+from matplotlib.layout_engine import ConstrainedLayoutEngine
+import numpy as np
 import pandas as pd
 
-from gui.visualizations import Visualization, TimeseriesVisualization, BarPlotVisualization
+from utils.aggregation import DEFAULT_TOP_N, BarAggregator
+from utils.csv_loader import CSVFollower, FileTruncated
+from utils.dataset_registry import get_registry
+from utils.datetimes import parse_datetimes
+from utils.decimation import (DECIMATION_POINTS_PER_PIXEL, DENSITY_ROW_THRESHOLD, SortedXIndex,
+                              SortedXYBuffer, occupancy_decimate, window_slice)
+from utils.dataset_snapshot import DatasetSnapshot
+from utils.instrumentation import approx_nbytes, get_tracer
+from gui.axis_links import get_axis_links
+from gui.canvas_pool import get_canvas_pool
+from gui.csv_load_task import ColumnLoadTask
+from gui.render_task import RenderTask
+from gui.visualizations import (Visualization, TimeseriesVisualization, BarPlotVisualization,
+                                DensityVisualization)
+
+class _TracedConstrainedLayout(ConstrainedLayoutEngine):
+    """Constrained layout that records every solve as a 'layout' span."""
+    def __init__(self, label, **kwargs):
+        super().__init__(**kwargs)
+        self._label = label
+
+    def execute(self, fig):
+        with get_tracer().span('layout', self._label):
+            return super().execute(fig)
+
+
+class _ImagePlaceholder(QLabel):
+    """Label that can also show a QImage scaled to its size, without converting it to a pixmap."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._image = None
+
+    def set_image(self, image: QImage):
+        super().clear()
+        self._image = image
+        self.update()
+
+    def setPixmap(self, pixmap):
+        self._image = None
+        super().setPixmap(pixmap)
+
+    def setText(self, text):
+        self._image = None
+        super().setText(text)
+
+    def clear(self):
+        self._image = None
+        super().clear()
+
+    def has_content(self) -> bool:
+        return self._image is not None or not self.pixmap().isNull()
+
+    def paintEvent(self, event):
+        if self._image is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self._image)
+        painter.end()
+
 
 class PlotContainer(QWidget):
+    # Name of the plot type in session files and dashboard specs
+    PLOT_TYPE = None
+    # Follow mode polls at this interval, in addition to file change notifications
+    FOLLOW_POLL_MS = 1000
+
     def __init__(self, parent=None, figure_size=(5, 4)):
         super().__init__(parent)
         self.figure_size = figure_size
         self._visualization = self._create_visualization()
-        
-        self.figure = plt.figure(figsize=self.figure_size, constrained_layout=True)
-        self.canvas = FigureCanvas(self.figure)
-        self.ax = self.figure.add_subplot(111)
-        
+
+        # Shown instead of the canvas while the plot is scrolled out of view,
+        # and as a rendered image until the mouse enters the plot
+        self._placeholder = _ImagePlaceholder(self)
+        self._placeholder.setScaledContents(True)
+        self._placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._placeholder.hide()
+
         layout = QVBoxLayout(self)
-        layout.addWidget(self.canvas)
+        layout.addWidget(self._placeholder)
         self.setLayout(layout)
 
+        self.figure = None
+        self.canvas = None
+        self.ax = None
+        self._canvas_cids = []
+        self._resize_preview = False
         self._original_data_for_plot_undo = None
+        self._prepared_data = None
+        self._artist = None
+        # What the current artist shows, and the axes without it, for in-place updates
+        self._drawn_data = None
+        self._drawn_by = None
+        self._background = None
+        self._build_canvas()
         
         self.creation_params = None
+        self.dataset_key = None
+        # Real path of the CSV the plot was built from; kept after the dataset is released
+        self.source_path = None
+
+        self._follower = None
+        self._follow_timer = None
+        self._follow_watcher = None
+
+        # Set by defer_plot(): (loader, plot kwargs) to plot once the plot comes into view
+        self._pending_plot = None
+        self._pending_task = None
+        self._resume_on_load = False
+
+        # Off-thread rendering of suspended plots that are in view
+        self._in_view = True
+        self._render_task = None
+        self._render_target = None
+        self._rendered_data = None
+        self._rendered_size = None
+        # The array the shown QImage points into; must outlive the image
+        self._render_buffer = None
+
+    def _build_canvas(self):
+        self.figure, self.canvas = get_canvas_pool().acquire(self.figure_size)
+        self.ax = self.figure.add_subplot(111)
+        self.layout().addWidget(self.canvas)
+        self.canvas.show()
+        self._mpl_connect('draw_event', self._on_canvas_draw)
+        self._connect_canvas()
+
+    def _connect_canvas(self):
+        """Hook for subclasses to connect canvas events with _mpl_connect(); called for every new canvas."""
+        pass
+
+    def _mpl_connect(self, event, handler):
+        # Tracked so a pooled canvas does not keep calling into this widget
+        self._canvas_cids.append(self.canvas.mpl_connect(event, handler))
+
+    def is_suspended(self) -> bool:
+        return self.canvas is None
+
+    def suspend(self):
+        """Swap the live canvas for a static snapshot of it and free the figure."""
+        self._resume_on_load = False
+        self._in_view = False
+        self._cancel_render()
+        if self.canvas is None or self._prepared_data is None:
+            return
+        if not self._resize_preview:
+            self._placeholder.setPixmap(self.canvas.grab())
+        self._resize_preview = False
+        self._placeholder.show()
+        self._release_canvas()
+
+    def _release_canvas(self):
+        for cid in self._canvas_cids:
+            self.canvas.mpl_disconnect(cid)
+        self._canvas_cids = []
+        self.layout().removeWidget(self.canvas)
+        get_canvas_pool().release(self.figure, self.canvas)
+        self.figure = None
+        self.canvas = None
+        self.ax = None
+        self._artist = None
+        self._drawn_data = None
+        self._background = None
+
+    def resume(self):
+        """
+        Show the plot again after suspend().
+
+        The figure is rendered into an image on a worker thread; the live canvas
+        is only rebuilt once the mouse enters the plot.
+        """
+        self._in_view = True
+        if self._pending_plot is not None:
+            self._load_pending_plot()
+            return
+        if self._needs_render():
+            self._render_async()
+        elif self.canvas is None and self._prepared_data is not None:
+            self._placeholder.show()
+
+    def enterEvent(self, event):
+        super().enterEvent(event)
+        if self._in_view and self._pending_plot is None:
+            self._go_live()
+
+    def _go_live(self):
+        """Replace the rendered image with an interactive canvas."""
+        if self.canvas is not None:
+            return
+        self._cancel_render()
+        self._build_canvas()
+        self._placeholder.hide()
+        if self._prepared_data is not None:
+            self._draw_plot(self._prepared_data)
+
+    def _needs_render(self) -> bool:
+        """Whether the shown or rendering image is missing or out of date."""
+        if (self.canvas is not None or not self._in_view or self._prepared_data is None
+                or self._pending_plot is not None):
+            return False
+        size = self._render_size()[0]
+        if self._render_target is not None:
+            target_data, target_size, _ = self._render_target
+            return not (target_data is self._prepared_data and target_size == size)
+        return not (self._rendered_data is self._prepared_data and self._rendered_size == size
+                    and self._placeholder.has_content())
+
+    def _render_size(self):
+        """Size of the plot area in device pixels, and the device pixel ratio."""
+        ratio = self.devicePixelRatioF()
+        rect = self.layout().contentsRect()
+        if rect.width() > 0 and rect.height() > 0:
+            width, height = rect.width(), rect.height()
+        else:
+            width, height = self.figure_size[0] * 100, self.figure_size[1] * 100
+        return (max(1, round(width * ratio)), max(1, round(height * ratio))), ratio
+
+    def _render_async(self):
+        """Rasterize the prepared data on a worker thread; any older render is dropped."""
+        self._cancel_render()
+        size, ratio = self._render_size()
+        self._render_target = (self._prepared_data, size, ratio)
+        self._render_task = RenderTask(self._visualization, self._prepared_data, size, 100 * ratio)
+        self._render_task.signals.finished.connect(self._on_render_finished)
+        if not self._placeholder.has_content():
+            self._placeholder.setText('Rendering…')
+        self._placeholder.show()
+        QThreadPool.globalInstance().start(self._render_task)
+
+    def _cancel_render(self):
+        if self._render_task is not None:
+            self._render_task.cancel()
+            self._render_task = None
+            self._render_target = None
+
+    def _on_render_finished(self, buffer, error_msg):
+        if self._render_task is None or self.sender() is not self._render_task.signals:
+            return
+        prepared_data, size, ratio = self._render_target
+        self._render_task = None
+        self._render_target = None
+        if self.canvas is not None:
+            return
+        if buffer is None:
+            self._placeholder.setText(f'Failed to render the plot: {error_msg}')
+            return
+        height, width = buffer.shape[:2]
+        # Wraps the Agg buffer without copying it
+        image = QImage(buffer.data, width, height, buffer.strides[0], QImage.Format.Format_RGBA8888)
+        image.setDevicePixelRatio(ratio)
+        self._render_buffer = buffer
+        self._rendered_data = prepared_data
+        self._rendered_size = size
+        self._placeholder.set_image(image)
+
+    def dispose(self):
+        """Stop all background work and hand the canvas back to the pool; call before deleting the widget."""
+        self.stop_following()
+        self.cancel_pending_plot()
+        self._cancel_render()
+        self.release_dataset()
+        if self.canvas is not None:
+            self._release_canvas()
+        self._prepared_data = None
+        self._original_data_for_plot_undo = None
+
+    def begin_resize_preview(self):
+        """
+        Show a scaled copy of the last rendered frame while the window is being resized.
+
+        The canvas is hidden so layout changes do not make it re-render on every
+        resize step; end_resize_preview() brings it back for one exact render.
+        """
+        if self.canvas is None or self._resize_preview or self._prepared_data is None:
+            return
+        self._placeholder.setPixmap(self.canvas.grab())
+        self._placeholder.show()
+        self.canvas.hide()
+        self._resize_preview = True
+
+    def end_resize_preview(self):
+        if self._rendered_data is not None and self._needs_render():
+            # The rendered image was stretched by the resize; render it again at the new size
+            self._render_async()
+        if not self._resize_preview:
+            return
+        self._resize_preview = False
+        if self.canvas is not None:
+            self._placeholder.hide()
+            self.canvas.show()
+
+    def attach_dataset(self, dataset_key):
+        """Hold a registry reference on the dataset this plot was built from."""
+        self.release_dataset()
+        if dataset_key is not None:
+            # The registry key starts with the dataset's real path
+            self.source_path = dataset_key[0]
+        if get_registry().retain(dataset_key):
+            self.dataset_key = dataset_key
+
+    def release_dataset(self):
+        if self.dataset_key is not None:
+            get_registry().release(self.dataset_key)
+            self.dataset_key = None
+
+    def defer_plot(self, loader, **kwargs):
+        """
+        Plot from `loader` only once the plot first comes into view.
+
+        Until then, no columns are parsed and no canvas exists. The container
+        takes ownership of the loader and releases it after plotting.
+
+        Args:
+            loader (CSVLoader): Loader with the dataset opened.
+            **kwargs: Arguments for plot().
+        """
+        self.attach_dataset(loader.get_dataset_key())
+        self._pending_plot = (loader, kwargs)
+        if self.canvas is not None:
+            self._release_canvas()
+        self._placeholder.setText(f'{loader.get_filename()}: loading when shown')
+        self._placeholder.show()
+
+    def is_pending(self) -> bool:
+        return self._pending_plot is not None
+
+    def cancel_pending_plot(self):
+        if self._pending_plot is None:
+            return
+        if self._pending_task is not None:
+            self._pending_task.cancel()
+            self._pending_task = None
+        loader, _ = self._pending_plot
+        loader.release()
+        self._pending_plot = None
+
+    def plot_params(self):
+        """Get the plot() arguments besides the data, also for a plot that is not loaded yet."""
+        if self._pending_plot is not None:
+            return dict(self._pending_plot[1])
+        if self.creation_params is None:
+            return None
+        return {k: v for k, v in self.creation_params.items() if k != 'df'}
+
+    def _load_pending_plot(self):
+        self._resume_on_load = True
+        if self._pending_task is not None:
+            return
+        loader, kwargs = self._pending_plot
+        self._pending_task = ColumnLoadTask(loader, self._plotted_columns(kwargs))
+        self._pending_task.signals.finished.connect(self._on_pending_loaded)
+        QThreadPool.globalInstance().start(self._pending_task)
+
+    def _on_pending_loaded(self, success, error_msg):
+        if self._pending_task is None or self.sender() is not self._pending_task.signals:
+            return
+        loader, kwargs = self._pending_plot
+        self._pending_task = None
+        self._pending_plot = None
+        try:
+            if not success:
+                self._placeholder.setText(f'Failed to load {loader.get_filename()}: {error_msg}')
+                return
+            self._placeholder.clear()
+            self.plot(loader.get_dataframe(self._plotted_columns(kwargs)), **kwargs)
+        except Exception as e:
+            self._placeholder.setText(f'Failed to plot {loader.get_filename()}: {e}')
+            return
+        finally:
+            loader.release()
+        if self._resume_on_load:
+            self.resume()
+
+    def follow_file(self, max_rows=None):
+        """
+        Poll the plotted file for appended rows and add them to the plot as they arrive.
+
+        Args:
+            max_rows (Optional[int]): Keep only this many of the latest rows, where the
+                plot type supports a rolling window.
+        """
+        if self.dataset_key is None:
+            raise ValueError('This plot is not backed by a file.')
+        self.stop_following()
+        self._follower = CSVFollower.from_dataset_key(self.dataset_key,
+                                                      self._plotted_columns(self.creation_params))
+        self._set_row_limit(max_rows)
+
+        self._follow_timer = QTimer(self)
+        self._follow_timer.setInterval(self.FOLLOW_POLL_MS)
+        self._follow_timer.timeout.connect(self._poll_follow)
+        self._follow_timer.start()
+        # Notifications make appends show up sooner; the timer covers platforms
+        # and file systems where they are not delivered
+        self._follow_watcher = QFileSystemWatcher([self._follower.file_path], self)
+        self._follow_watcher.fileChanged.connect(lambda path: self._poll_follow())
+
+    def stop_following(self):
+        if self._follow_timer is not None:
+            self._follow_timer.stop()
+            self._follow_timer.deleteLater()
+            self._follow_watcher.deleteLater()
+        self._follower = None
+        self._follow_timer = None
+        self._follow_watcher = None
+
+    def is_following(self) -> bool:
+        return self._follower is not None
+
+    def _poll_follow(self):
+        if self._follower is None:
+            return
+        try:
+            rows = self._follower.poll()
+        except (OSError, FileTruncated, ValueError) as e:
+            self.stop_following()
+            QMessageBox.warning(self, 'Follow Stopped', f'Stopped following the file: {e}')
+            return
+        if rows is not None and len(rows):
+            self.append_rows(rows)
+
+    def _plotted_columns(self, params):
+        """Columns plot() reads, given its keyword arguments."""
+        return None
+
+    def _set_row_limit(self, max_rows):
+        pass
+
+    def append_rows(self, df: pd.DataFrame):
+        """Add rows appended to the source file to the plot."""
+        raise NotImplementedError
 
     def _undo_plot(self):
         if self._original_data_for_plot_undo is not None:
@@ -39,50 +454,373 @@ class PlotContainer(QWidget):
 
     @abstractmethod
     def plot(self, df: pd.DataFrame, **kwargs):
-        self.creation_params = {'df': df.copy(), **kwargs} 
         pass
 
+    def _snapshot(self, df, columns, **kwargs) -> DatasetSnapshot:
+        """Keep a read-only projection of the plotted columns for duplicate/undo."""
+        snapshot = DatasetSnapshot.from_dataframe(df, columns, self.dataset_key)
+        self.creation_params = {'df': snapshot, **kwargs}
+        return snapshot
+
     def _draw_plot(self, prepared_data):
         try:
             if self._original_data_for_plot_undo is None:
                  self._original_data_for_plot_undo = prepared_data
+            self._prepared_data = prepared_data
+            if self.is_suspended():
+                # Rendered off-thread while in view; otherwise by resume() once it scrolls back
+                if self._in_view and self._pending_plot is None:
+                    self._render_async()
+                return
 
-            self.ax.clear()
-            self._visualization.create_plot(self.ax, prepared_data)
-            self.figure.set_constrained_layout(True)
-            self.canvas.draw()
+            points = self._point_count(prepared_data)
+            if self._artist is not None:
+                with self._span('update', rows=points):
+                    if self._update_plot(prepared_data):
+                        return
+
+            with self._span('create_plot', rows=points):
+                self.ax.clear()
+                self._background = None
+                self._artist = self._visualization.create_plot(self.ax, prepared_data)
+                self._drawn_data = prepared_data
+                self._drawn_by = self._visualization
+                # Animated artists are left out of full draws and the background
+                # captured after them, so data updates can be blitted
+                for artist in self._artist_parts():
+                    artist.set_animated(True)
+                self._on_plot_drawn()
+            # The layout is solved inside draw(); the engine records it as its own span
+            self.figure.set_layout_engine(_TracedConstrainedLayout(self._trace_label()))
+            with self._span('draw', rows=points):
+                self.canvas.draw()
         except Exception as e:
              QMessageBox.critical(self, 'Plotting Error', f'Error rendering plot: {e}')
 
+    def _span(self, name, params=None, **kwargs):
+        """Time a phase of this plot with the application tracer."""
+        return get_tracer().span(name, self._trace_label(params), **kwargs)
+
+    def _trace_label(self, params=None):
+        return type(self).__name__
+
+    @staticmethod
+    def _point_count(prepared_data):
+        return len(prepared_data.get('x_data', prepared_data.get('labels', ())))
+
+    def _update_plot(self, prepared_data) -> bool:
+        """Swap new data into the existing artist; returns False if a full rebuild is needed."""
+        if self._artist is None or self._drawn_by is not self._visualization:
+            return False
+        limits = (self.ax.get_xlim(), self.ax.get_ylim())
+        if not self._visualization.update_plot(self.ax, self._artist, prepared_data, self._drawn_data):
+            return False
+        self._drawn_data = prepared_data
+        if self._background is not None and limits == (self.ax.get_xlim(), self.ax.get_ylim()):
+            self._blit()
+        else:
+            # Ticks move with the limits, so the whole axes has to be redrawn
+            self.canvas.draw_idle()
+        return True
+
+    def _artist_parts(self):
+        patches = getattr(self._artist, 'patches', None)
+        return list(patches) if patches is not None else [self._artist]
+
+    def _on_canvas_draw(self, event):
+        if self._artist is None:
+            return
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        for artist in self._artist_parts():
+            self.ax.draw_artist(artist)
+
+    def _blit(self):
+        self.canvas.restore_region(self._background)
+        for artist in self._artist_parts():
+            self.ax.draw_artist(artist)
+        self.canvas.blit(self.ax.bbox)
+
+    def _on_plot_drawn(self):
+        """Hook for subclasses; ax.clear() drops axes callbacks, so reconnect them here."""
+        pass
+
 
 class XYPlotContainer(PlotContainer):
-    
+    PLOT_TYPE = 'xy'
+    DECIMATION_POINTS_PER_PIXEL = DECIMATION_POINTS_PER_PIXEL
+    DENSITY_ROW_THRESHOLD = DENSITY_ROW_THRESHOLD
+    # Share of the X window kept per mouse wheel step
+    ZOOM_STEP = 0.8
+
+    def __init__(self, parent=None, figure_size=(5, 4)):
+        super().__init__(parent, figure_size)
+        self._full_x = None
+        self._full_y = None
+        self._buffer = None
+        # Timestamp X values are kept as int64 nanoseconds
+        self._x_datetime = False
+        self._updating_window = False
+        # Zoomed X range in data units, None for all data
+        self._x_window = None
+        self.link_x = True
+        self._link_key = None
+        self._pan_origin = None
+
     def _create_visualization(self) -> Visualization:
         return TimeseriesVisualization()
 
+    def _connect_canvas(self):
+        # A drag in progress when the previous canvas was released never sees its release event
+        self._pan_origin = None
+        self._mpl_connect('resize_event', lambda event: self._update_window())
+        self._mpl_connect('scroll_event', self._on_scroll)
+        self._mpl_connect('button_press_event', self._on_press)
+        self._mpl_connect('motion_notify_event', self._on_motion)
+        self._mpl_connect('button_release_event', self._on_release)
+
+    def dispose(self):
+        get_axis_links().leave(self)
+        self._link_key = None
+        super().dispose()
+
     def plot(self, df: pd.DataFrame, *, x_col: str, y_col: str):
-        super().plot(df, x_col=x_col, y_col=y_col)
+        with self._span('prepare', {'x_col': x_col, 'y_col': y_col}, rows=len(df)) as span:
+            data = self._snapshot(df, [x_col, y_col], x_col=x_col, y_col=y_col)
+            self._x_datetime = pd.api.types.is_datetime64_any_dtype(data[x_col])
+            # Sorted once per dataset and X column; other plots against the same X reuse it.
+            # Plots of a subset of the rows have no snapshot key and sort their own rows.
+            index = get_registry().derived(data.dataset_key, ('sorted_x', x_col, len(data)),
+                                           lambda: SortedXIndex(data[x_col]))
+            self._buffer = SortedXYBuffer(*index.take(data[y_col]))
+            self._x_window = self._join_links()
+            prepared_data = self._prepare_buffer()
+            span.memory = approx_nbytes([self._buffer.x, self._buffer.y, prepared_data])
+        self._draw_plot(prepared_data)
+
+    def append_rows(self, df: pd.DataFrame):
+        with self._span('append', rows=len(df)):
+            x = df[self.creation_params['x_col']]
+            if self._x_datetime and not pd.api.types.is_datetime64_any_dtype(x):
+                x = parse_datetimes(x, coerce=True)
+            self._buffer.extend(x, df[self.creation_params['y_col']])
+            prepared_data = self._prepare_buffer()
+        self._draw_plot(prepared_data)
+
+    def _trace_label(self, params=None):
+        params = params or self.plot_params()
+        return f"{params['y_col']} vs {params['x_col']}" if params else super()._trace_label()
+
+    def _plotted_columns(self, params):
+        return list(dict.fromkeys([params['x_col'], params['y_col']]))
+
+    def _set_row_limit(self, max_rows):
+        self._buffer.set_limit(max_rows)
+        self._draw_plot(self._prepare_buffer())
+
+    def set_x_window(self, x_range, broadcast=True):
+        """
+        Show only the rows with X inside `x_range`, in data units, or all rows with None.
+
+        The window is cut out of the sorted X by binary search, so the cost
+        depends on the rows shown, not on the dataset. Linked plots follow
+        unless `broadcast` is False.
+        """
+        self._x_window = tuple(x_range) if x_range is not None else None
+        if self._buffer is None:
+            return
+        self._draw_plot(self._prepare_buffer())
+        if broadcast and self._link_key is not None:
+            get_axis_links().broadcast(self, self._link_key, self._x_window)
+
+    def set_x_linked(self, linked: bool):
+        """Link or unlink the X window with the other plots of the same dataset and X column."""
+        self.link_x = linked
+        if self._buffer is None:
+            return
+        window = self._join_links()
+        if linked and window != self._x_window:
+            self.set_x_window(window, broadcast=False)
+
+    def _join_links(self):
+        # Returns the linked plots' current window, None when unlinked
+        links = get_axis_links()
+        if not self.link_x or self.dataset_key is None:
+            links.leave(self)
+            self._link_key = None
+            return None
+        self._link_key = (self.dataset_key, self.creation_params['x_col'])
+        return links.join(self, self._link_key)
+
+    def _prepare_buffer(self):
+        x_col, y_col = self.creation_params['x_col'], self.creation_params['y_col']
+        self._full_x, self._full_y = self._buffer.x, self._buffer.y
+        window = self._x_window
+        extent = None
+        # Keep the same visualization object when the mode is unchanged so the
+        # existing artist can be updated in place
+        if self.is_density_mode():
+            if not isinstance(self._visualization, DensityVisualization):
+                self._visualization = DensityVisualization()
+            x_data, y_data = self._full_x, self._full_y
+            if window is not None:
+                visible_y = self._full_y[window_slice(self._full_x, window)]
+                if len(visible_y):
+                    extent = (*window, float(visible_y.min()), float(visible_y.max()))
+        else:
+            if not isinstance(self._visualization, TimeseriesVisualization):
+                self._visualization = TimeseriesVisualization()
+            x_data, y_data = self._visible_data(window)
         prepared_data = {
-            'x_data': df[x_col],
-            'y_data': df[y_col],
+            'x_data': x_data,
+            'y_data': y_data,
             'x_label': x_col,
-            'y_label': y_col
+            'y_label': y_col,
+            'x_datetime': self._x_datetime,
+            'x_window': window,
+            'shape': self._pixel_shape(),
         }
-        self._draw_plot(prepared_data)
+        if extent is not None:
+            prepared_data['extent'] = extent
+        return prepared_data
+
+    def is_density_mode(self) -> bool:
+        return self._full_x is not None and len(self._full_x) > self.DENSITY_ROW_THRESHOLD
+
+    def _pixel_shape(self):
+        if self.ax is None:
+            dpi = 100
+            return int(self.figure_size[0] * dpi), int(self.figure_size[1] * dpi)
+        return max(1, int(self.ax.bbox.width)), max(1, int(self.ax.bbox.height))
+
+    def _pixel_width(self) -> int:
+        return self._pixel_shape()[0]
+
+    def _visible_data(self, x_range=None):
+        """Cut the X window out of the full data and reduce it to one point per occupied pixel of the axes."""
+        x_data, y_data = self._full_x, self._full_y
+        if x_range is not None:
+            rows = window_slice(x_data, x_range)
+            x_data, y_data = x_data[rows], y_data[rows]
+        if len(x_data) > self.DECIMATION_POINTS_PER_PIXEL * self._pixel_width():
+            return occupancy_decimate(x_data, y_data, self._pixel_shape())
+        return x_data, y_data
+
+    def _update_plot(self, prepared_data) -> bool:
+        # Rescaling to the new data must not re-decimate it from the full series
+        self._updating_window = True
+        try:
+            return super()._update_plot(prepared_data)
+        finally:
+            self._updating_window = False
+
+    def _on_plot_drawn(self):
+        # Connected even when not decimating yet, since followed files keep growing
+        self.ax.callbacks.connect('xlim_changed', self._on_limits_changed)
+        if self.is_density_mode():
+            self.ax.callbacks.connect('ylim_changed', self._on_limits_changed)
+
+    def _on_limits_changed(self, ax):
+        # Rebuild from the full data so zooming in reveals detail again
+        self._update_window()
+
+    def _update_window(self):
+        if self._artist is None or self._full_x is None or self._updating_window:
+            return
+        self._updating_window = True
+        try:
+            x_range = self._visualization.x_limits_to_data(self._prepared_data, self.ax.get_xlim())
+            if self.is_density_mode():
+                axis_extent = (*self.ax.get_xlim(), *self.ax.get_ylim())
+                self._visualization.update_window(self._artist, self._full_x, self._full_y,
+                                                  self._pixel_shape(), (*x_range, *axis_extent[2:]),
+                                                  axis_extent)
+            else:
+                x_data, y_data = self._visible_data(x_range)
+                x_data = self.ax.convert_xunits(self._visualization.x_values(self._prepared_data, x_data))
+                self._artist.set_offsets(np.column_stack([x_data, y_data]))
+        finally:
+            self._updating_window = False
+        self.canvas.draw_idle()
+
+    def _on_scroll(self, event):
+        if event.inaxes is not self.ax or event.xdata is None or self._buffer is None:
+            return
+        x0, x1 = self.ax.get_xlim()
+        scale = self.ZOOM_STEP ** event.step
+        self._set_axis_window(event.xdata - (event.xdata - x0) * scale,
+                              event.xdata + (x1 - event.xdata) * scale)
+
+    def _on_press(self, event):
+        self._pan_origin = None
+        if event.inaxes is not self.ax or event.button != MouseButton.LEFT or self._buffer is None:
+            return
+        if event.dblclick:
+            self.set_x_window(None)
+            return
+        self._pan_origin = (event.x, self.ax.get_xlim())
+
+    def _on_motion(self, event):
+        if self._pan_origin is None or self.ax is None:
+            return
+        start_x, (x0, x1) = self._pan_origin
+        shift = (event.x - start_x) * (x1 - x0) / max(1.0, self.ax.bbox.width)
+        self._set_axis_window(x0 - shift, x1 - shift)
+
+    def _on_release(self, event):
+        self._pan_origin = None
+
+    def _set_axis_window(self, lo, hi):
+        # Axis limits are days for timestamps; the window is kept in data units
+        self.set_x_window(self._visualization.x_limits_to_data(self._prepared_data, (lo, hi)))
      
 
 class BarPlotContainer(PlotContainer):
+    PLOT_TYPE = 'bar'
+
+    def __init__(self, parent=None, figure_size=(5, 4)):
+        super().__init__(parent, figure_size)
+        self._aggregator = None
 
     def _create_visualization(self) -> Visualization:
         return BarPlotVisualization()
 
-    def plot(self, df: pd.DataFrame, *, label_col: str, value_col: str):
-        super().plot(df, label_col=label_col, value_col=value_col)
+    def plot(self, df: pd.DataFrame, *, label_col: str, value_col: str,
+             reducer: str = 'sum', top_n: int = DEFAULT_TOP_N):
+        params = {'label_col': label_col, 'value_col': value_col}
+        with self._span('prepare', params, rows=len(df)) as span:
+            data = self._snapshot(df, [label_col, value_col], label_col=label_col, value_col=value_col,
+                                  reducer=reducer, top_n=top_n)
+            # Bars keep per-label partials instead of rows, so appended rows are
+            # folded in without revisiting the history and memory stays O(labels)
+            self._aggregator = BarAggregator()
+            self._aggregator.update(data[label_col], data[value_col])
+            prepared_data = self._prepare_aggregates()
+            span.memory = approx_nbytes(prepared_data)
+        self._draw_plot(prepared_data)
+
+    def append_rows(self, df: pd.DataFrame):
+        with self._span('append', rows=len(df)):
+            self._aggregator.update(df[self.creation_params['label_col']],
+                                    df[self.creation_params['value_col']])
+            prepared_data = self._prepare_aggregates()
+        self._draw_plot(prepared_data)
+
+    def _trace_label(self, params=None):
+        params = params or self.plot_params()
+        return f"{params['value_col']} by {params['label_col']}" if params else super()._trace_label()
+
+    def _plotted_columns(self, params):
+        return list(dict.fromkeys([params['label_col'], params['value_col']]))
+
+    def _prepare_aggregates(self):
+        label_col, value_col = self.creation_params['label_col'], self.creation_params['value_col']
+        reducer = self.creation_params['reducer']
+        labels, values = self._aggregator.result(reducer, self.creation_params['top_n'])
         prepared_data = {
-            'labels': df[label_col].astype(str),
-            'values': df[value_col],
+            'labels': labels,
+            'values': values,
             'label_heading': label_col,
-            'value_heading': value_col
+            'value_heading': value_col if reducer == 'sum' else f'{reducer}({value_col})'
         }
-        self._draw_plot(prepared_data)
+        return prepared_data
        
\ No newline at end of file
@@ -0,0 +1,65 @@
+import threading
+
+import numpy as np
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class RenderSignals(QObject):
+    # RGBA buffer of shape (height, width, 4), or None with an error message
+    finished = pyqtSignal(object, str)
+
+
+class RenderTask(QRunnable):
+    """
+    Draws a plot into an Agg RGBA buffer on a QThreadPool worker.
+
+    The figure is a standalone Figure on an Agg canvas, so nothing is shared
+    with the GUI thread except the read-only prepared data. A cancelled task
+    stops at the next phase boundary and emits nothing.
+    """
+    def __init__(self, visualization, prepared_data: dict, size, dpi: float):
+        """
+        Initialize the task.
+
+        Args:
+            visualization (Visualization): Draws the plot.
+            prepared_data (dict): Data for visualization.create_plot().
+            size (tuple): Image size as (width, height) in device pixels.
+            dpi (float): Resolution, which sets the size of text and markers.
+        """
+        super().__init__()
+        self.setAutoDelete(False)
+        self.visualization = visualization
+        self.prepared_data = prepared_data
+        self.size = size
+        self.dpi = dpi
+        self.signals = RenderSignals()
+        self._cancel_event = threading.Event()
+
+    def run(self):
+        try:
+            width, height = self.size
+            figure = Figure(figsize=(width / self.dpi, height / self.dpi), dpi=self.dpi,
+                            constrained_layout=True)
+            canvas = FigureCanvasAgg(figure)
+            self.visualization.create_plot(figure.add_subplot(111), self.prepared_data)
+            if self._cancel_event.is_set():
+                return
+            canvas.draw()
+            if self._cancel_event.is_set():
+                return
+            # A view of the renderer's memory; the array keeps the renderer alive
+            buffer = np.asarray(canvas.buffer_rgba())
+        except Exception as e:
+            if not self._cancel_event.is_set():
+                self.signals.finished.emit(None, str(e))
+            return
+        self.signals.finished.emit(buffer, '')
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
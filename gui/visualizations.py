@@ -1,11 +1,52 @@
 from abc import ABC, abstractmethod
-import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm
+import matplotlib.dates as mdates
+import numpy as np
+
+from utils.datetimes import NS_PER_DAY
 
 class Visualization(ABC):
     @abstractmethod
     def create_plot(self, ax, data):
+        """Draw `data` on `ax` and return the main artist."""
         pass
 
+    def update_plot(self, ax, artist, data, previous) -> bool:
+        """
+        Swap `data` into the artist returned by create_plot, keeping the axes as they are.
+
+        Returns False when the change needs a full rebuild, e.g. because the labels changed.
+        """
+        return False
+
+    @staticmethod
+    def _same_labels(data, previous, *keys) -> bool:
+        return previous is not None and all(data[key] == previous[key] for key in keys)
+
+    @staticmethod
+    def x_values(data, x=None):
+        """X values as matplotlib should see them; int64 nanosecond timestamps are viewed as datetime64."""
+        x = data['x_data'] if x is None else x
+        if data.get('x_datetime'):
+            return np.asarray(x, dtype='int64').view('datetime64[ns]')
+        return x
+
+    @staticmethod
+    def x_limits_to_data(data, limits):
+        """Convert X axis limits back to the units of data['x_data']."""
+        if not data.get('x_datetime'):
+            return limits
+        epoch = mdates.date2num(np.datetime64(0, 'ns'))
+        return tuple((np.asarray(limits, dtype=float) - epoch) * NS_PER_DAY)
+
+    @staticmethod
+    def x_data_to_limits(data, x_range):
+        """Convert an X range in the units of data['x_data'] to axis limits; the inverse of x_limits_to_data()."""
+        if not data.get('x_datetime'):
+            return x_range
+        epoch = mdates.date2num(np.datetime64(0, 'ns'))
+        return tuple(np.asarray(x_range, dtype=float) / NS_PER_DAY + epoch)
+
 class TimeseriesVisualization(Visualization):
     def create_plot(self, ax, data):
         x_data = data['x_data']
@@ -13,10 +54,120 @@ class TimeseriesVisualization(Visualization):
         x_label = data['x_label']
         y_label = data['y_label']
 
-        ax.scatter(x_data, y_data)
+        artist = ax.scatter(self.x_values(data, x_data), y_data)
         ax.set_xlabel(x_label)
         ax.set_ylabel(y_label)
         ax.set_title(f'{y_label} vs {x_label}')
+        if data.get('x_window') is not None:
+            ax.set_xlim(*self.x_data_to_limits(data, data['x_window']))
+        return artist
+
+    def update_plot(self, ax, artist, data, previous) -> bool:
+        if not self._same_labels(data, previous, 'x_label', 'y_label'):
+            return False
+        offsets = np.column_stack([np.asarray(ax.convert_xunits(self.x_values(data)), dtype=float),
+                                   np.asarray(data['y_data'], dtype=float)])
+        artist.set_offsets(offsets)
+        ax.ignore_existing_data_limits = True
+        if len(offsets):
+            ax.update_datalim(offsets)
+        # set_xlim() turns X autoscaling off, so turn it back on once the window is cleared
+        window = data.get('x_window')
+        ax.set_autoscalex_on(window is None)
+        ax.autoscale_view()
+        if window is not None:
+            ax.set_xlim(*self.x_data_to_limits(data, window))
+        return True
+
+def density_grid(x, y, shape, extent):
+    """
+    Count points per pixel cell with a single bincount.
+
+    `x` must be sorted so the X window can be cut out by binary search; the
+    cost is then proportional to the points in the window, not the dataset.
+
+    Args:
+        x (np.ndarray): X values sorted ascending.
+        y (np.ndarray): Y values matching x.
+        shape (tuple): Grid size as (width, height) in cells.
+        extent (tuple): Window as (x0, x1, y0, y1).
+
+    Returns:
+        np.ndarray: Counts with shape (height, width), row 0 at y0
+    """
+    width, height = shape
+    x0, x1, y0, y1 = extent
+    x1 = x1 if x1 > x0 else x0 + 1
+    y1 = y1 if y1 > y0 else y0 + 1
+
+    lo = np.searchsorted(x, x0, side='left')
+    hi = np.searchsorted(x, x1, side='right')
+    xs, ys = x[lo:hi], y[lo:hi]
+    inside = (ys >= y0) & (ys <= y1)
+    xs, ys = xs[inside], ys[inside]
+
+    ix = ((xs - x0) * (width / (x1 - x0))).astype(np.intp)
+    iy = ((ys - y0) * (height / (y1 - y0))).astype(np.intp)
+    np.clip(ix, 0, width - 1, out=ix)
+    np.clip(iy, 0, height - 1, out=iy)
+    return np.bincount(iy * width + ix, minlength=width * height).reshape(height, width)
+
+
+class DensityVisualization(Visualization):
+    """
+    Draws a point cloud as one image of per-pixel counts on a log color scale.
+
+    Draw time depends on the grid size rather than the number of points.
+    """
+    def create_plot(self, ax, data):
+        x_data = data['x_data']
+        y_data = data['y_data']
+        x_label = data['x_label']
+        y_label = data['y_label']
+
+        extent = data.get('extent') or self.data_extent(x_data, y_data)
+        counts = density_grid(x_data, y_data, data['shape'], extent)
+        artist = ax.imshow(np.ma.masked_equal(counts, 0), origin='lower',
+                           extent=self.axis_extent(ax, data, extent),
+                           aspect='auto', interpolation='nearest', cmap='viridis',
+                           norm=LogNorm(vmin=1, vmax=max(1, counts.max())))
+        ax.set_xlabel(x_label)
+        ax.set_ylabel(y_label)
+        ax.set_title(f'{y_label} vs {x_label}')
+        return artist
+
+    def update_window(self, artist, x_data, y_data, shape, extent, axis_extent=None):
+        """Re-bin the points inside a new axes window into the existing image."""
+        counts = density_grid(x_data, y_data, shape, extent)
+        artist.set_data(np.ma.masked_equal(counts, 0))
+        artist.set_extent(axis_extent or extent)
+        artist.set_clim(1, max(1, counts.max()))
+
+    def update_plot(self, ax, artist, data, previous) -> bool:
+        if not self._same_labels(data, previous, 'x_label', 'y_label'):
+            return False
+        extent = data.get('extent') or self.data_extent(data['x_data'], data['y_data'])
+        axis_extent = self.axis_extent(ax, data, extent)
+        self.update_window(artist, data['x_data'], data['y_data'], data['shape'], extent, axis_extent)
+        # emit=False: the window is already re-binned, so skip the xlim/ylim callbacks
+        ax.set_xlim(axis_extent[0], axis_extent[1], emit=False)
+        ax.set_ylim(axis_extent[2], axis_extent[3], emit=False)
+        return True
+
+    def axis_extent(self, ax, data, extent):
+        """Convert a window in data units to axes units, setting up a date axis for timestamps."""
+        if not data.get('x_datetime'):
+            return extent
+        bounds = self.x_values(data, np.asarray(extent[:2]).astype('int64'))
+        ax.xaxis.update_units(bounds)
+        x0, x1 = ax.convert_xunits(bounds)
+        return float(x0), float(x1), extent[2], extent[3]
+
+    @staticmethod
+    def data_extent(x_data, y_data):
+        if len(x_data) == 0:
+            return 0.0, 1.0, 0.0, 1.0
+        return float(x_data[0]), float(x_data[-1]), float(np.min(y_data)), float(np.max(y_data))
 
 class BarPlotVisualization(Visualization):
     def create_plot(self, ax, data):
@@ -25,10 +176,22 @@ class BarPlotVisualization(Visualization):
         label_heading = data['label_heading']
         value_heading = data['value_heading']
 
-        ax.bar(labels, values)
+        artist = ax.bar(labels, values)
         ax.set_xlabel(label_heading)
         ax.set_ylabel(value_heading)
         ax.set_title(f'{value_heading} by {label_heading}')
         ax.tick_params(axis='x', rotation=45)
+        return artist
+
+    def update_plot(self, ax, artist, data, previous) -> bool:
+        # New or reordered labels change the ticks, which needs a full rebuild
+        if (not self._same_labels(data, previous, 'label_heading', 'value_heading')
+                or list(data['labels']) != list(previous['labels'])):
+            return False
+        for rect, value in zip(artist.patches, data['values']):
+            rect.set_height(value)
+        ax.relim()
+        ax.autoscale_view()
+        return True
 
         
\ No newline at end of file
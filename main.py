@@ -1,10 +1,50 @@
+import argparse
+import os
 import sys
+from utils.startup import StartupProfile, preload_in_background
+
+profile = StartupProfile()
+
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import QTimer
 from gui.main_window import MainWindow
 
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description='CSV visualizer.')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Print how long each startup phase took and exit once preloading is done.')
+    parser.add_argument('--no-preload', action='store_true',
+                        help='Import pandas and matplotlib only when first needed.')
+    parser.add_argument('--compact-dtypes', action='store_true',
+                        help='Store loaded columns in the smallest lossless dtypes (same as VIZ_COMPACT_DTYPES=1).')
+    # Everything else is left for Qt, e.g. -platform
+    return parser.parse_known_args(argv[1:])
+
+
+def on_first_paint(args, app):
+    profile.mark_first_paint()
+    preload = None if args.no_preload else preload_in_background()
+    if not args.profile_startup:
+        return
+    if preload is not None:
+        preload.join()
+        profile.mark('background preload')
+    print(profile.report(), file=sys.stderr)
+    app.quit()
+
+
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    main_win = MainWindow()  
+    args, qt_args = parse_args(sys.argv)
+    if args.compact_dtypes:
+        # Read by configure_registry(), which runs on first use of the registry
+        os.environ['VIZ_COMPACT_DTYPES'] = '1'
+    profile.mark('imports')
+    app = QApplication(sys.argv[:1] + qt_args)
+    profile.mark('QApplication')
+    main_win = MainWindow()
+    profile.mark('main window')
     main_win.show()
+    # Runs once the event loop has processed the first show and paint events
+    QTimer.singleShot(0, lambda: on_first_paint(args, app))
     sys.exit(app.exec())
-
@@ -0,0 +1,297 @@
+"""
+Render dashboard plots to image files without a display.
+
+Usage:
+    python render.py dashboard.json [--output-dir DIR] [--workers N] [--stream-above MB]
+
+The dashboard spec is a JSON file listing the plots to render:
+
+    {
+        "output_dir": "reports",
+        "figure_size": [5, 4],
+        "dpi": 100,
+        "plots": [
+            {"file": "data.csv", "type": "xy", "x_col": "time", "y_col": "value",
+             "output": "value.png"},
+            {"file": "data.csv", "type": "bar", "label_col": "host", "value_col": "latency",
+             "reducer": "mean", "top_n": 20, "output": "latency.svg"}
+        ]
+    }
+
+Relative paths are resolved against the spec's directory, and the image format
+follows the output file's extension. Plots are drawn by the same Visualization
+classes as the GUI, on the Agg backend, spread over a process pool. Plots of
+the same file are sent to workers together, and every worker keeps the columns
+it has parsed, so each dataset is loaded at most once per worker.
+
+Files larger than --stream-above megabytes are not loaded. Each of their plots
+reads the file once in chunks instead, reducing it on the way to a few
+thousand XY points or to the per-label bar values, so memory stays bounded.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import pandas as pd
+
+from gui.visualizations import BarPlotVisualization, DensityVisualization, TimeseriesVisualization
+from utils.aggregation import DEFAULT_TOP_N, REDUCERS, BarAggregator
+from utils.column_cache import column_cache_from_env
+from utils.compaction import compaction_from_env
+from utils.csv_loader import CSVLoader
+from utils.dataset_registry import get_registry
+from utils.decimation import (DECIMATION_POINTS_PER_PIXEL, DENSITY_ROW_THRESHOLD,
+                              occupancy_decimate, sort_xy)
+from utils.streaming import BarStreamReducer, XYStreamReducer
+
+PLOT_TYPES = ('xy', 'bar')
+DEFAULT_FIGURE_SIZE = (5, 4)
+DEFAULT_DPI = 100
+# Files larger than this are streamed instead of loaded
+DEFAULT_STREAM_ABOVE = 1024 ** 3
+# Batches per worker; more batches balance better, fewer share more loaded columns
+_BATCHES_PER_WORKER = 4
+
+# Loaders opened by this worker process, by file path
+_loaders: Dict[str, CSVLoader] = {}
+
+
+def _init_worker():
+    get_registry().set_column_cache(column_cache_from_env())
+    get_registry().set_compaction(compaction_from_env())
+
+
+def _dataset(file_path: str, columns: List[str]) -> pd.DataFrame:
+    loader = _loaders.get(file_path)
+    if loader is None:
+        loader = CSVLoader()
+        success, error_msg = loader.probe_schema(file_path)
+        if not success:
+            raise ValueError(error_msg)
+        _loaders[file_path] = loader
+    # Columns parsed for an earlier plot are served from the registry
+    success, error_msg = loader.load_columns(columns)
+    if not success:
+        raise ValueError(error_msg)
+    return loader.get_dataframe(columns)
+
+
+def _prepare_xy(df: pd.DataFrame, plot: dict, shape: Tuple[int, int]):
+    x_col, y_col = plot['x_col'], plot['y_col']
+    x_data, y_data = sort_xy(df[x_col], df[y_col])
+    if len(x_data) > DENSITY_ROW_THRESHOLD:
+        visualization = DensityVisualization()
+    else:
+        visualization = TimeseriesVisualization()
+        if len(x_data) > DECIMATION_POINTS_PER_PIXEL * shape[0]:
+            x_data, y_data = occupancy_decimate(x_data, y_data, shape)
+    return visualization, {
+        'x_data': x_data,
+        'y_data': y_data,
+        'x_label': x_col,
+        'y_label': y_col,
+        'x_datetime': pd.api.types.is_datetime64_any_dtype(df[x_col]),
+        'shape': shape,
+    }
+
+
+def _prepare_bar(df: pd.DataFrame, plot: dict):
+    aggregator = BarAggregator()
+    aggregator.update(df[plot['label_col']], df[plot['value_col']])
+    labels, values = aggregator.result(plot.get('reducer', 'sum'), plot.get('top_n', DEFAULT_TOP_N))
+    return _bar_data(labels, values, plot)
+
+
+def _bar_data(labels, values, plot: dict):
+    label_col, value_col = plot['label_col'], plot['value_col']
+    reducer = plot.get('reducer', 'sum')
+    return BarPlotVisualization(), {
+        'labels': labels,
+        'values': values,
+        'label_heading': label_col,
+        'value_heading': value_col if reducer == 'sum' else f'{reducer}({value_col})'
+    }
+
+
+def _stream_plot(plot: dict, columns: List[str], shape: Tuple[int, int]):
+    if plot['type'] == 'xy':
+        reducer = XYStreamReducer(plot['x_col'], plot['y_col'])
+    else:
+        reducer = BarStreamReducer(plot['label_col'], plot['value_col'], plot.get('reducer', 'sum'),
+                                   plot.get('top_n', DEFAULT_TOP_N))
+    success, error_msg = CSVLoader().stream_csv(plot['file'], [reducer], usecols=columns)
+    if not success:
+        raise ValueError(error_msg)
+    if plot['type'] == 'xy':
+        return _prepare_xy(reducer.result(), plot, shape)
+    return _bar_data(*reducer.result(), plot)
+
+
+def render_plot(plot: dict, figure_size=DEFAULT_FIGURE_SIZE, dpi: int = DEFAULT_DPI,
+                stream_above: int = DEFAULT_STREAM_ABOVE) -> str:
+    """
+    Render one plot of a dashboard spec to its output file.
+
+    Args:
+        plot (dict): Plot entry with absolute 'file' and 'output' paths.
+        figure_size (tuple): Figure size in inches.
+        dpi (int): Output resolution.
+        stream_above (int): Files larger than this many bytes are streamed instead of loaded.
+
+    Returns:
+        str: Path of the written file
+    """
+    if plot['type'] == 'xy':
+        columns = [plot['x_col'], plot['y_col']]
+    else:
+        columns = [plot['label_col'], plot['value_col']]
+    columns = list(dict.fromkeys(columns))
+    shape = int(figure_size[0] * dpi), int(figure_size[1] * dpi)
+
+    if os.path.getsize(plot['file']) > stream_above:
+        visualization, prepared_data = _stream_plot(plot, columns, shape)
+    elif plot['type'] == 'xy':
+        visualization, prepared_data = _prepare_xy(_dataset(plot['file'], columns), plot, shape)
+    else:
+        visualization, prepared_data = _prepare_bar(_dataset(plot['file'], columns), plot)
+
+    # A standalone Figure keeps no global pyplot state, so workers never leak figures
+    figure = Figure(figsize=figure_size, constrained_layout=True)
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111)
+    visualization.create_plot(ax, prepared_data)
+    figure.savefig(plot['output'], dpi=dpi)
+    return plot['output']
+
+
+def _render_batch(plots: List[dict], figure_size, dpi,
+                  stream_above: int = DEFAULT_STREAM_ABOVE) -> List[Tuple[str, Optional[str]]]:
+    results = []
+    for plot in plots:
+        try:
+            results.append((render_plot(plot, figure_size, dpi, stream_above), None))
+        except Exception as e:
+            results.append((plot['output'], str(e)))
+    return results
+
+
+def load_spec(spec_path: str, output_dir: Optional[str] = None) -> dict:
+    """
+    Read and validate a dashboard spec, resolving its paths.
+
+    Args:
+        spec_path (str): Path to the JSON spec.
+        output_dir (Optional[str]): Overrides the spec's output directory.
+
+    Returns:
+        dict: The spec, with absolute 'file' and 'output' paths on every plot
+
+    Raises:
+        ValueError: If the spec is missing required fields.
+    """
+    with open(spec_path, encoding='utf-8') as f:
+        spec = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(spec_path))
+    output_dir = os.path.join(base_dir, output_dir or spec.get('output_dir', '.'))
+
+    plots = []
+    for index, plot in enumerate(spec.get('plots', [])):
+        plot_type = plot.get('type')
+        if plot_type not in PLOT_TYPES:
+            raise ValueError(f"Plot {index}: unknown type '{plot_type}'")
+        required = ('file', 'x_col', 'y_col') if plot_type == 'xy' else ('file', 'label_col', 'value_col')
+        missing = [key for key in required if key not in plot]
+        if missing:
+            raise ValueError(f"Plot {index}: missing {', '.join(missing)}")
+        if plot.get('reducer', 'sum') not in REDUCERS:
+            raise ValueError(f"Plot {index}: unknown reducer '{plot['reducer']}'")
+        plots.append({
+            **plot,
+            'file': os.path.realpath(os.path.join(base_dir, plot['file'])),
+            'output': os.path.join(output_dir, plot.get('output', f'plot_{index}.png')),
+        })
+    return {
+        'figure_size': tuple(spec.get('figure_size', DEFAULT_FIGURE_SIZE)),
+        'dpi': spec.get('dpi', DEFAULT_DPI),
+        'plots': plots,
+    }
+
+
+def _batches(plots: List[dict], workers: int) -> List[List[dict]]:
+    """Split plots into batches that each read a single file."""
+    by_file = defaultdict(list)
+    for plot in plots:
+        by_file[plot['file']].append(plot)
+    size = max(1, math.ceil(len(plots) / (workers * _BATCHES_PER_WORKER)))
+    return [file_plots[i:i + size]
+            for file_plots in by_file.values()
+            for i in range(0, len(file_plots), size)]
+
+
+def render_dashboard(spec: dict, workers: Optional[int] = None,
+                     stream_above: int = DEFAULT_STREAM_ABOVE) -> List[Tuple[str, Optional[str]]]:
+    """
+    Render every plot of a dashboard spec.
+
+    Args:
+        spec (dict): Spec as returned by load_spec().
+        workers (Optional[int]): Number of worker processes, the CPU count when omitted.
+            With 1, plots are rendered in this process.
+        stream_above (int): Files larger than this many bytes are streamed instead of loaded.
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: (output path, error message or None) for every plot
+    """
+    plots = spec['plots']
+    for plot in plots:
+        os.makedirs(os.path.dirname(plot['output']), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(plots) <= 1:
+        _init_worker()
+        return _render_batch(plots, spec['figure_size'], spec['dpi'], stream_above)
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(_render_batch, batch, spec['figure_size'], spec['dpi'], stream_above)
+                   for batch in _batches(plots, workers)]
+        for future in as_completed(futures):
+            results.extend(future.result())
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Render dashboard plots to image files.')
+    parser.add_argument('spec', help='Path to the JSON dashboard spec.')
+    parser.add_argument('--output-dir', help="Directory for the images, overriding the spec's output_dir.")
+    parser.add_argument('--workers', type=int, help='Number of worker processes (default: CPU count).')
+    parser.add_argument('--stream-above', type=int, default=DEFAULT_STREAM_ABOVE // 1024 ** 2, metavar='MB',
+                        help='Stream files larger than this many megabytes instead of loading them.')
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec, args.output_dir)
+    except (OSError, ValueError) as e:
+        print(f'Invalid spec: {e}', file=sys.stderr)
+        return 2
+
+    failed = 0
+    for output, error_msg in render_dashboard(spec, args.workers, args.stream_above * 1024 ** 2):
+        if error_msg is None:
+            print(output)
+        else:
+            failed += 1
+            print(f'{output}: {error_msg}', file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,25 @@
+import numpy as np
+
+from utils.aggregation import OTHER_LABEL, BarAggregator, aggregate_bars
+
+
+def test_existing_other_group_is_merged_into_the_folded_bar():
+    labels = [OTHER_LABEL] * 10 + ['a'] * 5 + ['b'] * 4 + ['c', 'd']
+    labels_out, values = aggregate_bars(labels, np.ones(len(labels)), 'sum', 2)
+    assert list(labels_out) == ['a', OTHER_LABEL]
+    assert list(values) == [5.0, 16.0]
+
+
+def test_labels_that_print_the_same_are_one_bar():
+    labels_out, values = aggregate_bars([1, '1', 2], [1.0, 2.0, 4.0], 'sum', 0)
+    assert list(labels_out) == ['1', '2']
+    assert list(values) == [3.0, 4.0]
+
+
+def test_updates_group_by_text_across_chunks():
+    aggregator = BarAggregator()
+    aggregator.update([1, 2], [1.0, 1.0])
+    aggregator.update(['1', '3'], [1.0, 1.0])
+    labels_out, values = aggregator.result('count', 0)
+    assert list(labels_out) == ['1', '2', '3']
+    assert list(values) == [2.0, 1.0, 1.0]
@@ -0,0 +1,20 @@
+import pandas as pd
+import pytest
+
+from utils.compaction import compact_dataframe, compact_series
+
+
+@pytest.mark.parametrize('dtype', [object, pd.StringDtype()])
+def test_repeated_text_becomes_categorical(dtype):
+    series = pd.Series(['a', 'b', 'c', None] * 250, dtype=dtype)
+    compacted = compact_series(series)
+    assert isinstance(compacted.dtype, pd.CategoricalDtype)
+    assert compacted.isna().equals(series.isna())
+    assert compacted.dropna().tolist() == series.dropna().tolist()
+
+
+def test_report_measures_the_parsed_columns():
+    df = pd.DataFrame({'n': range(1000), 'label': ['x', 'y'] * 500})
+    _, report = compact_dataframe(df)
+    assert report.columns['n'].dtype_before == 'int64'
+    assert report.bytes_after < report.bytes_before
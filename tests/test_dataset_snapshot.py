@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from utils.csv_loader import CSVLoader
+from utils.dataset_snapshot import DatasetSnapshot
+
+
+def test_row_subset_is_not_replaced_by_the_registered_column(tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'x': np.arange(1000.0), 'y': np.arange(1000.0) * 2}).to_csv(path, index=False)
+    loader = CSVLoader()
+    success, error_msg = loader.load_csv(str(path))
+    assert success, error_msg
+    try:
+        key = loader.get_dataset_key()
+        df = loader.get_dataframe(['x', 'y'])
+
+        full = DatasetSnapshot.from_dataframe(df, ['x', 'y'], key)
+        assert len(full) == 1000
+        assert full.dataset_key == key
+
+        head = DatasetSnapshot.from_dataframe(df.head(100), ['x', 'y'], key)
+        assert len(head) == 100
+        assert head.dataset_key is None
+
+        shuffled = df.sample(frac=1, random_state=0)
+        snapshot = DatasetSnapshot.from_dataframe(shuffled, ['x'], key)
+        assert snapshot['x'].tolist() == shuffled['x'].tolist()
+    finally:
+        loader.release()
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from utils.csv_loader import (SCHEMA_SAMPLE_ROWS, probe_csv_schema, read_csv_columns,
+                              read_csv_with_datetimes)
+from utils.datetimes import parse_datetimes
+
+ROWS = 3000
+BAD_ROW = 2500
+
+
+def _write_timestamps(path, bad_value):
+    times = pd.date_range('2024-01-01', periods=ROWS, freq='min').strftime('%Y-%m-%d %H:%M:%S')
+    values = times.tolist()
+    values[BAD_ROW] = bad_value
+    pd.DataFrame({'time': values, 'value': range(ROWS)}).to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize('load', ['whole', 'columns'])
+def test_timestamps_only_after_sample_keep_text(tmp_path, load):
+    # Nothing in the sampled rows looks like a timestamp, so the format is never detected
+    path = tmp_path / 'late.csv'
+    values = ['pending'] * SCHEMA_SAMPLE_ROWS + ['2024-01-01 10:00:00'] * (ROWS - SCHEMA_SAMPLE_ROWS)
+    pd.DataFrame({'time': values, 'value': range(ROWS)}).to_csv(path, index=False)
+    if load == 'whole':
+        df = read_csv_with_datetimes(str(path))
+    else:
+        schema = probe_csv_schema(str(path))
+        assert not schema.is_datetime('time')
+        df = read_csv_columns(str(path), ['time'], datetime_formats=schema.datetime_formats)
+    assert len(df) == ROWS
+    assert not pd.api.types.is_datetime64_any_dtype(df['time'])
+    assert df['time'].iloc[-1] == '2024-01-01 10:00:00'
+
+
+@pytest.mark.parametrize('load', ['whole', 'columns'])
+def test_other_format_after_sample_is_parsed(tmp_path, load):
+    path = _write_timestamps(tmp_path / 'mixed.csv', '2024/01/01 10:00')
+    if load == 'whole':
+        df = read_csv_with_datetimes(str(path))
+    else:
+        schema = probe_csv_schema(str(path))
+        df = read_csv_columns(str(path), ['time'], datetime_formats=schema.datetime_formats)
+    assert pd.api.types.is_datetime64_any_dtype(df['time'])
+    assert df['time'].notna().all()
+    assert df['time'].iloc[BAD_ROW] == pd.Timestamp('2024-01-01 10:00')
+
+
+@pytest.mark.parametrize('load', ['whole', 'columns'])
+def test_garbage_after_sample_keeps_text(tmp_path, load):
+    path = _write_timestamps(tmp_path / 'garbage.csv', 'garbage')
+    if load == 'whole':
+        df = read_csv_with_datetimes(str(path))
+    else:
+        schema = probe_csv_schema(str(path))
+        assert schema.is_datetime('time')
+        df = read_csv_columns(str(path), ['time'], datetime_formats=schema.datetime_formats)
+    assert len(df) == ROWS
+    assert not pd.api.types.is_datetime64_any_dtype(df['time'])
+    assert df['time'].iloc[BAD_ROW] == 'garbage'
+
+
+def test_coerce_turns_garbage_into_nat():
+    parsed = parse_datetimes(pd.Series(['2024-01-01 00:00:00', 'garbage']),
+                             '%Y-%m-%d %H:%M:%S', coerce=True)
+    assert parsed.dtype == 'datetime64[ns]'
+    assert parsed.iloc[0] == pd.Timestamp('2024-01-01')
+    assert pd.isna(parsed.iloc[1])
@@ -0,0 +1,64 @@
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from utils.decimation import occupancy_decimate
+
+SIZE = (400, 300)
+DPI = 100
+
+
+def _render(x, y, limits):
+    figure = Figure(figsize=(SIZE[0] / DPI, SIZE[1] / DPI), dpi=DPI)
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_axes((0, 0, 1, 1))
+    ax.set_axis_off()
+    ax.scatter(x, y)
+    ax.set_xlim(limits[0], limits[1])
+    ax.set_ylim(limits[2], limits[3])
+    canvas.draw()
+    rgb = np.asarray(canvas.buffer_rgba())[:, :, :3]
+    return rgb.min(axis=2) < 128
+
+
+def _dilate(mask, pixels=2):
+    grown = mask.copy()
+    for dy in range(-pixels, pixels + 1):
+        for dx in range(-pixels, pixels + 1):
+            grown |= np.roll(np.roll(mask, dy, axis=0), dx, axis=1)
+    return grown
+
+
+def test_decimated_scatter_covers_the_same_pixels():
+    rng = np.random.default_rng(0)
+    x = np.arange(200_000, dtype='float64')
+    # A dense band with sparse outliers, where a min/max reduction leaves a gap near 0
+    y = rng.standard_normal(len(x))
+    y[::5000] *= 4
+    limits = (x[0], x[-1], y.min(), y.max())
+
+    x_kept, y_kept = occupancy_decimate(x, y, SIZE)
+    assert len(x_kept) < len(x) // 2
+    assert (np.diff(x_kept) >= 0).all()
+
+    full = _render(x, y, limits)
+    decimated = _render(x_kept, y_kept, limits)
+    assert full.any()
+    assert not (full & ~_dilate(decimated)).any()
+    assert not (decimated & ~_dilate(full)).any()
+
+
+def test_extremes_and_end_points_are_kept():
+    x = np.arange(10_000, dtype='float64')
+    y = np.sin(x / 100)
+    x_kept, y_kept = occupancy_decimate(x, y, (50, 20))
+    assert x_kept[0] == x[0] and x_kept[-1] == x[-1]
+    assert y_kept.min() == y.min() and y_kept.max() == y.max()
+
+
+def test_datetime_x_is_binned_without_overflow():
+    x = np.arange(100_000, dtype='int64') * 1_000_000_000 + 1_700_000_000 * 10 ** 9
+    y = np.zeros(len(x))
+    x_kept, _ = occupancy_decimate(x, y, (100, 10))
+    assert x_kept.dtype == np.int64
+    assert 100 <= len(x_kept) <= 102
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from benchmarks.leaks import add_delete_loop, flush_deletes, leak_failures
+from utils.csv_loader import CSVLoader
+
+ITERATIONS = 20
+
+
+def test_add_delete_loop_releases_figures_and_datasets(qapp, tmp_path):
+    from gui.main_window import MainWindow
+    from gui.plot_containers import XYPlotContainer
+
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'x': np.arange(1000.0), 'y': np.random.default_rng(0).standard_normal(1000)}
+                 ).to_csv(path, index=False)
+    loader = CSVLoader()
+    success, error_msg = loader.load_csv(str(path))
+    assert success, error_msg
+    key = loader.get_dataset_key()
+    df = loader.get_dataframe(['x', 'y'])
+
+    def new_plot():
+        plot_widget = XYPlotContainer()
+        plot_widget.attach_dataset(key)
+        plot_widget.plot(df, x_col='x', y_col='y')
+        return plot_widget
+
+    window = MainWindow()
+    figures, failures = add_delete_loop(window, new_plot, key, ITERATIONS)
+    assert failures == []
+
+    del df
+    loader.release()
+    window.deleteLater()
+    flush_deletes()
+
+    assert leak_failures(key, figures) == []
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+import render
+from utils.aggregation import OTHER_LABEL, aggregate_bars
+from utils.csv_loader import CSVLoader
+from utils.streaming import BarStreamReducer, XYStreamReducer
+
+ROWS = 20_000
+
+
+def _stream(path, reducer, columns):
+    success, error_msg = CSVLoader().stream_csv(str(path), [reducer], usecols=columns,
+                                                memory_budget=64 * 1024)
+    assert success, error_msg
+    return reducer.result()
+
+
+def test_xy_reduction_covers_unsorted_x(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.permutation(ROWS).astype('float64')
+    path = tmp_path / 'line.csv'
+    pd.DataFrame({'x': x, 'y': x * 2}).to_csv(path, index=False)
+
+    result = _stream(path, XYStreamReducer('x', 'y', max_points=500), ['x', 'y'])
+    assert len(result) <= 504
+    assert (np.diff(result['x']) >= 0).all()
+    assert result['x'].iloc[0] == 0 and result['x'].iloc[-1] == ROWS - 1
+    # Kept points are spread along the whole line, not bunched at its ends
+    counts, _ = np.histogram(result['x'], bins=20, range=(0, ROWS))
+    assert (counts > 0).all()
+
+
+def test_xy_reduction_parses_timestamp_x(tmp_path):
+    times = pd.date_range('2024-01-01', periods=ROWS, freq='s')
+    path = tmp_path / 'times.csv'
+    pd.DataFrame({'time': times.strftime('%Y-%m-%d %H:%M:%S'), 'value': np.arange(ROWS)}
+                 ).to_csv(path, index=False)
+
+    loader = CSVLoader()
+    reducer = XYStreamReducer('time', 'value', max_points=500)
+    success, error_msg = loader.stream_csv(str(path), [reducer], memory_budget=64 * 1024)
+    assert success, error_msg
+    result = reducer.result()
+    assert pd.api.types.is_datetime64_any_dtype(result['time'])
+    assert result['time'].iloc[0] == times[0] and result['time'].iloc[-1] == times[-1]
+    assert loader.get_time_range('time') == (times[0], times[-1])
+
+
+def test_bar_reduction_matches_aggregate_bars(tmp_path):
+    rng = np.random.default_rng(1)
+    labels = rng.choice([f'host{i}' for i in range(50)] + [OTHER_LABEL], ROWS)
+    values = rng.standard_normal(ROWS)
+    path = tmp_path / 'bars.csv'
+    pd.DataFrame({'label': labels, 'value': values}).to_csv(path, index=False)
+    df = pd.read_csv(path)
+
+    streamed = _stream(path, BarStreamReducer('label', 'value', 'mean', top_n=10), ['label', 'value'])
+    expected = aggregate_bars(df['label'], df['value'], 'mean', 10)
+    assert list(streamed[0]) == list(expected[0])
+    np.testing.assert_allclose(streamed[1], expected[1])
+    assert len(set(streamed[0])) == len(streamed[0])
+
+
+def test_render_streams_large_files(tmp_path):
+    path = tmp_path / 'data.csv'
+    pd.DataFrame({'x': np.arange(ROWS), 'y': np.arange(ROWS) % 7, 'label': np.arange(ROWS) % 40}
+                 ).to_csv(path, index=False)
+    plots = [
+        {'file': str(path), 'type': 'xy', 'x_col': 'x', 'y_col': 'y',
+         'output': str(tmp_path / 'xy.png')},
+        {'file': str(path), 'type': 'bar', 'label_col': 'label', 'value_col': 'y', 'top_n': 5,
+         'output': str(tmp_path / 'bar.png')},
+    ]
+    for plot in plots:
+        assert render.render_plot(plot, stream_above=0) == plot['output']
+        assert (tmp_path / plot['output']).stat().st_size > 0
@@ -0,0 +1,151 @@
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+REDUCERS = ('sum', 'mean', 'count', 'min', 'max')
+DEFAULT_TOP_N = 30
+OTHER_LABEL = 'Other'
+
+
+def _group_partials(codes: np.ndarray, values: np.ndarray, n_groups: int):
+    valid = ~np.isnan(values)
+    codes, values = codes[valid], values[valid]
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    counts = np.bincount(codes, minlength=n_groups)
+    mins = np.full(n_groups, np.inf)
+    maxs = np.full(n_groups, -np.inf)
+    np.minimum.at(mins, codes, values)
+    np.maximum.at(maxs, codes, values)
+    return sums, counts, mins, maxs
+
+
+def _reduce(reducer: str, sums, counts, mins, maxs) -> np.ndarray:
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if reducer == 'sum':
+            return sums.astype('float64')
+        if reducer == 'count':
+            return counts.astype('float64')
+        if reducer == 'mean':
+            return np.where(counts > 0, sums / counts, np.nan)
+        if reducer == 'min':
+            return np.where(counts > 0, mins, np.nan)
+        return np.where(counts > 0, maxs, np.nan)
+
+
+def aggregate_bars(labels, values, reducer: str = 'sum', top_n: int = DEFAULT_TOP_N,
+                   other_label: str = OTHER_LABEL) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate values per label, keeping the `top_n` largest groups and folding the rest into one bar.
+
+    Labels are mapped to integer codes once, and every reducer is a bincount or
+    ufunc.at over those codes, so the cost is linear in the number of rows and
+    the number of bars drawn is at most top_n + 1. Labels are grouped by their
+    text, so every bar label is unique; a group already called `other_label`
+    is merged into the folded bar.
+
+    Args:
+        labels (pd.Series | np.ndarray): Label of every row.
+        values (pd.Series | np.ndarray): Numeric value of every row; NaN rows are ignored.
+        reducer (str): One of 'sum', 'mean', 'count', 'min' or 'max'.
+        top_n (int): Number of groups to keep; 0 keeps all of them.
+        other_label (str): Label of the bar holding the remaining groups.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Bar labels as strings, in order of first
+        appearance with the folded bar last, and their aggregated values
+    """
+    if reducer not in REDUCERS:
+        raise ValueError(f"Unknown reducer '{reducer}'")
+    aggregator = BarAggregator()
+    aggregator.update(labels, values)
+    return aggregator.result(reducer, top_n, other_label)
+
+
+class BarAggregator:
+    """
+    Running per-label partials (sum, count, min, max) that new rows can be added to.
+
+    Each update costs O(new rows) plus O(labels) for the bincounts, and memory
+    grows with the number of distinct labels, not with the number of rows.
+    """
+    def __init__(self):
+        self._index = pd.Index([], dtype=object)
+        self._sums = np.zeros(0)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._mins = np.zeros(0)
+        self._maxs = np.zeros(0)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def update(self, labels, values):
+        """
+        Add rows to the running partials.
+
+        Args:
+            labels (pd.Series | np.ndarray): Label of every row.
+            values (pd.Series | np.ndarray): Numeric value of every row; NaN rows are ignored.
+        """
+        codes, uniques = pd.factorize(pd.Series(labels), use_na_sentinel=False)
+        # Bars are labelled by text, so labels that print the same, such as 1 and '1',
+        # are one group; merging the uniques costs O(labels), not O(rows)
+        label_codes, uniques = pd.factorize(np.asarray(uniques, dtype=object).astype(str))
+        codes = label_codes[codes]
+        values = pd.Series(values).to_numpy(dtype='float64', na_value=np.nan)
+        if len(self._index):
+            mapping = self._index.get_indexer(uniques)
+        else:
+            mapping = np.full(len(uniques), -1, dtype=np.intp)
+        new = mapping < 0
+        if new.any():
+            n_new = int(new.sum())
+            mapping[new] = np.arange(len(self._index), len(self._index) + n_new)
+            added = np.asarray(uniques, dtype=object)[new]
+            self._index = self._index.append(pd.Index(added, dtype=object))
+            self._sums = np.append(self._sums, np.zeros(n_new))
+            self._counts = np.append(self._counts, np.zeros(n_new, dtype=np.int64))
+            self._mins = np.append(self._mins, np.full(n_new, np.inf))
+            self._maxs = np.append(self._maxs, np.full(n_new, -np.inf))
+
+        sums, counts, mins, maxs = _group_partials(mapping[codes], values, len(self._index))
+        self._sums += sums
+        self._counts += counts
+        np.minimum(self._mins, mins, out=self._mins)
+        np.maximum(self._maxs, maxs, out=self._maxs)
+
+    def result(self, reducer: str = 'sum', top_n: int = DEFAULT_TOP_N,
+               other_label: str = OTHER_LABEL) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reduce the partials to bars, as aggregate_bars() does.
+
+        Args:
+            reducer (str): One of 'sum', 'mean', 'count', 'min' or 'max'.
+            top_n (int): Number of groups to keep; 0 keeps all of them.
+            other_label (str): Label of the bar holding the remaining groups.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Bar labels as strings and their aggregated values
+        """
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown reducer '{reducer}'")
+        partials = self._sums, self._counts, self._mins, self._maxs
+        aggregated = _reduce(reducer, *partials)
+        bar_labels = np.asarray(self._index, dtype=object)
+
+        if top_n <= 0 or len(self._index) <= top_n:
+            return bar_labels, aggregated
+
+        ranking = np.argsort(np.nan_to_num(-aggregated, nan=np.inf), kind='stable')
+        keep = np.sort(ranking[:top_n])
+        rest = ranking[top_n:]
+        # A group already called other_label goes into the folded bar, so no label repeats
+        existing = bar_labels[keep] == other_label
+        if existing.any():
+            rest = np.append(rest, keep[existing])
+            keep = keep[~existing]
+        sums, counts, mins, maxs = partials
+        other = _reduce(reducer, sums[rest].sum(keepdims=True), counts[rest].sum(keepdims=True),
+                        mins[rest].min(keepdims=True), maxs[rest].max(keepdims=True))
+        return (np.append(bar_labels[keep], other_label),
+                np.append(aggregated[keep], other))
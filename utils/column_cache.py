@@ -0,0 +1,253 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import warnings
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+_SAMPLE_BLOCK = 64 * 1024
+_SAMPLE_COUNT = 16
+_MANIFEST = 'manifest.json'
+
+
+def file_fingerprint(file_path: str) -> str:
+    """
+    Fingerprint a file from its size, mtime and a sample of its content.
+
+    The head, the tail and evenly spaced blocks in between are hashed, so the
+    cost stays constant for multi-GB files while any edit that changes the size,
+    the mtime or a sampled block produces a new fingerprint.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        str: Hex digest identifying the file's current content
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    with open(file_path, 'rb') as f:
+        if stat.st_size <= _SAMPLE_BLOCK * _SAMPLE_COUNT:
+            digest.update(f.read())
+        else:
+            stride = (stat.st_size - _SAMPLE_BLOCK) // (_SAMPLE_COUNT - 1)
+            for i in range(_SAMPLE_COUNT):
+                f.seek(i * stride)
+                digest.update(f.read(_SAMPLE_BLOCK))
+    return digest.hexdigest()
+
+
+class ColumnCache:
+    """
+    An on-disk, size-bounded cache of parsed CSV columns.
+
+    Each source file gets a directory named after its fingerprint, holding one
+    .npy file per column and a manifest. Numeric columns are memory-mapped on
+    read, so only the pages a plot touches are paged in. Text columns are stored
+    as codes plus a JSON list of categories, which avoids pickling. When the
+    cache grows past max_bytes, the least recently used files are evicted.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory to store cached columns in, created if missing.
+            max_bytes (int): Upper bound on the total size of the cache.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, fingerprint: str, columns: Iterable[str]) -> Dict[str, pd.Series]:
+        """
+        Read the cached columns among the requested ones.
+
+        Args:
+            fingerprint (str): Fingerprint of the source file.
+            columns (Iterable[str]): Columns wanted.
+
+        Returns:
+            Dict[str, pd.Series]: Read-only columns found in the cache, by name
+        """
+        with self._lock:
+            manifest = self._read_manifest(fingerprint)
+            if manifest is None:
+                return {}
+            found = {}
+            for name in columns:
+                info = manifest['columns'].get(name)
+                if info is None:
+                    continue
+                try:
+                    found[name] = self._read_column(fingerprint, name, info)
+                except (OSError, ValueError):
+                    continue
+            if found:
+                self._touch(fingerprint)
+            return found
+
+    def get_frame(self, fingerprint: str) -> Optional[pd.DataFrame]:
+        """
+        Read a whole file back, if every one of its columns is cached.
+
+        Args:
+            fingerprint (str): Fingerprint of the source file.
+
+        Returns:
+            Optional[pd.DataFrame]: The cached DataFrame, or None on a miss
+        """
+        with self._lock:
+            manifest = self._read_manifest(fingerprint)
+        header = manifest.get('header') if manifest is not None else None
+        if header is None:
+            return None
+        columns = self.get(fingerprint, header)
+        if len(columns) != len(header):
+            return None
+        return pd.DataFrame({name: columns[name] for name in header}, copy=False)
+
+    def put(self, fingerprint: str, columns: Dict[str, pd.Series],
+            source: Optional[str] = None, header: Optional[List[str]] = None):
+        """
+        Store columns for a source file and evict old entries if the cache is too big.
+
+        Columns with a dtype that cannot be stored without pickling are skipped.
+
+        Args:
+            fingerprint (str): Fingerprint of the source file.
+            columns (Dict[str, pd.Series]): Columns to store, by name.
+            source (Optional[str]): Path of the source file, kept for reference.
+            header (Optional[List[str]]): Full column list of the source file, when
+                all of its columns are being stored.
+        """
+        with self._lock:
+            entry_dir = os.path.join(self.cache_dir, fingerprint)
+            os.makedirs(entry_dir, exist_ok=True)
+            manifest = self._read_manifest(fingerprint) or {'source': source, 'columns': {}}
+            for name, series in columns.items():
+                if name in manifest['columns']:
+                    continue
+                index = len(manifest['columns'])
+                info = self._write_column(entry_dir, index, series)
+                if info is not None:
+                    manifest['columns'][name] = info
+            if header is not None and all(name in manifest['columns'] for name in header):
+                manifest['header'] = list(header)
+            self._write_manifest(fingerprint, manifest)
+            self._evict(keep=fingerprint)
+
+    def clear(self):
+        """
+        Remove every cached file.
+        """
+        with self._lock:
+            for fingerprint in os.listdir(self.cache_dir):
+                shutil.rmtree(os.path.join(self.cache_dir, fingerprint), ignore_errors=True)
+
+    def _read_column(self, fingerprint: str, name: str, info: dict) -> pd.Series:
+        entry_dir = os.path.join(self.cache_dir, fingerprint)
+        if info['kind'] == 'text':
+            codes = np.load(os.path.join(entry_dir, info['file']))
+            with open(os.path.join(entry_dir, info['categories']), encoding='utf-8') as f:
+                categories = np.asarray(json.load(f) + [np.nan], dtype=object)
+            values = categories[codes]
+            values.flags.writeable = False
+        else:
+            values = np.load(os.path.join(entry_dir, info['file']), mmap_mode='r')
+        return pd.Series(values, name=name, copy=False)
+
+    @staticmethod
+    def _write_column(entry_dir: str, index: int, series: pd.Series) -> Optional[dict]:
+        file_name = f'{index}.npy'
+        if isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+            np.save(os.path.join(entry_dir, file_name), series.to_numpy())
+            return {'file': file_name, 'kind': 'numeric', 'dtype': str(series.dtype)}
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Categorical columns already carry their codes
+            codes, categories = series.cat.codes.to_numpy(), series.cat.categories
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            codes, categories = pd.factorize(series, use_na_sentinel=True)
+        else:
+            return None
+        if not all(isinstance(value, str) for value in categories):
+            return None
+        # NA maps to -1, which indexes the trailing NaN appended on read
+        np.save(os.path.join(entry_dir, file_name), codes)
+        categories_file = f'{index}.json'
+        with open(os.path.join(entry_dir, categories_file), 'w', encoding='utf-8') as f:
+            json.dump(list(categories), f)
+        return {'file': file_name, 'kind': 'text', 'categories': categories_file}
+
+    def _read_manifest(self, fingerprint: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.cache_dir, fingerprint, _MANIFEST), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, fingerprint: str, manifest: dict):
+        path = os.path.join(self.cache_dir, fingerprint, _MANIFEST)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+
+    def _touch(self, fingerprint: str):
+        try:
+            os.utime(os.path.join(self.cache_dir, fingerprint, _MANIFEST))
+        except OSError:
+            pass
+
+    def _evict(self, keep: str):
+        entries = []
+        total = 0
+        for fingerprint in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, fingerprint)
+            if not os.path.isdir(entry_dir):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            try:
+                last_used = os.stat(os.path.join(entry_dir, _MANIFEST)).st_mtime
+            except OSError:
+                last_used = 0
+            entries.append((last_used, fingerprint, size))
+            total += size
+
+        for _, fingerprint, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if fingerprint == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, fingerprint), ignore_errors=True)
+            total -= size
+
+
+def column_cache_from_env() -> Optional[ColumnCache]:
+    """
+    Build a ColumnCache from the VIZ_CACHE_DIR and VIZ_CACHE_MAX_MB environment variables.
+
+    An invalid VIZ_CACHE_MAX_MB is reported as a warning and the default size is used.
+
+    Returns:
+        Optional[ColumnCache]: The configured cache, or None if VIZ_CACHE_DIR is not set
+    """
+    cache_dir = os.environ.get('VIZ_CACHE_DIR')
+    if not cache_dir:
+        return None
+    max_mb = os.environ.get('VIZ_CACHE_MAX_MB')
+    max_bytes = DEFAULT_MAX_BYTES
+    if max_mb:
+        try:
+            max_bytes = int(max_mb) * 1024 ** 2
+        except ValueError:
+            warnings.warn(f'Ignoring VIZ_CACHE_MAX_MB={max_mb!r}, which is not a whole number of '
+                          f'megabytes; using {DEFAULT_MAX_BYTES // 1024 ** 2} MB.')
+    return ColumnCache(cache_dir, max_bytes)
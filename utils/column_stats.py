@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    """
+    Summary of one column, computed once when the column is loaded.
+
+    For datetime columns, min and max are int64 nanoseconds since the epoch.
+    The number of distinct values is not part of it, since it takes a full
+    hash pass; see DatasetRegistry.cardinality().
+    """
+    name: str
+    dtype_class: str
+    count: int
+    null_count: int
+    min: Optional[Union[float, int]] = None
+    max: Optional[Union[float, int]] = None
+
+    @property
+    def is_numeric(self) -> bool:
+        return self.dtype_class in ('numeric', 'bool')
+
+    @property
+    def is_datetime(self) -> bool:
+        return self.dtype_class == 'datetime'
+
+    @property
+    def value_range(self) -> Optional[Tuple[float, float]]:
+        if not self.is_numeric or self.min is None or self.max is None:
+            return None
+        return self.min, self.max
+
+    @property
+    def time_range(self) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        if not self.is_datetime or self.min is None or self.max is None:
+            return None
+        return pd.Timestamp(self.min), pd.Timestamp(self.max)
+
+
+def dtype_class(dtype) -> str:
+    """
+    Classify a dtype into the coarse groups the dialogs care about.
+
+    Args:
+        dtype: A NumPy or pandas dtype.
+
+    Returns:
+        str: One of 'bool', 'numeric', 'datetime', 'text' or 'other'
+    """
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(dtype):
+        return 'numeric'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if isinstance(dtype, pd.CategoricalDtype):
+        return 'text'
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        return 'text'
+    return 'other'
+
+
+def compute_column_stats(df: pd.DataFrame) -> Dict[str, ColumnStats]:
+    """
+    Compute the statistics of every column of a DataFrame.
+
+    Min and max are taken with one reduction over all numeric columns at once,
+    which pandas runs per dtype block rather than per column.
+
+    Args:
+        df (pd.DataFrame): Data to summarize.
+
+    Returns:
+        Dict[str, ColumnStats]: Statistics by column name
+    """
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    bounds = {}
+    if len(numeric.columns):
+        mins, maxs = numeric.min(), numeric.max()
+        for name in numeric.columns:
+            if pd.notna(mins[name]):
+                bounds[name] = float(mins[name]), float(maxs[name])
+    # Timestamps are stored as int64 nanoseconds since the epoch, which floats cannot hold exactly
+    for name in df.select_dtypes(include=['datetime']).columns:
+        low, high = df[name].min(), df[name].max()
+        if pd.notna(low):
+            bounds[name] = low.value, high.value
+    counts = df.count()
+    rows = len(df)
+
+    stats = {}
+    for name in df.columns:
+        low, high = bounds.get(name, (None, None))
+        stats[name] = ColumnStats(
+            name=name,
+            dtype_class=dtype_class(df[name].dtype),
+            count=rows,
+            null_count=rows - int(counts[name]),
+            min=low,
+            max=high,
+        )
+    return stats
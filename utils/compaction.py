@@ -0,0 +1,156 @@
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_ARROW_STRING = pd.StringDtype('pyarrow') if importlib.util.find_spec('pyarrow') is not None else None
+
+# Text columns with at most this many distinct values per row become categoricals
+CATEGORY_MAX_RATIO = 0.5
+
+
+@dataclass(frozen=True)
+class ColumnMemory:
+    """
+    Memory of one column before and after compaction.
+    """
+    name: str
+    dtype_before: str
+    dtype_after: str
+    bytes_before: int
+    bytes_after: int
+
+
+class MemoryReport:
+    """
+    Memory of a set of columns before and after compaction.
+    """
+    def __init__(self, columns: Optional[Dict[str, ColumnMemory]] = None):
+        """
+        Initialize the report.
+
+        Args:
+            columns (Optional[Dict[str, ColumnMemory]]): Per-column entries by name.
+        """
+        self.columns = dict(columns or {})
+
+    @property
+    def bytes_before(self) -> int:
+        return sum(column.bytes_before for column in self.columns.values())
+
+    @property
+    def bytes_after(self) -> int:
+        return sum(column.bytes_after for column in self.columns.values())
+
+    def summary(self) -> str:
+        """
+        Describe the saving in one line, e.g. for a dialog.
+
+        Returns:
+            str: Memory before and after, and the share saved
+        """
+        before, after = self.bytes_before, self.bytes_after
+        saved = f' ({1 - after / before:.0%} less)' if before else ''
+        return f'Memory: {_megabytes(before)} -> {_megabytes(after)}{saved}'
+
+
+def _megabytes(nbytes: int) -> str:
+    return f'{nbytes / 1024 ** 2:,.1f} MB'
+
+
+def _column_bytes(series: pd.Series) -> int:
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def _is_lossless(original: np.ndarray, compacted: np.ndarray) -> bool:
+    return np.array_equal(original, compacted.astype(original.dtype), equal_nan=True)
+
+
+def _is_text(series: pd.Series) -> bool:
+    # pandas 3 parses text into its own string dtype rather than object
+    if isinstance(series.dtype, pd.StringDtype):
+        return True
+    return series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) == 'string'
+
+
+def _is_arrow_string(dtype) -> bool:
+    return isinstance(dtype, pd.StringDtype) and dtype.storage.startswith('pyarrow')
+
+
+def compact_series(series: pd.Series) -> pd.Series:
+    """
+    Store a column in the smallest dtype that holds the same values.
+
+    Integers are downcast to the narrowest signed or unsigned type that fits,
+    floats to float32 where every value survives the round trip, and text to
+    a categorical when values repeat, or to Arrow-backed strings otherwise
+    when pyarrow is installed. Text may be object or pandas string dtype.
+    Other columns are returned unchanged.
+
+    Args:
+        series (pd.Series): Column to compact.
+
+    Returns:
+        pd.Series: The compacted column, or `series` itself if nothing is gained
+    """
+    dtype = series.dtype
+    if len(series) == 0:
+        return series
+    if _is_text(series):
+        if series.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(series):
+            return series.astype('category')
+        if _ARROW_STRING is not None and not _is_arrow_string(dtype):
+            return series.astype(_ARROW_STRING)
+        return series
+    if not isinstance(dtype, np.dtype):
+        return series
+    if dtype.kind in 'iu':
+        downcast = 'unsigned' if series.min() >= 0 else 'integer'
+        compacted = pd.to_numeric(series, downcast=downcast)
+        return compacted if compacted.dtype.itemsize < dtype.itemsize else series
+    if dtype == np.float64:
+        values = series.to_numpy()
+        narrow = values.astype(np.float32)
+        if _is_lossless(values, narrow):
+            return pd.Series(narrow, index=series.index, name=series.name, copy=False)
+        return series
+    return series
+
+
+def compact_dataframe(df: pd.DataFrame,
+                      columns: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, MemoryReport]:
+    """
+    Compact the columns of a freshly parsed DataFrame in place.
+
+    A dict of Series works as well, with `columns` given.
+
+    Args:
+        df (pd.DataFrame): DataFrame to compact; it must not be shared yet.
+        columns (Optional[Iterable[str]]): Columns to compact, all of them when omitted.
+
+    Returns:
+        Tuple[pd.DataFrame, MemoryReport]: The same DataFrame, and the memory of each
+        column before and after
+    """
+    report = {}
+    for name in (df.columns if columns is None else columns):
+        before = df[name]
+        after = compact_series(before)
+        if after is not before:
+            df[name] = after
+        report[name] = ColumnMemory(name, str(before.dtype), str(after.dtype),
+                                    _column_bytes(before), _column_bytes(after))
+    return df, MemoryReport(report)
+
+
+def compaction_from_env() -> bool:
+    """
+    Check whether the VIZ_COMPACT_DTYPES environment variable enables compaction.
+
+    Returns:
+        bool: True if VIZ_COMPACT_DTYPES is set to 1, true or yes
+    """
+    return os.environ.get('VIZ_COMPACT_DTYPES', '').strip().lower() in ('1', 'true', 'yes')
@@ -1,53 +1,736 @@
+import io
+import os
+import threading
+from dataclasses import dataclass, field
+from functools import partial
 import pandas as pd
-from typing import Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from utils.column_stats import ColumnStats
+from utils.compaction import MemoryReport
+from utils.dataset_registry import DatasetKey, DatasetRegistry, get_registry
+from utils.datetimes import convert_datetime_columns, detect_datetime_formats
+from utils.instrumentation import approx_nbytes, get_tracer
+from utils.streaming import ColumnStatsReducer, StreamReducer
+
+DEFAULT_CHUNKSIZE = 100_000
+SCHEMA_SAMPLE_ROWS = 1000
+DEFAULT_STREAM_MEMORY_BUDGET = 256 * 1024 ** 2
+# pd.read_csv needs roughly this many times a chunk's final size while parsing it
+_PARSER_OVERHEAD = 3
+# Upper bound on the bytes one CSVFollower.poll() parses; the rest waits for the next poll
+DEFAULT_FOLLOW_READ_BYTES = 16 * 1024 ** 2
+_LINE_SCAN_BLOCK = 64 * 1024
+
+
+class LoadCancelled(Exception):
+    """
+    Raised when a chunked load is cancelled before it finishes.
+    """
+
+
+class FileTruncated(Exception):
+    """
+    Raised when a followed file shrinks, e.g. because it was rotated or rewritten.
+    """
+
+
+def read_csv_chunked(file_path: str,
+                     chunksize: int = DEFAULT_CHUNKSIZE,
+                     header_callback: Optional[Callable[[List[str]], None]] = None,
+                     progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     **read_kwargs) -> pd.DataFrame:
+    """
+    Read a CSV file in chunks, reporting progress and checking for cancellation between chunks.
+
+    Args:
+        file_path (str): Path to the CSV file to load.
+        chunksize (int): Number of rows parsed per chunk.
+        header_callback (Optional[Callable[[List[str]], None]]): Called with the column
+            names as soon as the header line has been parsed.
+        progress_callback (Optional[Callable[[int, int, int], None]]): Called after every
+            chunk with (bytes read, total bytes, rows parsed).
+        cancel_event (Optional[threading.Event]): When set, the load stops at the next chunk.
+        **read_kwargs: Extra keyword arguments for pd.read_csv, e.g. usecols and dtype.
+
+    Returns:
+        pd.DataFrame: The parsed file
+
+    Raises:
+        LoadCancelled: If cancel_event was set before the load finished.
+    """
+    columns = []
+
+    def on_header(header):
+        columns.extend(header)
+        if header_callback is not None:
+            header_callback(header)
+
+    chunks = list(iter_csv_chunks(file_path, chunksize, on_header, progress_callback, cancel_event,
+                                  **read_kwargs))
+    if not chunks:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def iter_csv_chunks(file_path: str,
+                    chunksize: int = DEFAULT_CHUNKSIZE,
+                    header_callback: Optional[Callable[[List[str]], None]] = None,
+                    progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                    cancel_event: Optional[threading.Event] = None,
+                    **read_kwargs) -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV file chunk by chunk, reporting progress and checking for cancellation.
+
+    Takes the same arguments as read_csv_chunked().
+
+    Yields:
+        pd.DataFrame: The next chunk of at most `chunksize` rows
+
+    Raises:
+        LoadCancelled: If cancel_event was set before the last chunk.
+    """
+    total_bytes = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        columns = pd.read_csv(f, nrows=0, usecols=read_kwargs.get('usecols')).columns.tolist()
+        if header_callback is not None:
+            header_callback(columns)
+        f.seek(0)
+
+        rows_parsed = 0
+        for chunk in pd.read_csv(f, chunksize=chunksize, **read_kwargs):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled()
+            rows_parsed += len(chunk)
+            if progress_callback is not None:
+                progress_callback(f.tell(), total_bytes, rows_parsed)
+            yield chunk
+
+
+def chunksize_for_budget(file_path: str, memory_budget: int,
+                         usecols: Optional[Sequence[str]] = None,
+                         sample_rows: int = SCHEMA_SAMPLE_ROWS) -> int:
+    """
+    Pick a chunk size that keeps one parsed chunk within a memory budget.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        memory_budget (int): Bytes available for one chunk.
+        usecols (Optional[Sequence[str]]): Columns that will be parsed.
+        sample_rows (int): Number of rows to measure.
+
+    Returns:
+        int: Number of rows per chunk
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows, usecols=usecols)
+    if len(sample) == 0:
+        return DEFAULT_CHUNKSIZE
+    bytes_per_row = max(1, int(sample.memory_usage(deep=True, index=False).sum()) // len(sample))
+    return max(1000, memory_budget // (bytes_per_row * _PARSER_OVERHEAD))
+
+
+def read_csv_columns(file_path: str, columns: List[str],
+                     dtypes: Optional[Dict[str, str]] = None,
+                     datetime_formats: Optional[Dict[str, str]] = None,
+                     **chunk_kwargs) -> pd.DataFrame:
+    """
+    Parse only the given columns of a CSV file.
+
+    The dtype hints come from a schema probe, which only sees a sample of the file.
+    If a hint turns out wrong further down the file, the columns are parsed again
+    with inferred dtypes.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        columns (List[str]): Columns to parse.
+        dtypes (Optional[Dict[str, str]]): Explicit dtypes by column name.
+        datetime_formats (Optional[Dict[str, str]]): strptime formats of the timestamp
+            columns, which are parsed into datetime64[ns].
+        **chunk_kwargs: Progress and cancellation arguments for read_csv_chunked().
+
+    Returns:
+        pd.DataFrame: DataFrame holding only the requested columns
+    """
+    dtype = {name: dtypes[name] for name in columns if dtypes and name in dtypes}
+    try:
+        df = read_csv_chunked(file_path, usecols=columns, dtype=dtype or None, **chunk_kwargs)
+    except (ValueError, TypeError):
+        if not dtype:
+            raise
+        df = read_csv_chunked(file_path, usecols=columns, **chunk_kwargs)
+    return convert_datetime_columns(df, datetime_formats or {})
+
+
+def read_csv_with_datetimes(file_path: str, reader: Callable[..., pd.DataFrame] = pd.read_csv,
+                            sample_rows: int = SCHEMA_SAMPLE_ROWS, **read_kwargs) -> pd.DataFrame:
+    """
+    Parse a whole CSV file, turning the text columns that hold timestamps into datetime64[ns].
+
+    Timestamp columns are detected on the first rows, as by probe_csv_schema().
+
+    Args:
+        file_path (str): Path to the CSV file.
+        reader (Callable[..., pd.DataFrame]): Function that parses the file, e.g. read_csv_chunked.
+        sample_rows (int): Number of rows to detect timestamp columns on.
+        **read_kwargs: Extra keyword arguments for the reader.
+
+    Returns:
+        pd.DataFrame: The parsed file
+    """
+    df = reader(file_path, **read_kwargs)
+    return convert_datetime_columns(df, detect_datetime_formats(df.head(sample_rows)))
+
+
+@dataclass(frozen=True)
+class CSVSchema:
+    """
+    Column names and dtypes of a CSV file, inferred from its first rows.
+
+    Text columns whose sampled values all parse with one strptime format are
+    listed in datetime_formats and loaded as datetime64[ns].
+    """
+    columns: List[str]
+    dtypes: Dict[str, object] = field(default_factory=dict)
+    sample_rows: int = 0
+    datetime_formats: Dict[str, str] = field(default_factory=dict)
+
+    def is_numeric(self, column_name: str) -> bool:
+        """
+        Check whether a column looked numeric in the sample.
+
+        A column with text in the sample is never numeric in the full file, so a
+        False here is final. A True still has to be confirmed once the column is loaded.
+
+        Args:
+            column_name (str): Column to check.
+
+        Returns:
+            bool: True if the sampled values were numeric
+        """
+        dtype = self.dtypes.get(column_name)
+        return dtype is not None and pd.api.types.is_numeric_dtype(dtype)
+
+    def is_datetime(self, column_name: str) -> bool:
+        """
+        Check whether a column holds timestamps, as detected in the sample.
+
+        Args:
+            column_name (str): Column to check.
+
+        Returns:
+            bool: True if the column is loaded as datetime64[ns]
+        """
+        dtype = self.dtypes.get(column_name)
+        return (column_name in self.datetime_formats
+                or (dtype is not None and pd.api.types.is_datetime64_any_dtype(dtype)))
+
+    def dtype_hints(self) -> Dict[str, str]:
+        """
+        Get explicit dtypes to pass to a projected load.
+
+        Integer and boolean columns are left to inference, since a missing
+        value further down the file would not fit the sampled dtype.
+
+        Returns:
+            Dict[str, str]: Dtype names by column name
+        """
+        hints = {}
+        for name, dtype in self.dtypes.items():
+            if pd.api.types.is_float_dtype(dtype):
+                hints[name] = 'float64'
+            elif pd.api.types.is_object_dtype(dtype):
+                hints[name] = 'object'
+        return hints
+
+
+def probe_csv_schema(file_path: str, sample_rows: int = SCHEMA_SAMPLE_ROWS) -> CSVSchema:
+    """
+    Read the header and the first rows of a CSV file to infer its schema.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        sample_rows (int): Number of rows to sample for dtype inference.
+
+    Returns:
+        CSVSchema: The inferred schema
+    """
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    return CSVSchema(sample.columns.tolist(), dict(sample.dtypes), len(sample),
+                     detect_datetime_formats(sample))
+
+
+def _line_start(f, offset: int) -> int:
+    """Find the position just after the last newline before `offset`."""
+    pos = offset
+    while pos > 0:
+        step = min(_LINE_SCAN_BLOCK, pos)
+        f.seek(pos - step)
+        newline = f.read(step).rfind(b'\n')
+        if newline >= 0:
+            return pos - step + newline + 1
+        pos -= step
+    return 0
+
+
+class CSVFollower:
+    """
+    Parses the rows appended to a CSV file since the last poll.
+
+    The follower keeps the byte offset it has read up to and only ever reads
+    past it, so a poll costs O(new rows) regardless of the size of the file.
+    A partly written last line is left for the next poll.
+    """
+    def __init__(self, file_path: str, usecols: Optional[List[str]] = None,
+                 dtypes: Optional[Dict[str, str]] = None, offset: Optional[int] = None,
+                 max_bytes: int = DEFAULT_FOLLOW_READ_BYTES):
+        """
+        Initialize the follower.
+
+        Args:
+            file_path (str): Path to the CSV file to follow.
+            usecols (Optional[List[str]]): Columns to parse, all of them when omitted.
+            dtypes (Optional[Dict[str, str]]): Explicit dtypes by column name.
+            offset (Optional[int]): Byte offset already read, e.g. the file size at
+                load time. Defaults to the current end of the file.
+            max_bytes (int): Upper bound on the bytes parsed by one poll.
+        """
+        self.file_path = file_path
+        self.usecols = usecols
+        self.dtypes = dtypes
+        self.max_bytes = max_bytes
+        with open(file_path, 'rb') as f:
+            header_line = f.readline()
+            size = f.seek(0, os.SEEK_END)
+            start = _line_start(f, size if offset is None else min(offset, size))
+        self._header = pd.read_csv(io.BytesIO(header_line), nrows=0).columns.tolist()
+        self.offset = max(start, len(header_line))
+
+    @classmethod
+    def from_dataset_key(cls, key: DatasetKey, usecols: Optional[List[str]] = None,
+                         dtypes: Optional[Dict[str, str]] = None) -> 'CSVFollower':
+        """
+        Follow a registered dataset from where it was loaded.
+
+        Args:
+            key (DatasetKey): Registry key of the dataset; it holds the path and the
+                size the file had when it was loaded.
+            usecols (Optional[List[str]]): Columns to parse.
+            dtypes (Optional[Dict[str, str]]): Explicit dtypes by column name.
+
+        Returns:
+            CSVFollower: A follower starting after the loaded rows
+        """
+        path, size, _ = key
+        return cls(path, usecols, dtypes, offset=size)
+
+    def poll(self) -> Optional[pd.DataFrame]:
+        """
+        Parse the complete lines appended since the last poll.
+
+        Returns:
+            Optional[pd.DataFrame]: The new rows, or None if no complete line was appended
+
+        Raises:
+            FileTruncated: If the file is now shorter than the offset already read.
+        """
+        size = os.path.getsize(self.file_path)
+        if size < self.offset:
+            raise FileTruncated(f'{self.file_path} was truncated.')
+        if size == self.offset:
+            return None
+        with open(self.file_path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(min(size - self.offset, self.max_bytes))
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return None
+        self.offset += end
+
+        read = partial(pd.read_csv, header=None, names=self._header, usecols=self.usecols)
+        dtype = {name: self.dtypes[name] for name in self.usecols or self._header
+                 if self.dtypes and name in self.dtypes}
+        try:
+            return read(io.BytesIO(data[:end]), dtype=dtype or None)
+        except (ValueError, TypeError):
+            if not dtype:
+                raise
+            return read(io.BytesIO(data[:end]))
+
 
 class CSVLoader:
     """
     A utility class for loading and managing CSV files.
     """
-    def __init__(self):
+    def __init__(self, registry: Optional[DatasetRegistry] = None):
         """
         Initialize the CSVLoader with no loaded dataframe.
+
+        Args:
+            registry (Optional[DatasetRegistry]): Registry to share datasets through,
+                defaults to the process-wide registry.
         """
         self.df = None
+        self.schema = None
         self.filename = None
+        self.dataset_key = None
+        self.stream_stats = None
+        self._registry = registry if registry is not None else get_registry()
 
-    def load_csv(self, file_path: str) -> Tuple[bool, Optional[str]]:
+    def load_csv(self, file_path: str,
+                 header_callback: Optional[Callable[[List[str]], None]] = None,
+                 progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                 cancel_event: Optional[threading.Event] = None) -> Tuple[bool, Optional[str]]:
         """
         Load a CSV file into a pandas DataFrame.
 
+        The DataFrame is shared through the dataset registry, so a file that is
+        already loaded and unchanged on disk is returned without parsing it again.
+        The loader holds one reference on the dataset until release() is called
+        or another file is loaded.
+
+        When any callback or a cancel event is given, the file is read in chunks
+        with read_csv_chunked(), which makes the load safe to run on a worker
+        thread and cancellable.
+
         Args:
             file_path (str): Path to the CSV file to load.
+            header_callback (Optional[Callable[[List[str]], None]]): Called with the
+                column names once the header is parsed.
+            progress_callback (Optional[Callable[[int, int, int], None]]): Called with
+                (bytes read, total bytes, rows parsed) after every chunk.
+            cancel_event (Optional[threading.Event]): Set it to cancel the load.
 
         Returns:
             Tuple[bool, Optional[str]]: 
             - First value is a boolean indicating success (True) or failure (False)
             - Second value is an error message if loading failed, None otherwise
         """
-        try:
-            self.df = pd.read_csv(file_path)
-            self.filename = file_path.split("/")[-1]
-            return True, None
-        except Exception as e:
-            return False, str(e)
+        if header_callback or progress_callback or cancel_event is not None:
+            reader = partial(read_csv_with_datetimes, reader=read_csv_chunked,
+                             header_callback=header_callback,
+                             progress_callback=progress_callback,
+                             cancel_event=cancel_event)
+        else:
+            reader = read_csv_with_datetimes
+        with get_tracer().span('load', os.path.basename(file_path)) as span:
+            try:
+                key, df = self._registry.acquire(file_path, reader)
+            except LoadCancelled:
+                return False, 'Loading cancelled.'
+            except Exception as e:
+                return False, str(e)
+            span.rows = len(df)
+            span.memory = approx_nbytes(df)
+        # Release the previous dataset only after acquiring the new one, so
+        # reloading the same unchanged file never drops it from the registry.
+        self.release()
+        self.df = df
+        self.schema = CSVSchema(df.columns.tolist(), dict(df.dtypes), len(df))
+        self.dataset_key = key
+        self.filename = file_path.split("/")[-1]
+        return True, None
+
+    def probe_schema(self, file_path: str, sample_rows: int = SCHEMA_SAMPLE_ROWS) -> Tuple[bool, Optional[str]]:
+        """
+        Open a CSV file by reading only its header and a sample of rows.
+
+        The file is registered with the dataset registry without being parsed;
+        columns are loaded later with load_columns().
+
+        Args:
+            file_path (str): Path to the CSV file to open.
+            sample_rows (int): Number of rows to sample for dtype inference.
+
+        Returns:
+            Tuple[bool, Optional[str]]:
+            - First value is a boolean indicating success (True) or failure (False)
+            - Second value is an error message if probing failed, None otherwise
+        """
+        with get_tracer().span('probe', os.path.basename(file_path)) as span:
+            try:
+                schema = probe_csv_schema(file_path, sample_rows)
+                key = self._registry.open(file_path)
+            except Exception as e:
+                return False, str(e)
+            span.rows = schema.sample_rows
+        self.release()
+        self.schema = schema
+        self.dataset_key = key
+        self.filename = file_path.split("/")[-1]
+        return True, None
+
+    def load_columns(self, columns: List[str],
+                     progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                     cancel_event: Optional[threading.Event] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Parse the given columns of the opened file, skipping those already loaded.
+
+        Only the requested columns are parsed, with the dtypes found by the schema
+        probe. This method does not change the loader's state, so it can run on a
+        worker thread while the GUI keeps using the loader.
+
+        Args:
+            columns (List[str]): Columns to load.
+            progress_callback (Optional[Callable[[int, int, int], None]]): Called with
+                (bytes read, total bytes, rows parsed) after every chunk.
+            cancel_event (Optional[threading.Event]): Set it to cancel the load.
+
+        Returns:
+            Tuple[bool, Optional[str]]:
+            - First value is a boolean indicating success (True) or failure (False)
+            - Second value is an error message if loading failed, None otherwise
+        """
+        if self.dataset_key is None:
+            return False, 'No file is loaded.'
+        hints = self.schema.dtype_hints() if self.schema is not None else None
+        formats = self.schema.datetime_formats if self.schema is not None else None
+        reader = partial(read_csv_columns, dtypes=hints, datetime_formats=formats,
+                         progress_callback=progress_callback, cancel_event=cancel_event)
+        with get_tracer().span('load_columns', f"{self.filename}: {', '.join(columns)}") as span:
+            try:
+                self._registry.load_columns(self.dataset_key, columns, reader)
+            except LoadCancelled:
+                return False, 'Loading cancelled.'
+            except Exception as e:
+                return False, str(e)
+            loaded = [self._registry.column(self.dataset_key, name) for name in columns]
+            span.rows = len(loaded[0]) if loaded and loaded[0] is not None else None
+            span.memory = approx_nbytes([series for series in loaded if series is not None])
+        return True, None
+
+    def stream_csv(self, file_path: str, reducers: Sequence[StreamReducer] = (),
+                   usecols: Optional[List[str]] = None,
+                   memory_budget: int = DEFAULT_STREAM_MEMORY_BUDGET,
+                   progress_callback: Optional[Callable[[int, int, int], None]] = None,
+                   cancel_event: Optional[threading.Event] = None) -> Tuple[bool, Optional[str]]:
+        """
+        Process a CSV file that may not fit in memory, in one pass of bounded-size chunks.
+
+        Every chunk is handed to each reducer and then dropped, so peak memory is
+        set by memory_budget rather than by the size of the file. Timestamp columns
+        found by the schema probe are parsed in every chunk. Column statistics are
+        always collected and back get_column_range() afterwards; plot-ready data is
+        read from the reducers' result(), e.g. XYStreamReducer or BarStreamReducer.
+        Nothing is added to the dataset registry.
+
+        Args:
+            file_path (str): Path to the CSV file.
+            reducers (Sequence[StreamReducer]): Reductions to feed with every chunk.
+            usecols (Optional[List[str]]): Columns to parse, all of them when omitted.
+            memory_budget (int): Bytes one parsed chunk may take.
+            progress_callback (Optional[Callable[[int, int, int], None]]): Called with
+                (bytes read, total bytes, rows parsed) after every chunk.
+            cancel_event (Optional[threading.Event]): Set it to cancel the pass.
+
+        Returns:
+            Tuple[bool, Optional[str]]:
+            - First value is a boolean indicating success (True) or failure (False)
+            - Second value is an error message if streaming failed, None otherwise
+        """
+        stats = ColumnStatsReducer()
+        with get_tracer().span('stream', os.path.basename(file_path)) as span:
+            try:
+                schema = probe_csv_schema(file_path)
+                chunksize = chunksize_for_budget(file_path, memory_budget, usecols)
+                for chunk in iter_csv_chunks(file_path, chunksize,
+                                             progress_callback=progress_callback,
+                                             cancel_event=cancel_event,
+                                             usecols=usecols):
+                    # Coerced, so a timestamp column has the same dtype in every chunk
+                    chunk = convert_datetime_columns(chunk, schema.datetime_formats, coerce=True)
+                    stats.update(chunk)
+                    for reducer in reducers:
+                        reducer.update(chunk)
+            except LoadCancelled:
+                return False, 'Loading cancelled.'
+            except Exception as e:
+                return False, str(e)
+            finally:
+                span.rows = stats.rows
+        self.release()
+        self.schema = schema
+        self.stream_stats = stats.result()
+        self.filename = file_path.split("/")[-1]
+        return True, None
+
+    def clone(self) -> 'CSVLoader':
+        """
+        Create another loader on the same dataset, holding its own registry reference.
+
+        Returns:
+            CSVLoader: A loader that can be released independently of this one
+        """
+        loader = CSVLoader(self._registry)
+        if self.dataset_key is not None and self._registry.retain(self.dataset_key):
+            loader.df = self.df
+            loader.schema = self.schema
+            loader.filename = self.filename
+            loader.dataset_key = self.dataset_key
+        return loader
+
+    def follow(self, columns: Optional[List[str]] = None) -> Optional[CSVFollower]:
+        """
+        Start following the loaded file for rows appended after it was loaded.
+
+        Args:
+            columns (Optional[List[str]]): Columns to parse from new rows, all of them when omitted.
+
+        Returns:
+            Optional[CSVFollower]: Follower starting after the loaded rows, or None if no file is loaded
+        """
+        if self.dataset_key is None:
+            return None
+        hints = self.schema.dtype_hints() if self.schema is not None else None
+        return CSVFollower.from_dataset_key(self.dataset_key, columns, hints)
+
+    def has_columns(self, columns: List[str]) -> bool:
+        """
+        Check whether the given columns are loaded and can be used without parsing.
+
+        Args:
+            columns (List[str]): Column names.
+
+        Returns:
+            bool: True if every column is loaded
+        """
+        return self._registry.has_columns(self.dataset_key, columns)
+
+    def is_loaded(self) -> bool:
+        """
+        Check whether a file has been opened or loaded.
+
+        Returns:
+            bool: True if a file is loaded
+        """
+        return self.dataset_key is not None
+
+    def is_numeric(self, column_name: str) -> bool:
+        """
+        Check whether a column is numeric, using the loaded data's statistics when
+        available and the schema sample otherwise.
+
+        Args:
+            column_name (str): Column to check.
+
+        Returns:
+            bool: True if the column is numeric
+        """
+        stats = self.get_column_stats(column_name)
+        if stats is not None:
+            return stats.is_numeric
+        return self.schema is not None and self.schema.is_numeric(column_name)
+
+    def is_datetime(self, column_name: str) -> bool:
+        """
+        Check whether a column holds timestamps, using the loaded data's statistics
+        when available and the schema sample otherwise.
+
+        Args:
+            column_name (str): Column to check.
+
+        Returns:
+            bool: True if the column is loaded as datetime64[ns]
+        """
+        stats = self.get_column_stats(column_name)
+        if stats is not None:
+            return stats.is_datetime
+        return self.schema is not None and self.schema.is_datetime(column_name)
+
+    def get_column_stats(self, column_name: str) -> Optional[ColumnStats]:
+        """
+        Get the statistics computed when a column was loaded or streamed.
+
+        Args:
+            column_name (str): Column to look up.
+
+        Returns:
+            Optional[ColumnStats]: The column's statistics, or None if it is not loaded
+        """
+        if self.stream_stats is not None:
+            return self.stream_stats.get(column_name)
+        return self._registry.column_stats(self.dataset_key, column_name)
+
+    def get_cardinality(self, column_name: str) -> Optional[int]:
+        """
+        Get the number of distinct values of a loaded column.
+
+        It is counted on the first call and shared with every loader of the file.
+        Streamed files keep no columns, so they have no count.
+
+        Args:
+            column_name (str): Column to count.
+
+        Returns:
+            Optional[int]: Number of distinct non-null values, or None if the column is not loaded
+        """
+        if self.stream_stats is not None:
+            return None
+        return self._registry.cardinality(self.dataset_key, column_name)
+
+    def release(self):
+        """
+        Drop this loader's reference on the loaded dataset and forget it.
+        """
+        if self.dataset_key is not None:
+            self._registry.release(self.dataset_key)
+        self.df = None
+        self.schema = None
+        self.filename = None
+        self.dataset_key = None
+        self.stream_stats = None
 
     def get_columns(self) -> Optional[list]:
         """
-        Get the list of columns in the loaded DataFrame.
+        Get the list of columns in the loaded file.
+
+        Returns:
+            Optional[list]: List of column names, or None if no file is loaded
+        """
+        return list(self.schema.columns) if self.schema is not None else None
+
+    def get_dataframe(self, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Get the loaded DataFrame, or a projection of it.
+
+        Args:
+            columns (Optional[List[str]]): Columns to project onto. When omitted, the
+                full DataFrame from load_csv() is returned.
 
         Returns:
-            Optional[list]: List of column names, or None if no DataFrame is loaded
+            Optional[pd.DataFrame]: The DataFrame, or None if it (or any requested column) is not loaded
         """
-        return self.df.columns.tolist() if self.df is not None else None
+        if columns is None:
+            return self.df
+        projected = {}
+        for name in dict.fromkeys(columns):
+            series = self._registry.column(self.dataset_key, name)
+            if series is None:
+                return None
+            projected[name] = series
+        return pd.DataFrame(projected, copy=False)
 
-    def get_dataframe(self) -> Optional[pd.DataFrame]:
+    def get_memory_report(self, columns: Optional[List[str]] = None) -> Optional[MemoryReport]:
         """
-        Get the loaded DataFrame.
+        Get the memory saved by dtype compaction of the loaded columns.
+
+        Args:
+            columns (Optional[List[str]]): Columns to report on, all loaded ones when omitted.
 
         Returns:
-            Optional[pd.DataFrame]: The loaded DataFrame, or None if no DataFrame is loaded
+            Optional[MemoryReport]: The report, or None if compaction is disabled or none
+            of the columns are loaded
         """
-        return self.df
+        return self._registry.memory_report(self.dataset_key, columns)
+
+    def get_dataset_key(self) -> Optional[DatasetKey]:
+        """
+        Get the registry key of the loaded dataset.
+
+        Returns:
+            Optional[DatasetKey]: Key of the loaded dataset, or None if no file is loaded
+        """
+        return self.dataset_key
 
     def get_filename(self) -> Optional[str]:
         """
@@ -68,8 +751,19 @@ class CSVLoader:
         Returns:
             Optional[Tuple[float, float]]: Tuple of (min, max) values, or None if column is not numeric
         """
-        if self.df is not None and column_name in self.df.columns:
-            # Check if the column is numeric
-            if pd.api.types.is_numeric_dtype(self.df[column_name]):
-                return float(self.df[column_name].min()), float(self.df[column_name].max())
-        return None 
\ No newline at end of file
+        stats = self.get_column_stats(column_name)
+        return stats.value_range if stats is not None else None
+
+    def get_time_range(self, column_name: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Get the earliest and latest timestamps of a datetime column.
+
+        Args:
+            column_name (str): Name of the column to get range for.
+
+        Returns:
+            Optional[Tuple[pd.Timestamp, pd.Timestamp]]: Tuple of (min, max) timestamps, or None
+            if the column is not a loaded datetime column
+        """
+        stats = self.get_column_stats(column_name)
+        return stats.time_range if stats is not None else None
@@ -0,0 +1,435 @@
+import os
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.column_cache import ColumnCache, file_fingerprint
+from utils.column_stats import ColumnStats, compute_column_stats
+from utils.compaction import ColumnMemory, MemoryReport, compact_dataframe
+
+DatasetKey = Tuple[str, int, int]
+
+
+def dataset_key(file_path: str) -> DatasetKey:
+    """
+    Build the registry key for a file on disk.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        DatasetKey: Tuple of (resolved path, size in bytes, mtime in nanoseconds)
+    """
+    resolved = os.path.realpath(file_path)
+    stat = os.stat(resolved)
+    return resolved, stat.st_size, stat.st_mtime_ns
+
+
+def frozen_column(series: pd.Series) -> pd.Series:
+    """
+    Copy a column into its own buffer and mark it read-only.
+
+    The copy detaches the column from the DataFrame's 2D block, so holding it
+    does not keep the other columns alive. Columns that are already read-only,
+    such as memory-mapped columns from the ColumnCache, are used as they are.
+
+    Args:
+        series (pd.Series): Column to copy.
+
+    Returns:
+        pd.Series: Read-only copy of the column
+    """
+    if isinstance(series.dtype, np.dtype):
+        values = series.to_numpy()
+        base = values.base
+        if values.flags.writeable or (isinstance(base, np.ndarray) and base.ndim > 1):
+            values = values.copy()
+            values.flags.writeable = False
+        return pd.Series(values, index=series.index, name=series.name, copy=False)
+    return series.copy()
+
+
+class _DatasetEntry:
+    def __init__(self, key: DatasetKey):
+        self.key = key
+        self.df = None
+        self.columns: Dict[str, pd.Series] = {}
+        self.stats: Dict[str, ColumnStats] = {}
+        self.memory: Dict[str, ColumnMemory] = {}
+        # Values computed from the columns, e.g. sort orders, by name
+        self.derived: Dict[object, object] = {}
+        self.fingerprint = None
+        self.refcount = 0
+        # `lock` guards the fields above for short lookups; `load_lock` serializes
+        # parses so they never block readers of already loaded columns.
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+
+
+class DatasetRegistry:
+    """
+    A process-wide store of loaded datasets, shared by every CSVLoader and plot.
+
+    Datasets are keyed on the resolved path plus file size and mtime, so an
+    unchanged file is parsed once and a modified file is parsed again under a
+    new key. Each holder takes a reference; a dataset is dropped when the last
+    reference is released.
+
+    With a ColumnCache set, parsed columns are also written to disk and later
+    loads of the same unchanged file read them back instead of parsing.
+
+    With compaction enabled, parsed columns are stored in the smallest lossless
+    dtype before they are shared or cached, and the memory saved is recorded.
+    """
+    def __init__(self, column_cache: Optional[ColumnCache] = None, compact_dtypes: bool = False):
+        self._entries: Dict[DatasetKey, _DatasetEntry] = {}
+        self._lock = threading.Lock()
+        self.column_cache = column_cache
+        self.compact_dtypes = compact_dtypes
+
+    def set_column_cache(self, column_cache: Optional[ColumnCache]):
+        """
+        Enable the on-disk column cache, or disable it with None.
+
+        Args:
+            column_cache (Optional[ColumnCache]): Cache to read and write parsed columns through.
+        """
+        self.column_cache = column_cache
+
+    def set_compaction(self, enabled: bool):
+        """
+        Enable or disable dtype compaction of columns parsed from now on.
+
+        Args:
+            enabled (bool): Whether to compact newly loaded columns.
+        """
+        self.compact_dtypes = enabled
+
+    def acquire(self, file_path: str,
+                reader: Callable[[str], pd.DataFrame] = pd.read_csv) -> Tuple[DatasetKey, pd.DataFrame]:
+        """
+        Get the dataset for a file, loading it if it is not registered yet.
+
+        The caller owns one reference and must hand it back with release().
+
+        Args:
+            file_path (str): Path to the file to load.
+            reader (Callable[[str], pd.DataFrame]): Function used to parse the file on a miss.
+
+        Returns:
+            Tuple[DatasetKey, pd.DataFrame]: The registry key and the shared DataFrame
+        """
+        key = self.open(file_path)
+        entry = self._entry(key)
+        with entry.load_lock:
+            if entry.df is None:
+                try:
+                    df = self._read_cached_frame(entry)
+                    cached = df is not None
+                    if not cached:
+                        df = reader(key[0])
+                        # Cached as parsed, so a hit reports the real saving and
+                        # follows the current compaction setting
+                        self._write_cache(entry, df, header=df.columns.tolist())
+                    memory = self._compact(df)
+                    stats = compute_column_stats(df)
+                except Exception:
+                    self.release(key)
+                    raise
+                with entry.lock:
+                    entry.df = df
+                    entry.stats.update(stats)
+                    entry.memory.update(memory)
+        return key, entry.df
+
+    def open(self, file_path: str) -> DatasetKey:
+        """
+        Register a file without parsing it and take a reference on it.
+
+        Columns are then loaded on demand with load_columns().
+
+        Args:
+            file_path (str): Path to the file.
+
+        Returns:
+            DatasetKey: The registry key of the file
+        """
+        key = dataset_key(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _DatasetEntry(key)
+            entry.refcount += 1
+        return key
+
+    def load_columns(self, key: DatasetKey, names: Iterable[str],
+                     reader: Callable[[str, List[str]], pd.DataFrame]):
+        """
+        Make sure the given columns are loaded, parsing only the missing ones.
+
+        Args:
+            key (DatasetKey): Key returned by open() or acquire().
+            names (Iterable[str]): Columns that must be available.
+            reader (Callable[[str, List[str]], pd.DataFrame]): Function called with the
+                file path and the missing column names.
+
+        Raises:
+            KeyError: If the dataset is not registered.
+        """
+        entry = self._entry(key)
+        if entry is None:
+            raise KeyError(f'Dataset {key[0]} is not registered.')
+        with entry.load_lock:
+            missing = [name for name in dict.fromkeys(names) if not self._has_column(entry, name)]
+            if missing and self.column_cache is not None:
+                cached = self.column_cache.get(self._fingerprint(entry), missing)
+                memory = self._compact(cached, list(cached))
+                # Compaction copies columns into writable buffers, so freeze them like parsed ones
+                cached = {name: frozen_column(series) for name, series in cached.items()}
+                stats = compute_column_stats(pd.DataFrame(cached, copy=False))
+                with entry.lock:
+                    entry.columns.update(cached)
+                    entry.stats.update(stats)
+                    entry.memory.update(memory)
+                missing = [name for name in missing if name not in cached]
+            if not missing:
+                return
+            df = reader(key[0], missing)
+            self._write_cache(entry, {name: df[name] for name in missing})
+            memory = self._compact(df, missing)
+            frozen = {name: frozen_column(df[name]) for name in missing}
+            stats = compute_column_stats(pd.DataFrame(frozen, copy=False))
+            with entry.lock:
+                entry.columns.update(frozen)
+                entry.stats.update(stats)
+                entry.memory.update(memory)
+
+    def has_columns(self, key: Optional[DatasetKey], names: Iterable[str]) -> bool:
+        """
+        Check whether all the given columns are loaded.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by open() or acquire().
+            names (Iterable[str]): Column names.
+
+        Returns:
+            bool: True if every column can be served without parsing
+        """
+        entry = self._entry(key)
+        return entry is not None and all(self._has_column(entry, name) for name in names)
+
+    def _compact(self, df, columns: Optional[List[str]] = None) -> Dict[str, ColumnMemory]:
+        if not self.compact_dtypes:
+            return {}
+        _, report = compact_dataframe(df, columns)
+        return report.columns
+
+    def _fingerprint(self, entry: _DatasetEntry) -> str:
+        if entry.fingerprint is None:
+            entry.fingerprint = file_fingerprint(entry.key[0])
+        return entry.fingerprint
+
+    def _read_cached_frame(self, entry: _DatasetEntry) -> Optional[pd.DataFrame]:
+        if self.column_cache is None:
+            return None
+        return self.column_cache.get_frame(self._fingerprint(entry))
+
+    def _write_cache(self, entry: _DatasetEntry, columns, header: Optional[List[str]] = None):
+        if self.column_cache is None:
+            return
+        try:
+            self.column_cache.put(self._fingerprint(entry), {name: columns[name] for name in columns},
+                                  source=entry.key[0], header=header)
+        except OSError:
+            # The cache is an optimization; a full disk must not fail the load
+            pass
+
+    def _entry(self, key: Optional[DatasetKey]) -> Optional[_DatasetEntry]:
+        with self._lock:
+            return self._entries.get(key) if key is not None else None
+
+    @staticmethod
+    def _has_column(entry: _DatasetEntry, name: str) -> bool:
+        with entry.lock:
+            return name in entry.columns or (entry.df is not None and name in entry.df.columns)
+
+    def retain(self, key: Optional[DatasetKey]) -> bool:
+        """
+        Take an extra reference on an already registered dataset.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by acquire().
+
+        Returns:
+            bool: True if the dataset is still registered, False otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None:
+                return False
+            entry.refcount += 1
+            return True
+
+    def release(self, key: Optional[DatasetKey]):
+        """
+        Drop a reference, unregistering the dataset when none are left.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by acquire().
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount <= 0:
+                del self._entries[key]
+
+    def get(self, key: Optional[DatasetKey]) -> Optional[pd.DataFrame]:
+        """
+        Look up a registered dataset without taking a reference.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by acquire().
+
+        Returns:
+            Optional[pd.DataFrame]: The shared DataFrame, or None if it is not registered
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            return entry.df if entry is not None else None
+
+    def column(self, key: Optional[DatasetKey], name: str) -> Optional[pd.Series]:
+        """
+        Get a read-only copy of one column, shared by every caller asking for it.
+
+        Columns loaded with load_columns() are returned directly. Otherwise the
+        first request copies the column out of the DataFrame; later requests
+        return the same Series, so plots built from the same dataset share their
+        column buffers instead of each holding a copy.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by acquire().
+            name (str): Column name.
+
+        Returns:
+            Optional[pd.Series]: The shared column, or None if the dataset or column is missing
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        with entry.lock:
+            series = entry.columns.get(name)
+            if series is None:
+                if entry.df is None or name not in entry.df.columns:
+                    return None
+                series = entry.columns[name] = frozen_column(entry.df[name])
+            return series
+
+    def column_stats(self, key: Optional[DatasetKey], name: str) -> Optional[ColumnStats]:
+        """
+        Get the statistics computed when a column was loaded.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by open() or acquire().
+            name (str): Column name.
+
+        Returns:
+            Optional[ColumnStats]: The column's statistics, or None if it is not loaded
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        with entry.lock:
+            return entry.stats.get(name)
+
+    def cardinality(self, key: Optional[DatasetKey], name: str) -> Optional[int]:
+        """
+        Count the distinct values of a loaded column, computing it on first use.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by open() or acquire().
+            name (str): Column name.
+
+        Returns:
+            Optional[int]: Number of distinct non-null values, or None if the column is not loaded
+        """
+        series = self.column(key, name)
+        if series is None:
+            return None
+        return self.derived(key, ('cardinality', name), lambda: int(series.nunique()))
+
+    def derived(self, key: Optional[DatasetKey], name, build: Callable[[], object]):
+        """
+        Get a value computed from a dataset's columns, building it on first use.
+
+        The value is kept for as long as the dataset stays registered. Two threads
+        asking at once may both build it; the first result stored is kept.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by open() or acquire().
+            name: Hashable name of the value, e.g. ('sorted_x', column).
+            build (Callable[[], object]): Computes the value; called without a lock held.
+
+        Returns:
+            The shared value, or a fresh one if the dataset is not registered
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return build()
+        with entry.lock:
+            value = entry.derived.get(name)
+        if value is None:
+            value = build()
+            with entry.lock:
+                value = entry.derived.setdefault(name, value)
+        return value
+
+    def memory_report(self, key: Optional[DatasetKey],
+                      names: Optional[Iterable[str]] = None) -> Optional[MemoryReport]:
+        """
+        Get the memory saved by compacting the columns of a dataset.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by open() or acquire().
+            names (Optional[Iterable[str]]): Columns to report on, all compacted ones when omitted.
+
+        Returns:
+            Optional[MemoryReport]: The report, or None if none of the columns were compacted
+        """
+        entry = self._entry(key)
+        if entry is None:
+            return None
+        with entry.lock:
+            memory = dict(entry.memory) if names is None else {
+                name: entry.memory[name] for name in names if name in entry.memory}
+        return MemoryReport(memory) if memory else None
+
+    def refcount(self, key: Optional[DatasetKey]) -> int:
+        """
+        Get the number of live references to a dataset.
+
+        Args:
+            key (Optional[DatasetKey]): Key returned by acquire().
+
+        Returns:
+            int: Reference count, 0 if the dataset is not registered
+        """
+        with self._lock:
+            entry = self._entries.get(key) if key is not None else None
+            return entry.refcount if entry is not None else 0
+
+
+_registry = DatasetRegistry()
+
+
+def get_registry() -> DatasetRegistry:
+    """
+    Get the process-wide dataset registry.
+
+    Returns:
+        DatasetRegistry: The shared registry instance
+    """
+    return _registry
@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from utils.dataset_registry import DatasetKey, frozen_column, get_registry
+
+
+def _same_rows(series: pd.Series, df: pd.DataFrame) -> bool:
+    # A filtered, sliced or reordered frame has a different index than the loaded file
+    return len(series) == len(df) and series.index.equals(df.index)
+
+
+class DatasetSnapshot:
+    """
+    An immutable, column-projected view of a dataset.
+
+    A snapshot keeps only the columns a plot uses, as read-only Series. When the
+    dataset is registered and the given frame holds its full columns, they come
+    from the registry's shared column store, so several plots of the same file
+    share one buffer per column. A subset of the rows, such as df.head(), is
+    copied instead, and the snapshot then has no dataset key.
+    """
+    def __init__(self, columns: Dict[str, pd.Series], dataset_key: Optional[DatasetKey] = None):
+        """
+        Initialize the snapshot from already frozen columns.
+
+        Args:
+            columns (Dict[str, pd.Series]): Read-only columns by name.
+            dataset_key (Optional[DatasetKey]): Registry key of the source dataset, if any.
+        """
+        self._columns = dict(columns)
+        self.dataset_key = dataset_key
+
+    @classmethod
+    def from_dataframe(cls, df, columns: Iterable[str],
+                       dataset_key: Optional[DatasetKey] = None) -> 'DatasetSnapshot':
+        """
+        Project a DataFrame (or another snapshot) onto the given columns.
+
+        Args:
+            df (pd.DataFrame | DatasetSnapshot): Source data.
+            columns (Iterable[str]): Columns to keep.
+            dataset_key (Optional[DatasetKey]): Registry key of the source dataset, if any.
+
+        Returns:
+            DatasetSnapshot: Snapshot holding only the requested columns; its dataset_key
+            is only set if every column is the registry's
+        """
+        names = list(dict.fromkeys(columns))
+        if isinstance(df, DatasetSnapshot):
+            if names == df.columns:
+                return df
+            return cls({name: df[name] for name in names}, df.dataset_key)
+
+        registry = get_registry()
+        projected = {}
+        shared = dataset_key is not None
+        for name in names:
+            series = registry.column(dataset_key, name)
+            if series is None or not _same_rows(series, df):
+                series = frozen_column(df[name])
+                shared = False
+            projected[name] = series
+        return cls(projected, dataset_key if shared else None)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self._columns[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build a DataFrame over the snapshot's columns.
+
+        Returns:
+            pd.DataFrame: DataFrame holding the projected columns
+        """
+        return pd.DataFrame(self._columns, copy=False)
@@ -0,0 +1,130 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# Values checked against a guessed format before a column is treated as timestamps
+DATETIME_SAMPLE_VALUES = 200
+NS_PER_DAY = 86_400 * 1_000_000_000
+# int64 value of NaT
+NAT_NS = np.iinfo('int64').min
+
+
+def detect_datetime_format(values: pd.Series) -> Optional[str]:
+    """
+    Infer a fixed strptime format for a text column, if it holds timestamps.
+
+    The format is guessed from the first value and must parse every sampled
+    value, so columns of mixed formats or occasional dates are left as text.
+
+    Args:
+        values (pd.Series): Sampled values of the column.
+
+    Returns:
+        Optional[str]: The format, or None if the values are not timestamps
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        return None
+    sample = values.dropna().head(DATETIME_SAMPLE_VALUES)
+    if sample.empty or not isinstance(sample.iloc[0], str):
+        return None
+    fmt = guess_datetime_format(sample.iloc[0])
+    if fmt is None:
+        return None
+    try:
+        parsed = pd.to_datetime(sample, format=fmt, errors='coerce')
+    except (TypeError, ValueError):
+        return None
+    return fmt if parsed.notna().all() else None
+
+
+def detect_datetime_formats(df: pd.DataFrame) -> Dict[str, str]:
+    """
+    Find the text columns of a sample that hold timestamps.
+
+    Args:
+        df (pd.DataFrame): Sampled rows.
+
+    Returns:
+        Dict[str, str]: strptime formats by column name
+    """
+    formats = {}
+    for name in df.columns:
+        fmt = detect_datetime_format(df[name])
+        if fmt is not None:
+            formats[name] = fmt
+    return formats
+
+
+def parse_datetimes(values: pd.Series, fmt: Optional[str] = None,
+                    coerce: bool = False) -> pd.Series:
+    """
+    Parse a text column into timezone-naive datetime64[ns] values.
+
+    With a fixed format, pandas parses in one vectorized pass. If values after
+    the sample do not match it, the column is parsed again with the format
+    inferred per value, which is slower. Values that still do not parse keep
+    the whole column as text, so no data is dropped, unless `coerce` is set.
+    Timezone-aware values are converted to UTC.
+
+    Args:
+        values (pd.Series): Text values.
+        fmt (Optional[str]): strptime format from detect_datetime_format(); inferred when omitted.
+        coerce (bool): Turn values that do not parse into NaT instead of returning `values`.
+
+    Returns:
+        pd.Series: The parsed column, with NaT for missing values, or `values`
+        itself if some values are not timestamps and `coerce` is not set
+    """
+    if fmt is None:
+        fmt = detect_datetime_format(values)
+    try:
+        parsed = pd.to_datetime(values, format=fmt, cache=True)
+    except (TypeError, ValueError, OverflowError):
+        parsed = pd.to_datetime(values, format='mixed', errors='coerce', cache=True, utc=True)
+        if not coerce and (parsed.isna() & values.notna()).any():
+            return values
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        parsed = parsed.dt.tz_convert('UTC').dt.tz_localize(None)
+    return parsed.astype('datetime64[ns]')
+
+
+def convert_datetime_columns(df: pd.DataFrame, formats: Dict[str, str],
+                             coerce: bool = False) -> pd.DataFrame:
+    """
+    Replace the given text columns of a freshly parsed DataFrame with parsed timestamps.
+
+    A column with values further down that are not timestamps stays text,
+    unless `coerce` is set.
+
+    Args:
+        df (pd.DataFrame): DataFrame to convert in place.
+        formats (Dict[str, str]): strptime formats by column name; missing columns are skipped.
+        coerce (bool): Turn values that do not parse into NaT, e.g. for chunks that
+            must all have the same dtype.
+
+    Returns:
+        pd.DataFrame: The same DataFrame
+    """
+    for name, fmt in formats.items():
+        if name in df.columns and not pd.api.types.is_datetime64_any_dtype(df[name]):
+            df[name] = parse_datetimes(df[name], fmt, coerce)
+    return df
+
+
+def datetime_to_ns(values) -> np.ndarray:
+    """
+    View datetime64 values as int64 nanoseconds since the epoch, without copying.
+
+    Args:
+        values (pd.Series | np.ndarray): datetime64 values.
+
+    Returns:
+        np.ndarray: int64 nanoseconds, with NAT_NS for missing values
+    """
+    return pd.Series(values).to_numpy(dtype='datetime64[ns]').view('int64')
@@ -0,0 +1,253 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.datetimes import NAT_NS, datetime_to_ns
+
+# Series shorter than this many points per horizontal pixel are drawn as is
+DECIMATION_POINTS_PER_PIXEL = 4
+# Above this many rows, points are drawn as a density image instead of markers
+DENSITY_ROW_THRESHOLD = 2_000_000
+
+
+def sort_xy(x, y) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert an XY series to float arrays sorted by X, dropping rows with NaN.
+
+    Datetime X values become int64 nanoseconds since the epoch instead, so
+    timestamps are sorted and decimated as integers without losing precision.
+
+    Args:
+        x (pd.Series | np.ndarray): X values.
+        y (pd.Series | np.ndarray): Y values.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: X and Y sorted by X
+    """
+    if pd.api.types.is_datetime64_any_dtype(x):
+        x = datetime_to_ns(x)
+        x_missing = x == NAT_NS
+    else:
+        x = pd.Series(x).to_numpy(dtype='float64', na_value=np.nan)
+        x_missing = np.isnan(x)
+    y = pd.Series(y).to_numpy(dtype='float64', na_value=np.nan)
+    valid = ~(x_missing | np.isnan(y))
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if len(x) > 1 and not (x[1:] >= x[:-1]).all():
+        order = np.argsort(x, kind='stable')
+        x, y = x[order], y[order]
+    return x, y
+
+
+def window_slice(x: np.ndarray, x_range: Tuple[float, float]) -> slice:
+    """
+    Find the rows of an X-sorted series inside a window by binary search.
+
+    One row on either side is included, so lines and markers reach the window edges.
+
+    Args:
+        x (np.ndarray): X values sorted ascending.
+        x_range (Tuple[float, float]): Window as (x0, x1).
+
+    Returns:
+        slice: The rows to show, found in O(log n)
+    """
+    lo = np.searchsorted(x, x_range[0], side='left')
+    hi = np.searchsorted(x, x_range[1], side='right')
+    return slice(max(lo - 1, 0), min(hi + 1, len(x)))
+
+
+class SortedXIndex:
+    """
+    The sort order of one X column, computed once and shared by every plot against it.
+
+    Plots of other Y columns against the same X gather their values through the
+    order in O(n) instead of sorting again. When X is already sorted and has no
+    missing values, the sorted X is the column itself and no order is kept.
+    """
+    def __init__(self, x):
+        """
+        Initialize the index.
+
+        Args:
+            x (pd.Series | np.ndarray): X values of every row; datetime values are
+                indexed as int64 nanoseconds, as by sort_xy().
+        """
+        if pd.api.types.is_datetime64_any_dtype(x):
+            values = datetime_to_ns(x)
+            missing = values == NAT_NS
+        else:
+            values = pd.Series(x).to_numpy(dtype='float64', na_value=np.nan)
+            missing = np.isnan(values)
+        order = None
+        if missing.any():
+            order = np.flatnonzero(~missing)
+            values = values[order]
+        if len(values) > 1 and not (values[1:] >= values[:-1]).all():
+            by_x = np.argsort(values, kind='stable')
+            values = values[by_x]
+            order = by_x if order is None else order[by_x]
+        # Shared by every plot of the column, which must never write into it
+        values.flags.writeable = False
+        self.x = values
+        self.order = order
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def take(self, y) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a Y column in X order, dropping rows where Y is NaN.
+
+        Args:
+            y (pd.Series | np.ndarray): Y values of every row.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: X and Y sorted by X; X is the shared
+            array itself when no row is dropped
+        """
+        y = pd.Series(y).to_numpy(dtype='float64', na_value=np.nan)
+        if self.order is not None:
+            y = y[self.order]
+        valid = ~np.isnan(y)
+        if valid.all():
+            return self.x, y
+        return self.x[valid], y[valid]
+
+
+def occupancy_decimate(x: np.ndarray, y: np.ndarray, shape: Tuple[int, int],
+                       x_range: Optional[Tuple[float, float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce an X-sorted series to one point per occupied pixel of the plot.
+
+    The points' X and Y extents are split into a grid of `shape` cells, and the
+    first point of every cell that holds any point is kept, along with the end
+    points and the points with the smallest and largest Y, so autoscaling sees
+    the same limits. Every kept point is within a cell of the points it
+    replaces, so with one cell per pixel their markers cover the same pixels
+    as the full series, up to one pixel at the edges of the point cloud.
+
+    Args:
+        x (np.ndarray): X values sorted ascending.
+        y (np.ndarray): Y values matching x.
+        shape (Tuple[int, int]): Grid size as (width, height), usually the axes size in pixels.
+        x_range (Optional[Tuple[float, float]]): Only decimate the points in this
+            X window, found by binary search.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The decimated X and Y, still sorted by X
+    """
+    if x_range is not None:
+        lo_index = np.searchsorted(x, x_range[0], side='left')
+        hi_index = np.searchsorted(x, x_range[1], side='right')
+        x, y = x[lo_index:hi_index], y[lo_index:hi_index]
+    width, height = shape
+    if len(x) <= width:
+        return x, y
+
+    low, high = int(np.argmin(y)), int(np.argmax(y))
+    # Scaled as floats, since int64 timestamps times the width could overflow
+    x0, x1 = float(x[0]), float(x[-1])
+    y0, y1 = float(y[low]), float(y[high])
+    x1 = x1 if x1 > x0 else x0 + 1
+    y1 = y1 if y1 > y0 else y0 + 1
+    ix = ((x.astype('float64') - x0) * (width / (x1 - x0))).astype(np.intp)
+    iy = ((y - y0) * (height / (y1 - y0))).astype(np.intp)
+    np.clip(ix, 0, width - 1, out=ix)
+    np.clip(iy, 0, height - 1, out=iy)
+    _, first = np.unique(ix * height + iy, return_index=True)
+    keep = np.unique(np.r_[0, first, low, high, len(x) - 1])
+    return x[keep], y[keep]
+
+
+class SortedXYBuffer:
+    """
+    X-sorted points that new points can be appended to in amortized O(new points).
+
+    Storage grows by doubling, and appends only write past the current end, so
+    arrays handed out earlier by x and y stay valid. Points arriving with an X
+    below the current maximum are merged in, which costs O(total points). With
+    `max_points` set, the points with the smallest X are dropped first, which is
+    the oldest ones for time-like X values.
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, max_points: Optional[int] = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            x (np.ndarray): Initial X values, sorted ascending, as returned by sort_xy();
+                int64 for timestamps, float64 otherwise.
+            y (np.ndarray): Initial Y values matching x.
+            max_points (Optional[int]): Number of points to keep, or None for no limit.
+        """
+        x = np.asarray(x)
+        self._x = x if x.dtype == np.int64 else x.astype('float64', copy=False)
+        self._y = np.asarray(y, dtype='float64')
+        self._start = 0
+        self._end = len(self._x)
+        self.set_limit(max_points)
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[self._start:self._end]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[self._start:self._end]
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def set_limit(self, max_points: Optional[int]):
+        """
+        Set the number of points to keep, dropping the excess right away.
+
+        Args:
+            max_points (Optional[int]): Number of points to keep, or None for no limit.
+        """
+        self.max_points = max_points
+        self._trim()
+
+    def extend(self, x, y):
+        """
+        Add points, dropping rows with NaN.
+
+        Args:
+            x (pd.Series | np.ndarray): New X values, in any order.
+            y (pd.Series | np.ndarray): New Y values.
+        """
+        x, y = sort_xy(x, y)
+        if len(x) == 0:
+            return
+        if len(self) and x[0] < self._x[self._end - 1]:
+            merged_x = np.concatenate([self.x, x])
+            merged_y = np.concatenate([self.y, y])
+            order = np.argsort(merged_x, kind='stable')
+            self._x, self._y = merged_x[order], merged_y[order]
+            self._start, self._end = 0, len(order)
+        else:
+            self._reserve(len(x))
+            self._x[self._end:self._end + len(x)] = x
+            self._y[self._end:self._end + len(y)] = y
+            self._end += len(x)
+        self._trim()
+
+    def _reserve(self, extra: int):
+        needed = len(self) + extra
+        if self._end + extra <= len(self._x):
+            return
+        # Reallocate rather than compact in place, so earlier views are left untouched
+        capacity = max(needed * 2, 1024)
+        x = np.empty(capacity, dtype=self._x.dtype)
+        y = np.empty(capacity)
+        x[:len(self)] = self.x
+        y[:len(self)] = self.y
+        self._x, self._y = x, y
+        self._end = len(self)
+        self._start = 0
+
+    def _trim(self):
+        if self.max_points is not None and len(self) > self.max_points:
+            self._start = self._end - self.max_points
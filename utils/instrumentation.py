@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Iterator, List, Optional
+
+DEFAULT_MAX_SPANS = 10_000
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    One timed phase, e.g. loading a file or drawing a plot.
+    """
+    name: str
+    label: str
+    start: float
+    duration: float
+    rows: Optional[int] = None
+    memory: Optional[int] = None
+    thread_id: int = 0
+
+
+class SpanInfo:
+    """
+    Details of a running span that the instrumented code can fill in.
+    """
+    __slots__ = ('rows', 'memory')
+
+    def __init__(self, rows: Optional[int] = None, memory: Optional[int] = None):
+        self.rows = rows
+        self.memory = memory
+
+
+def approx_nbytes(obj) -> int:
+    """
+    Estimate the memory held by arrays, pandas objects and containers of them.
+
+    Object columns count their pointers only, so text data is underestimated.
+
+    Args:
+        obj: A NumPy array, pandas Series or DataFrame, or a dict, list or tuple of them.
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(obj, dict):
+        return sum(approx_nbytes(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(approx_nbytes(value) for value in obj)
+    memory_usage = getattr(obj, 'memory_usage', None)
+    if callable(memory_usage):
+        usage = memory_usage(index=False)
+        return int(usage.sum()) if hasattr(usage, 'sum') else int(usage)
+    return int(getattr(obj, 'nbytes', 0))
+
+
+class Tracer:
+    """
+    Collects spans from any thread into a bounded buffer.
+
+    Recording a span costs two clock reads and an append, so instrumentation
+    stays on all the time and the panel only decides whether to show it.
+    """
+    def __init__(self, max_spans: int = DEFAULT_MAX_SPANS):
+        """
+        Initialize the tracer.
+
+        Args:
+            max_spans (int): Number of most recent spans to keep.
+        """
+        self.enabled = True
+        self._spans = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+        self._epoch = time.perf_counter()
+        self._version = 0
+
+    @contextmanager
+    def span(self, name: str, label: str = '', rows: Optional[int] = None,
+             memory: Optional[int] = None) -> Iterator[SpanInfo]:
+        """
+        Time the enclosed block as one span.
+
+        Args:
+            name (str): Phase name, e.g. 'load', 'prepare' or 'draw'.
+            label (str): What the phase worked on, e.g. a file or plot name.
+            rows (Optional[int]): Rows processed, if known upfront.
+            memory (Optional[int]): Bytes held by the result, if known upfront.
+
+        Yields:
+            SpanInfo: Set its rows and memory inside the block when they are only known there
+        """
+        info = SpanInfo(rows, memory)
+        if not self.enabled:
+            yield info
+            return
+        start = time.perf_counter()
+        try:
+            yield info
+        finally:
+            end = time.perf_counter()
+            span = Span(name, label, start - self._epoch, end - start, info.rows, info.memory,
+                        threading.get_ident())
+            with self._lock:
+                self._spans.append(span)
+                self._version += 1
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a span is recorded or the spans are cleared."""
+        return self._version
+
+    def spans(self) -> List[Span]:
+        """
+        Get the recorded spans, oldest first.
+
+        Returns:
+            List[Span]: The spans
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def clear(self):
+        """
+        Drop every recorded span.
+        """
+        with self._lock:
+            self._spans.clear()
+            self._version += 1
+
+    def to_json(self) -> dict:
+        """
+        Get the spans as a JSON-serializable document, with times in seconds.
+
+        Returns:
+            dict: {'spans': [...]}
+        """
+        return {'spans': [asdict(span) for span in self.spans()]}
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Get the spans in the Chrome trace event format, for chrome://tracing or Perfetto.
+
+        Returns:
+            dict: {'traceEvents': [...]} with one complete event per span
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans():
+            args = {'label': span.label}
+            if span.rows is not None:
+                args['rows'] = span.rows
+            if span.memory is not None:
+                args['memory_bytes'] = span.memory
+            events.append({
+                'name': span.name,
+                'cat': 'viz',
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, file_path: str, chrome_trace: bool = False):
+        """
+        Write the spans to a file.
+
+        Args:
+            file_path (str): Path of the file to write.
+            chrome_trace (bool): Write the Chrome trace format instead of plain JSON.
+        """
+        document = self.to_chrome_trace() if chrome_trace else self.to_json()
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """
+    Get the tracer shared by the whole application.
+
+    Returns:
+        Tracer: The process-wide tracer
+    """
+    return _tracer
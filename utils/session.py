@@ -0,0 +1,107 @@
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from utils.column_cache import file_fingerprint
+
+SESSION_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SessionPlot:
+    """
+    One plot of a saved dashboard: its type, the file it reads and its parameters.
+    """
+    plot_type: str
+    file_path: str
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass
+class Session:
+    """
+    A saved dashboard.
+
+    Plots refer to their data by path, and every file's fingerprint at save
+    time is kept so that files changed since then can be reported on restore.
+    """
+    plots: List[SessionPlot] = field(default_factory=list)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+
+    def file_paths(self) -> List[str]:
+        """
+        Get the distinct files the plots read, in plot order.
+
+        Returns:
+            List[str]: File paths
+        """
+        return list(dict.fromkeys(plot.file_path for plot in self.plots))
+
+    def changed_files(self) -> List[str]:
+        """
+        Find the files that are missing or have changed since the session was saved.
+
+        Returns:
+            List[str]: Paths of missing or changed files
+        """
+        changed = []
+        for path in self.file_paths():
+            try:
+                if file_fingerprint(path) != self.fingerprints.get(path):
+                    changed.append(path)
+            except OSError:
+                changed.append(path)
+        return changed
+
+
+def save_session(session_path: str, plots: List[SessionPlot]):
+    """
+    Write a dashboard to a session file.
+
+    Only dataset references and plot parameters are stored, never the data,
+    so the file stays small however large the datasets are.
+
+    Args:
+        session_path (str): Path of the session file to write.
+        plots (List[SessionPlot]): Plots in display order.
+    """
+    session = Session(list(plots))
+    files = session.file_paths()
+    document = {
+        'version': SESSION_VERSION,
+        'datasets': [{'path': path, 'fingerprint': file_fingerprint(path)} for path in files],
+        'plots': [{'type': plot.plot_type, 'dataset': files.index(plot.file_path), 'params': plot.params}
+                  for plot in plots],
+    }
+    tmp_path = f'{session_path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp_path, session_path)
+
+
+def load_session(session_path: str) -> Session:
+    """
+    Read a session file written by save_session().
+
+    Args:
+        session_path (str): Path of the session file.
+
+    Returns:
+        Session: The saved dashboard
+
+    Raises:
+        ValueError: If the file is not a session file of a supported version.
+    """
+    with open(session_path, encoding='utf-8') as f:
+        document = json.load(f)
+    if not isinstance(document, dict) or document.get('version') != SESSION_VERSION:
+        raise ValueError('Unsupported session file.')
+    datasets = document.get('datasets', [])
+    try:
+        plots = [SessionPlot(plot['type'], datasets[plot['dataset']]['path'], plot.get('params', {}))
+                 for plot in document.get('plots', [])]
+    except (KeyError, IndexError, TypeError) as e:
+        raise ValueError(f'Malformed session file: {e}')
+    fingerprints = {dataset['path']: dataset.get('fingerprint') for dataset in datasets}
+    return Session(plots, fingerprints)
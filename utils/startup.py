@@ -0,0 +1,104 @@
+import importlib
+import sys
+import threading
+import time
+from typing import List, Optional, Tuple
+
+# Imported on first use rather than before the main window shows
+DEFERRED_MODULES = (
+    'numpy',
+    'pandas',
+    'matplotlib',
+    'matplotlib.figure',
+    'utils.column_cache',
+    'utils.compaction',
+    'utils.dataset_registry',
+    'utils.csv_loader',
+    'utils.session',
+)
+# Modules whose presence at first paint means startup got slower again
+HEAVY_MODULES = ('numpy', 'pandas', 'matplotlib')
+
+_registry_lock = threading.Lock()
+_registry_configured = False
+
+
+def configure_registry():
+    """
+    Apply the column cache and dtype compaction settings from the environment to the dataset registry.
+
+    Safe to call any number of times and from any thread; only the first call has an effect.
+    """
+    global _registry_configured
+    with _registry_lock:
+        if _registry_configured:
+            return
+        from utils.column_cache import column_cache_from_env
+        from utils.compaction import compaction_from_env
+        from utils.dataset_registry import get_registry
+        get_registry().set_column_cache(column_cache_from_env())
+        get_registry().set_compaction(compaction_from_env())
+        _registry_configured = True
+
+
+def preload_in_background() -> threading.Thread:
+    """
+    Import the deferred modules on a daemon thread.
+
+    The GUI thread imports them on first use anyway; preloading only moves the
+    cost to the idle time after the window has shown.
+
+    Returns:
+        threading.Thread: The started thread
+    """
+    def preload():
+        for name in DEFERRED_MODULES:
+            importlib.import_module(name)
+        configure_registry()
+
+    thread = threading.Thread(target=preload, name='preload', daemon=True)
+    thread.start()
+    return thread
+
+
+class StartupProfile:
+    """
+    Wall-clock timestamps of the startup phases, for --profile-startup.
+    """
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.marks: List[Tuple[str, float]] = []
+        self.heavy_at_first_paint: Optional[List[str]] = None
+
+    def mark(self, label: str):
+        """
+        Record that a phase has finished.
+
+        Args:
+            label (str): Name of the phase.
+        """
+        self.marks.append((label, time.perf_counter() - self._start))
+
+    def mark_first_paint(self):
+        """
+        Record the first paint, along with the heavy modules already imported by then.
+        """
+        self.mark('first paint')
+        self.heavy_at_first_paint = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    def report(self) -> str:
+        """
+        Format the recorded phases.
+
+        Returns:
+            str: One line per phase with its end time and duration, in milliseconds
+        """
+        lines = ['Startup profile (ms):']
+        previous = 0.0
+        for label, elapsed in self.marks:
+            lines.append(f'  {label:<24}{elapsed * 1000:9.1f}  (+{(elapsed - previous) * 1000:.1f})')
+            previous = elapsed
+        if self.heavy_at_first_paint is not None:
+            loaded = ', '.join(self.heavy_at_first_paint) or 'none'
+            lines.append(f'  heavy modules at first paint: {loaded}')
+        return '\n'.join(lines)
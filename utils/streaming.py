@@ -0,0 +1,197 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from utils.aggregation import DEFAULT_TOP_N, REDUCERS, BarAggregator
+from utils.column_stats import ColumnStats, dtype_class
+from utils.datetimes import NAT_NS, datetime_to_ns
+
+DEFAULT_MAX_POINTS = 20_000
+# Cells per axis the first chunk's extent is split into before any merging
+_INITIAL_GRID_CELLS = 256
+
+
+def _as_float(series: pd.Series) -> np.ndarray:
+    return series.to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _min(a, b):
+    return b if np.isnan(a) else a if np.isnan(b) else min(a, b)
+
+
+def _max(a, b):
+    return b if np.isnan(a) else a if np.isnan(b) else max(a, b)
+
+
+class StreamReducer:
+    """
+    Base class for single-pass reductions fed one chunk at a time.
+
+    Timestamp columns arrive as datetime64[ns], converted by CSVLoader.stream_csv().
+    """
+    def update(self, chunk: pd.DataFrame):
+        raise NotImplementedError
+
+    def result(self):
+        raise NotImplementedError
+
+
+class ColumnStatsReducer(StreamReducer):
+    """
+    Running min, max and null count of every column.
+
+    As for loaded columns, datetime min and max are int64 nanoseconds since the epoch.
+    """
+    def __init__(self):
+        self._acc: Dict[str, dict] = {}
+        self.rows = 0
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        numeric = chunk.select_dtypes(include=['number', 'bool'])
+        counts = chunk.count()
+        mins = numeric.min()
+        maxs = numeric.max()
+        for name in chunk.columns:
+            acc = self._acc.setdefault(name, {'min': np.nan, 'max': np.nan, 'null_count': 0, 'dtype_class': None})
+            acc['null_count'] += len(chunk) - int(counts[name])
+            chunk_class = dtype_class(chunk[name].dtype)
+            # A column that was text in any chunk stays text
+            if acc['dtype_class'] in (None, chunk_class) or chunk_class == 'text':
+                acc['dtype_class'] = chunk_class
+            if name in numeric.columns:
+                acc['min'] = _min(acc['min'], float(mins[name]))
+                acc['max'] = _max(acc['max'], float(maxs[name]))
+            elif chunk_class == 'datetime':
+                low, high = chunk[name].min(), chunk[name].max()
+                if pd.notna(low):
+                    acc['min'] = _min(acc['min'], low.value)
+                    acc['max'] = _max(acc['max'], high.value)
+
+    def result(self) -> Dict[str, ColumnStats]:
+        return {
+            name: ColumnStats(
+                name=name,
+                dtype_class=acc['dtype_class'],
+                count=self.rows,
+                null_count=acc['null_count'],
+                min=None if np.isnan(acc['min']) else acc['min'],
+                max=None if np.isnan(acc['max']) else acc['max'],
+            )
+            for name, acc in self._acc.items()
+        }
+
+
+class XYStreamReducer(StreamReducer):
+    """
+    Reduces an XY series to at most about `max_points` points in one pass.
+
+    Points are binned into a grid of X and Y cells anchored at the first chunk,
+    and only the earliest point of every occupied cell is kept, along with the
+    points with the smallest and largest X and Y. Whenever more than
+    `max_points` cells are occupied, the cells double in size along both axes
+    and the kept points are reduced again. Every doubled cell is the union of
+    whole smaller cells, so reducing the kept points again picks the same point
+    as reducing all rows at once would. Cells are placed by value, not by row,
+    so the order of the rows in the file does not matter, and as with
+    occupancy_decimate(), dense regions keep their interior when drawn as markers.
+    """
+    def __init__(self, x_col: str, y_col: str, max_points: int = DEFAULT_MAX_POINTS):
+        self.x_col = x_col
+        self.y_col = y_col
+        self.max_points = max_points
+        self._x_datetime = False
+        self._origin = None
+        self._cell = None
+        self._offset = 0
+        self._rows = np.empty(0, dtype=np.int64)
+        self._x = np.empty(0)
+        self._y = np.empty(0)
+
+    def update(self, chunk: pd.DataFrame):
+        x = chunk[self.x_col]
+        if pd.api.types.is_datetime64_any_dtype(x):
+            # Binned as int64 nanoseconds, like the loaded plots
+            self._x_datetime = True
+            x = datetime_to_ns(x)
+            x_missing = x == NAT_NS
+        else:
+            x = _as_float(x)
+            x_missing = np.isnan(x)
+        y = _as_float(chunk[self.y_col])
+        rows = np.arange(self._offset, self._offset + len(chunk), dtype=np.int64)
+        self._offset += len(chunk)
+
+        valid = ~(x_missing | np.isnan(y))
+        x, y, rows = x[valid], y[valid], rows[valid]
+        if len(x) == 0:
+            return
+        if self._origin is None:
+            self._start_grid(x, y)
+        self._reduce(np.concatenate([self._rows, rows]),
+                     np.concatenate([self._x, x]) if len(self._x) else x,
+                     np.concatenate([self._y, y]))
+
+    def _start_grid(self, x: np.ndarray, y: np.ndarray):
+        x0, y0 = float(x.min()), float(y.min())
+        width = (float(x.max()) - x0) / _INITIAL_GRID_CELLS
+        height = (float(y.max()) - y0) / _INITIAL_GRID_CELLS
+        self._origin = x0, y0
+        self._cell = [width if width > 0 else 1.0, height if height > 0 else 1.0]
+
+    def _occupied(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        # Rows are in file order, so the first index of each cell is its earliest row
+        cx = np.floor((x.astype('float64') - self._origin[0]) / self._cell[0]).astype(np.int64)
+        cy = np.floor((y - self._origin[1]) / self._cell[1]).astype(np.int64)
+        _, first = np.unique(np.column_stack([cx, cy]), axis=0, return_index=True)
+        return first
+
+    def _reduce(self, rows, x, y):
+        keep = self._occupied(x, y)
+        while len(keep) > self.max_points:
+            self._cell = [size * 2 for size in self._cell]
+            keep = self._occupied(x, y)
+        # The extremes make autoscaling see the full extent of the data
+        extremes = [np.argmin(x), np.argmax(x), np.argmin(y), np.argmax(y)]
+        keep = np.unique(np.r_[keep, extremes])
+        self._rows, self._x, self._y = rows[keep], x[keep], y[keep]
+
+    def result(self) -> pd.DataFrame:
+        order = np.argsort(self._x, kind='stable')
+        x, y = self._x[order], self._y[order]
+        if self._x_datetime:
+            x = x.astype('int64').view('datetime64[ns]')
+        if self.x_col == self.y_col:
+            return pd.DataFrame({self.x_col: x})
+        return pd.DataFrame({self.x_col: x, self.y_col: y})
+
+
+class BarStreamReducer(StreamReducer):
+    """
+    Aggregates a value column per label in one pass, with a BarAggregator.
+
+    Memory grows with the number of distinct labels, not with the number of rows.
+    """
+    def __init__(self, label_col: str, value_col: str, reducer: str = 'sum',
+                 top_n: int = DEFAULT_TOP_N):
+        if reducer not in REDUCERS:
+            raise ValueError(f"Unknown reducer '{reducer}'")
+        self.label_col = label_col
+        self.value_col = value_col
+        self.reducer = reducer
+        self.top_n = top_n
+        self._aggregator = BarAggregator()
+
+    def update(self, chunk: pd.DataFrame):
+        self._aggregator.update(chunk[self.label_col], chunk[self.value_col])
+
+    def result(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the bars, as BarAggregator.result() does.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Bar labels, with the groups past top_n folded
+            into one bar, and their aggregated values
+        """
+        return self._aggregator.result(self.reducer, self.top_n)